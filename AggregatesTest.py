@@ -0,0 +1,109 @@
+import unittest
+import Solution
+import Utility.DBConnector as Connector
+from Utility.ReturnValue import ReturnValue
+from Tests.abstractTest import AbstractTest
+from Business.Query import Query
+from Business.RAM import RAM
+from Business.Disk import Disk
+
+
+class Test(AbstractTest):
+    # DiskStats against the aggregates recomputed from the junction tables
+    def assertDiskStats(self) -> None:
+        conn = Connector.DBConnector(pooled=True)
+        try:
+            _, res = conn.execute("SELECT diskID, query_count, query_size_sum, ram_total FROM DiskStats "
+                                  "EXCEPT SELECT diskID, "
+                                  "(SELECT COUNT(*) FROM DiskandQuery Q WHERE Q.diskID=D.diskID), "
+                                  "(SELECT COALESCE(SUM(querySize), 0) FROM DiskandQuery Q WHERE Q.diskID=D.diskID), "
+                                  "(SELECT COALESCE(SUM(size), 0) FROM DiskandRam R JOIN Ram USING(ramID) "
+                                  "WHERE R.diskID=D.diskID) FROM Disk D")
+            conn.commit()
+        finally:
+            conn.close()
+        self.assertTrue(res.isEmpty(), "DiskStats drifted")
+
+    def test_diskStats(self) -> None:
+        for diskID in (1, 2):
+            self.assertEqual(ReturnValue.OK, Solution.addDisk(Disk(diskID, "DELL", 10, 100, 10)), "Should work")
+        for ramID in (1, 2, 3):
+            self.assertEqual(ReturnValue.OK, Solution.addRAM(RAM(ramID, "DELL", ramID * 10)), "Should work")
+        for queryID in (1, 2, 3):
+            self.assertEqual(ReturnValue.OK, Solution.addQuery(Query(queryID, "stuff", queryID)), "Should work")
+            self.assertEqual(ReturnValue.OK, Solution.addQueryToDisk(Query(queryID, "stuff", queryID), 1),
+                             "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.addQueryToDisk(Query(3, "stuff", 3), 2), "Should work")
+        self.assertEqual(ReturnValue.ALREADY_EXISTS, Solution.addQueryToDisk(Query(3, "stuff", 3), 2),
+                         "Failed insert leaves the aggregates alone")
+        for ramID in (1, 2, 3):
+            self.assertEqual(ReturnValue.OK, Solution.addRAMToDisk(ramID, 1), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.addRAMToDisk(3, 2), "Should work")
+        self.assertEqual(2, Solution.averageSizeQueriesOnDisk(1), "Should work")
+        self.assertEqual(60, Solution.diskTotalRAM(1), "Should work")
+        self.assertEqual([1, 2, 3], Solution.getQueriesCanBeAddedToDiskAndRAM(1), "Should work")
+        self.assertDiskStats()
+
+        self.assertEqual(ReturnValue.OK, Solution.removeQueryFromDisk(Query(1, "stuff", 1), 1), "Should work")
+        self.assertEqual(2.5, Solution.averageSizeQueriesOnDisk(1), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.deleteQuery(Query(3, "stuff", 3)), "Should work")
+        self.assertEqual(2, Solution.averageSizeQueriesOnDisk(1), "deleteQuery cascades")
+        self.assertEqual(0, Solution.averageSizeQueriesOnDisk(2), "No queries left on disk 2")
+        self.assertEqual(ReturnValue.OK, Solution.removeRAMFromDisk(1, 1), "Should work")
+        self.assertEqual(50, Solution.diskTotalRAM(1), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.deleteRAM(3), "Should work")
+        self.assertEqual(20, Solution.diskTotalRAM(1), "deleteRAM cascades")
+        self.assertEqual(0, Solution.diskTotalRAM(2), "deleteRAM cascades")
+        self.assertEqual([], Solution.getQueriesCanBeAddedToDiskAndRAM(2), "No RAM on disk 2")
+        self.assertDiskStats()
+
+        self.assertEqual(ReturnValue.OK, Solution.deleteDisk(1), "Should work")
+        self.assertEqual(0, Solution.averageSizeQueriesOnDisk(1), "Disk 1 is gone")
+        self.assertEqual(0, Solution.diskTotalRAM(1), "Disk 1 is gone")
+        self.assertDiskStats()
+        self.assertEqual(ReturnValue.OK, Solution.addDisk(Disk(1, "DELL", 10, 100, 10)), "Should work")
+        self.assertEqual(0, Solution.diskTotalRAM(1), "Fresh aggregates for a re-added disk")
+        self.assertDiskStats()
+
+    def test_purposeCost(self) -> None:
+        self.assertEqual(ReturnValue.OK, Solution.addDisk(Disk(1, "DELL", 10, 100, 2)), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.addDisk(Disk(2, "DELL", 10, 100, 5)), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.addQuery(Query(1, "stuff", 3)), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.addQuery(Query(2, "stuff", 4)), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.addQuery(Query(3, "other", 10)), "Should work")
+        for queryID, size, purpose, diskID in ((1, 3, "stuff", 1), (1, 3, "stuff", 2), (2, 4, "stuff", 2),
+                                               (3, 10, "other", 1)):
+            self.assertEqual(ReturnValue.OK, Solution.addQueryToDisk(Query(queryID, purpose, size), diskID),
+                             "Should work")
+        self.assertEqual(3 * 2 + 3 * 5 + 4 * 5, Solution.getCostForPurpose("stuff"), "Should work")
+        self.assertEqual(20, Solution.getCostForPurpose("other"), "Should work")
+        self.assertEqual(0, Solution.getCostForPurpose("nothing"), "Should work")
+        self.assertEqual({}, Solution.checkPurposeCosts(), "No drift")
+
+        self.assertEqual(ReturnValue.OK, Solution.removeQueryFromDisk(Query(1, "stuff", 3), 2), "Should work")
+        self.assertEqual(26, Solution.getCostForPurpose("stuff"), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.deleteQuery(Query(2, "stuff", 4)), "Should work")
+        self.assertEqual(6, Solution.getCostForPurpose("stuff"), "deleteQuery cascades")
+        self.assertEqual(ReturnValue.OK, Solution.deleteDisk(1), "Should work")
+        self.assertEqual(0, Solution.getCostForPurpose("stuff"), "deleteDisk cascades")
+        self.assertEqual(0, Solution.getCostForPurpose("other"), "deleteDisk cascades")
+        self.assertEqual({}, Solution.checkPurposeCosts(), "No drift")
+
+        self.assertEqual(ReturnValue.OK, Solution.addQueryToDisk(Query(1, "stuff", 3), 2), "Should work")
+        conn = Connector.DBConnector(pooled=True)
+        try:
+            conn.execute("UPDATE PurposeCost SET total=total+1 WHERE purpose='stuff';"
+                         "DELETE FROM PurposeCost WHERE purpose='other';"
+                         "INSERT INTO PurposeCost VALUES('ghost', 7)")
+            conn.commit()
+        finally:
+            conn.close()
+        self.assertEqual({"stuff": (16, 15), "ghost": (7, 0)}, Solution.checkPurposeCosts(repair=True),
+                         "Drift is reported")
+        self.assertEqual({}, Solution.checkPurposeCosts(), "Repaired")
+        self.assertEqual(15, Solution.getCostForPurpose("stuff"), "Should work")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,191 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Tuple
+import Solution
+import Utility.DBConnector as Connector
+from Utility.ReturnValue import ReturnValue
+from Business.Query import Query
+from Business.RAM import RAM
+from Business.Disk import Disk
+
+
+# asyncio counterparts of the Solution.py functions, with the same arguments and ReturnValues.
+# Every call runs the Solution.py function on a worker thread, there are as many workers as pooled
+# connections, so a worker never waits for a connection and the event loop never waits for the database.
+# Any number of coroutines can await calls at once, the ones beyond the pool size wait for a free worker.
+# enableProfileCache / disableProfileCache / profileCacheStats do no I/O, call them on Solution directly
+_executor = None
+_executor_size = 0
+_executor_lock = threading.Lock()
+
+
+def _getExecutor() -> ThreadPoolExecutor:
+    global _executor, _executor_size
+    with _executor_lock:
+        size = Connector.getPool().max_size
+        if _executor is None or _executor_size != size:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="AsyncSolution")
+            _executor_size = size
+        return _executor
+
+
+# waits for the running calls and stops the workers, the next call starts new ones
+def shutdown():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+
+
+async def _run(function, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_getExecutor(), functools.partial(function, *args, **kwargs))
+
+
+async def createTables():
+    return await _run(Solution.createTables)
+
+
+async def clearTables():
+    return await _run(Solution.clearTables)
+
+
+async def dropTables():
+    return await _run(Solution.dropTables)
+
+
+async def addQuery(query: Query) -> ReturnValue:
+    return await _run(Solution.addQuery, query)
+
+
+async def addQueries(queries: List[Query]) -> List[ReturnValue]:
+    return await _run(Solution.addQueries, queries)
+
+
+async def getQueryProfile(queryID: int) -> Query:
+    return await _run(Solution.getQueryProfile, queryID)
+
+
+async def getQueryProfiles(queryIDs: List[int]) -> List[Query]:
+    return await _run(Solution.getQueryProfiles, queryIDs)
+
+
+async def deleteQuery(query: Query) -> ReturnValue:
+    return await _run(Solution.deleteQuery, query)
+
+
+async def addDisk(disk: Disk) -> ReturnValue:
+    return await _run(Solution.addDisk, disk)
+
+
+async def addDisks(disks: List[Disk]) -> List[ReturnValue]:
+    return await _run(Solution.addDisks, disks)
+
+
+async def getDiskProfile(diskID: int) -> Disk:
+    return await _run(Solution.getDiskProfile, diskID)
+
+
+async def getDiskProfiles(diskIDs: List[int]) -> List[Disk]:
+    return await _run(Solution.getDiskProfiles, diskIDs)
+
+
+async def deleteDisk(diskID: int) -> ReturnValue:
+    return await _run(Solution.deleteDisk, diskID)
+
+
+async def addRAM(ram: RAM) -> ReturnValue:
+    return await _run(Solution.addRAM, ram)
+
+
+async def addRAMs(rams: List[RAM]) -> List[ReturnValue]:
+    return await _run(Solution.addRAMs, rams)
+
+
+async def getRAMProfile(ramID: int) -> RAM:
+    return await _run(Solution.getRAMProfile, ramID)
+
+
+async def getRAMProfiles(ramIDs: List[int]) -> List[RAM]:
+    return await _run(Solution.getRAMProfiles, ramIDs)
+
+
+async def deleteRAM(ramID: int) -> ReturnValue:
+    return await _run(Solution.deleteRAM, ramID)
+
+
+async def addDiskAndQuery(disk: Disk, query: Query) -> ReturnValue:
+    return await _run(Solution.addDiskAndQuery, disk, query)
+
+
+async def addQueryToDisk(query: Query, diskID: int) -> ReturnValue:
+    return await _run(Solution.addQueryToDisk, query, diskID)
+
+
+async def removeQueryFromDisk(query: Query, diskID: int) -> ReturnValue:
+    return await _run(Solution.removeQueryFromDisk, query, diskID)
+
+
+async def placeQueries(queryIDs: List[int] = None, minimizeCost=False) -> Tuple[ReturnValue, Dict[int, int]]:
+    return await _run(Solution.placeQueries, queryIDs=queryIDs, minimizeCost=minimizeCost)
+
+
+async def addRAMToDisk(ramID: int, diskID: int) -> ReturnValue:
+    return await _run(Solution.addRAMToDisk, ramID, diskID)
+
+
+async def removeRAMFromDisk(ramID: int, diskID: int) -> ReturnValue:
+    return await _run(Solution.removeRAMFromDisk, ramID, diskID)
+
+
+async def averageSizeQueriesOnDisk(diskID: int) -> float:
+    return await _run(Solution.averageSizeQueriesOnDisk, diskID)
+
+
+async def diskTotalRAM(diskID: int) -> int:
+    return await _run(Solution.diskTotalRAM, diskID)
+
+
+async def getCostForPurpose(purpose: str) -> int:
+    return await _run(Solution.getCostForPurpose, purpose)
+
+
+async def checkPurposeCosts(repair=False) -> dict:
+    return await _run(Solution.checkPurposeCosts, repair=repair)
+
+
+async def getQueriesCanBeAddedToDisk(diskID: int) -> List[int]:
+    return await _run(Solution.getQueriesCanBeAddedToDisk, diskID)
+
+
+async def getQueriesCanBeAddedToDisks(diskIDs: List[int], k=5) -> List[List[int]]:
+    return await _run(Solution.getQueriesCanBeAddedToDisks, diskIDs, k=k)
+
+
+async def getQueriesCanBeAddedToDiskAndRAM(diskID: int) -> List[int]:
+    return await _run(Solution.getQueriesCanBeAddedToDiskAndRAM, diskID)
+
+
+async def isCompanyExclusive(diskID: int) -> bool:
+    return await _run(Solution.isCompanyExclusive, diskID)
+
+
+async def getConflictingDisks() -> List[int]:
+    return await _run(Solution.getConflictingDisks)
+
+
+async def mostAvailableDisks() -> List[int]:
+    return await _run(Solution.mostAvailableDisks)
+
+
+async def getCloseQueries(queryID: int) -> List[int]:
+    return await _run(Solution.getCloseQueries, queryID)
+
+
+async def getCloseQueriesBatch(queryIDs: List[int]) -> List[List[int]]:
+    return await _run(Solution.getCloseQueriesBatch, queryIDs)
@@ -0,0 +1,64 @@
+import unittest
+import asyncio
+import AsyncSolution
+import Solution
+from Utility.ReturnValue import ReturnValue
+from Tests.abstractTest import AbstractTest
+from Business.Query import Query
+from Business.RAM import RAM
+from Business.Disk import Disk
+
+
+class Test(AbstractTest):
+    # the calls run on other threads, outside the session of the test
+    rollback = False
+
+    def test_concurrent_calls(self) -> None:
+        async def calls():
+            added = await asyncio.gather(*[AsyncSolution.addDisk(Disk(diskID % 100 + 1, "DELL", 10, 100, 10))
+                                           for diskID in range(200)])
+            profiles = await asyncio.gather(*[AsyncSolution.getDiskProfile(diskID) for diskID in range(1, 101)])
+            return added, profiles
+        added, profiles = asyncio.run(calls())
+        self.assertEqual(100, added.count(ReturnValue.OK), "Every disk added once")
+        self.assertEqual(100, added.count(ReturnValue.ALREADY_EXISTS), "Same mapping as addDisk")
+        self.assertEqual(list(range(1, 101)), [disk.getDiskID() for disk in profiles], "Should work")
+
+    def test_return_values(self) -> None:
+        async def calls():
+            return [await AsyncSolution.addQuery(Query(1, "stuff", 5)),
+                    await AsyncSolution.addQuery(Query(2, "stuff", -5)),
+                    await AsyncSolution.addDisk(Disk(1, "DELL", 10, 10, 10)),
+                    await AsyncSolution.addRAM(RAM(1, "DELL", 10)),
+                    await AsyncSolution.addRAMToDisk(1, 1),
+                    await AsyncSolution.addQueryToDisk(Query(1, "stuff", 5), 1),
+                    await AsyncSolution.addQueryToDisk(Query(1, "stuff", 5), 2),
+                    await AsyncSolution.getQueriesCanBeAddedToDiskAndRAM(1),
+                    await AsyncSolution.placeQueries(),
+                    await AsyncSolution.getQueryProfile(3)]
+        results = asyncio.run(calls())
+        self.assertEqual([ReturnValue.OK, ReturnValue.BAD_PARAMS, ReturnValue.OK, ReturnValue.OK, ReturnValue.OK,
+                          ReturnValue.OK, ReturnValue.NOT_EXISTS, [1], (ReturnValue.OK, {})], results[:9],
+                         "Same results as the sync functions")
+        self.assertEqual(None, results[9].getQueryID(), "Should return badQuery")
+        self.assertEqual(5, Solution.averageSizeQueriesOnDisk(1), "Should work")
+
+    def test_event_loop_not_blocked(self) -> None:
+        async def calls():
+            ticks = 0
+            pending = asyncio.gather(*[AsyncSolution.getConflictingDisks() for _ in range(50)])
+            while not pending.done():
+                ticks += 1
+                await asyncio.sleep(0)
+            await pending
+            return ticks
+        self.assertGreater(asyncio.run(calls()), 1, "The loop kept running while the calls waited")
+
+    def tearDown(self) -> None:
+        AsyncSolution.shutdown()
+        super().tearDown()
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
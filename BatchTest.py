@@ -0,0 +1,100 @@
+import unittest
+import Solution
+from Utility.ReturnValue import ReturnValue
+from Tests.abstractTest import AbstractTest
+from Business.Query import Query
+from Business.RAM import RAM
+from Business.Disk import Disk
+
+
+class Test(AbstractTest):
+    def test_addDisks(self) -> None:
+        self.assertEqual(ReturnValue.OK, Solution.addDisk(Disk(1, "DELL", 10, 10, 10)), "Should work")
+        self.assertEqual([ReturnValue.OK, ReturnValue.ALREADY_EXISTS, ReturnValue.BAD_PARAMS, ReturnValue.OK,
+                          ReturnValue.ALREADY_EXISTS, ReturnValue.BAD_PARAMS, ReturnValue.BAD_PARAMS,
+                          ReturnValue.OK],
+                         Solution.addDisks([Disk(2, "DELL", 10, 10, 10),
+                                            Disk(1, "HP", 10, 10, 10),
+                                            Disk(1, "HP", 0, 10, 10),
+                                            Disk(3, "HP", 10, 0, 10),
+                                            Disk(3, "HP", 10, 0, 10),
+                                            Disk(4, None, 10, 10, 10),
+                                            Disk(4, "HP", 10, -1, 10),
+                                            Disk(4, "HP", 10, 10, 10)]),
+                         "Same results as calling addDisk for each disk")
+        disk = Solution.getDiskProfile(3)
+        self.assertEqual(disk.getCompany(), "HP", "Should work")
+        self.assertEqual(disk.getFreeSpace(), 0, "Should work")
+        self.assertEqual(ReturnValue.ALREADY_EXISTS, Solution.addDisk(Disk(4, "HP", 10, 10, 10)),
+                         "Disk 4 was added")
+        self.assertEqual([], Solution.addDisks([]), "Nothing to add")
+
+    def test_addRAMs_and_addQueries(self) -> None:
+        self.assertEqual([ReturnValue.OK, ReturnValue.OK, ReturnValue.BAD_PARAMS, ReturnValue.ALREADY_EXISTS],
+                         Solution.addRAMs([RAM(1, "DELL", 10), RAM(2, "DELL", 10), RAM(3, "DELL", 0),
+                                           RAM(2, "HP", 5)]), "Should work")
+        self.assertEqual(10, Solution.getRAMProfile(2).getSize(), "First RAM with ID 2 was kept")
+        self.assertEqual([ReturnValue.OK, ReturnValue.ERROR, ReturnValue.BAD_PARAMS, ReturnValue.OK],
+                         Solution.addQueries([Query(1, "stuff", 0), Query("one", "stuff", 3),
+                                              Query(2, "stuff", -3), Query(2, "stuff", 3)]),
+                         "A bad row does not stop the rest of the batch")
+        self.assertEqual(3, Solution.getQueryProfile(2).getSize(), "Should work")
+        Solution.dropTables()
+        self.assertEqual([ReturnValue.ERROR, ReturnValue.ERROR], Solution.addQueries([Query(1, "stuff", 0),
+                                                                                      Query(2, "stuff", 0)]),
+                         "Should error")
+
+    # a row only the database can validate is inserted after the batch, a later row with its ID must not
+    # take its place
+    def test_doubtful_rows_keep_input_order(self) -> None:
+        self.assertEqual([ReturnValue.OK, ReturnValue.ALREADY_EXISTS],
+                         Solution.addQueries([Query(7, "stuff", 1.0), Query(7, "other", 1)]),
+                         "Same results as calling addQuery for each query")
+        self.assertEqual("stuff", Solution.getQueryProfile(7).getPurpose(), "First query with ID 7 was kept")
+        self.assertEqual([ReturnValue.ERROR, ReturnValue.OK, ReturnValue.ALREADY_EXISTS],
+                         Solution.addQueries([Query(8, "stuff", "big"), Query(8, "stuff", 2), Query(8, "other", 3)]),
+                         "Should work")
+        self.assertEqual(2, Solution.getQueryProfile(8).getSize(), "Should work")
+        self.assertEqual([ReturnValue.OK, ReturnValue.ALREADY_EXISTS, ReturnValue.OK],
+                         Solution.addDisks([Disk(5, "DELL", 10, 10.0, 10), Disk(5, "HP", 10, 10, 10),
+                                            Disk(6, "HP", 10, 10, 10)]), "Should work")
+        self.assertEqual("DELL", Solution.getDiskProfile(5).getCompany(), "First disk with ID 5 was kept")
+        self.assertEqual([ReturnValue.OK, ReturnValue.ALREADY_EXISTS, ReturnValue.OK],
+                         Solution.addRAMs([RAM(2, "DELL", 2.0), RAM(2, "HP", 1), RAM(3, "HP", 1)]), "Should work")
+        self.assertEqual("DELL", Solution.getRAMProfile(2).getCompany(), "First RAM with ID 2 was kept")
+
+    def test_getProfiles(self) -> None:
+        self.assertEqual(ReturnValue.OK, Solution.addDisk(Disk(1, "DELL", 10, 10, 10)), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.addDisk(Disk(2, "HP", 20, 5, 30)), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.addRAM(RAM(1, "DELL", 10)), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.addQuery(Query(7, "stuff", 3)), "Should work")
+        disks = Solution.getDiskProfiles([2, 3, 1, 2, None])
+        self.assertEqual([2, None, 1, 2, None], [disk.getDiskID() for disk in disks], "Input order, badDisk if missing")
+        self.assertEqual(("HP", 20, 5, 30), (disks[0].getCompany(), disks[0].getSpeed(), disks[0].getFreeSpace(),
+                                             disks[0].getCost()), "Should work")
+        self.assertIsNot(disks[0], disks[3], "Each entry is its own Disk")
+        self.assertEqual([None, 1], [ram.getRamID() for ram in Solution.getRAMProfiles([2, 1])], "Should work")
+        self.assertEqual([(7, "stuff", 3)], [(query.getQueryID(), query.getPurpose(), query.getSize())
+                                             for query in Solution.getQueryProfiles([7])], "Should work")
+        self.assertEqual([], Solution.getQueryProfiles([]), "Nothing to get")
+        Solution.dropTables()
+        self.assertEqual([None, None], [disk.getDiskID() for disk in Solution.getDiskProfiles([1, 2])],
+                         "Should return badDisk")
+
+    def test_getQueriesCanBeAddedToDisks(self) -> None:
+        for diskID, free_space in ((1, 10), (2, 3), (3, 10), (4, 0)):
+            self.assertEqual(ReturnValue.OK, Solution.addDisk(Disk(diskID, "DELL", 10, free_space, 10)), "Should work")
+        self.assertEqual([ReturnValue.OK] * 8, Solution.addQueries([Query(queryID, "stuff", queryID)
+                                                                    for queryID in range(1, 9)]), "Should work")
+        diskIDs = [2, 1, 9, 4, 3, 2]
+        self.assertEqual([Solution.getQueriesCanBeAddedToDisk(diskID) for diskID in diskIDs],
+                         Solution.getQueriesCanBeAddedToDisks(diskIDs), "Same lists, in input order")
+        self.assertEqual([[3, 2], [8, 7]], Solution.getQueriesCanBeAddedToDisks([2, 1], k=2), "Top k")
+        self.assertEqual([], Solution.getQueriesCanBeAddedToDisks([]), "Nothing to get")
+        Solution.dropTables()
+        self.assertEqual([[], []], Solution.getQueriesCanBeAddedToDisks([1, 2]), "Should return empty lists")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
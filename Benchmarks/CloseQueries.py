@@ -0,0 +1,86 @@
+'''
+    Latency of getCloseQueries against the old DiskandQuery self-join, for a query on the busiest disks
+    and a query on ordinary ones, and of getCloseQueriesBatch against calling getCloseQueries in a loop.
+    Every query is put on COPIES random disks, the first HOT disks get a large share of them.
+    run from the repository root: python -m Benchmarks.CloseQueries [disks:queries ...]
+    WARNING: drops and recreates the Solution.py tables
+'''
+import statistics
+import sys
+import time
+import Solution
+import Utility.DBConnector as Connector
+
+COPIES = 3
+HOT = 5
+BATCH = 200
+Connector.prepare("legacyCloseQueries",
+                  "SELECT D.queryid"
+                  " FROM (SELECT count(a.queryid),b.queryid "
+                  "FROM diskandquery AS a INNER JOIN diskandquery AS b ON a.diskid=b.diskid and a.queryid<>b.queryid "
+                  "WHERE a.queryid=$1 GROUP BY b.queryid) AS D"
+                  " WHERE D.count>=(SELECT COUNT(diskid)"
+                  "FROM diskandquery"
+                  " WHERE diskandquery.queryid=$1)/(2*1.0) "
+                  " UNION "
+                  "SELECT queryID "
+                  "FROM Query "
+                  "WHERE queryID<>$1 and NOT EXISTS(SELECT queryID FROM DiskandQuery WHERE queryID=$1) "
+                  "ORDER BY queryid ASC LIMIT 10")
+
+
+# query q is on disks hash(q, copy), one in 20 copies goes to the HOT disks
+def populate(conn, disks: int, queries: int):
+    conn.execute("INSERT INTO Disk SELECT g, 'DELL', 10, 1000000000, 1 FROM generate_series(1, {}) g"
+                 .format(disks))
+    conn.execute("INSERT INTO Query SELECT g, 'stuff', 1 FROM generate_series(1, {}) g".format(queries))
+    conn.execute("INSERT INTO DiskandQuery SELECT DISTINCT ON (d, q) d, q, 'stuff', 1 FROM "
+                 "(SELECT q, CASE WHEN (q * 31 + c) % 20 = 0 THEN (q * 7 + c) % {0} + 1 "
+                 "ELSE ((q::BIGINT * 2654435761 + c * 40503) % {1}) + 1 END AS d "
+                 "FROM generate_series(1, {2}) q, generate_series(1, {3}) c) AS P"
+                 .format(HOT, disks, queries, COPIES))
+    conn.execute("ANALYZE")
+    conn.commit()
+
+
+def measure(conn, statement, params, repeat=5):
+    timings = []
+    res = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _, res = conn.execute_prepared(statement, params)
+        timings.append((time.perf_counter() - start) * 1000)
+        conn.commit()
+    return statistics.median(timings), res.column('queryid')
+
+
+def run(sizes):
+    for disks, queries in sizes:
+        Solution.dropTables()
+        Solution.createTables()
+        conn = Connector.DBConnector(pooled=True)
+        try:
+            populate(conn, disks, queries)
+            print("%d disks, %d queries" % (disks, queries))
+            _, res = conn.execute("SELECT queryID FROM DiskandQuery WHERE diskID=1 LIMIT 1")
+            conn.commit()
+            for name, queryID in (("hot", res[0]['queryid']), ("ordinary", queries // 2 + 1)):
+                footprint, close = measure(conn, "getCloseQueries", (queryID,))
+                selfJoin, legacyClose = measure(conn, "legacyCloseQueries", (queryID,))
+                assert close == legacyClose, "results differ"
+                print("    %-8s query  self-join %9.2f ms   getCloseQueries %7.2f ms" % (name, selfJoin, footprint))
+        finally:
+            conn.close()
+        queryIDs = list(range(1, queries + 1, queries // BATCH))[:BATCH]
+        start = time.perf_counter()
+        close = [Solution.getCloseQueries(queryID) for queryID in queryIDs]
+        loop = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        assert close == Solution.getCloseQueriesBatch(queryIDs), "results differ"
+        batch = (time.perf_counter() - start) * 1000
+        print("    %d queries  loop %9.2f ms   batch %9.2f ms" % (len(queryIDs), loop, batch))
+    Solution.dropTables()
+
+
+if __name__ == '__main__':
+    run([tuple(int(n) for n in arg.split(":")) for arg in sys.argv[1:]] or [(10000, 100000), (10000, 1000000)])
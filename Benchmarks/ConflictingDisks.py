@@ -0,0 +1,60 @@
+'''
+    Latency of getConflictingDisks (GROUP BY / HAVING over DiskandQuery) against the old self-join,
+    with one query attached to every disk, and a check that both return the same disks.
+    run from the repository root: python -m Benchmarks.ConflictingDisks [disks ...]
+    WARNING: drops and recreates the Solution.py tables
+'''
+import statistics
+import sys
+import time
+import Solution
+import Utility.DBConnector as Connector
+
+QUERIES = 1000
+Connector.prepare("legacyConflictingDisks",
+                  "SELECT DISTINCT a.diskid FROM diskandquery AS a INNER JOIN diskandquery AS b "
+                  "ON a.queryid=b.queryid and a.diskid<>b.diskid ORDER BY a.diskid ASC")
+
+
+# query 1 is on every disk, the other queries on one disk each
+def populate(conn, disks: int):
+    conn.execute("INSERT INTO Disk SELECT g, 'DELL', 10, 1000000000, 1 FROM generate_series(1, {}) g"
+                 .format(disks))
+    conn.execute("INSERT INTO Query SELECT g, 'stuff', 1 FROM generate_series(1, {}) g".format(QUERIES))
+    conn.execute("INSERT INTO DiskandQuery SELECT g, 1, 'stuff', 1 FROM generate_series(1, {}) g".format(disks))
+    conn.execute("INSERT INTO DiskandQuery SELECT g % {} + 1, g, 'stuff', 1 FROM generate_series(2, {}) g"
+                 .format(disks, QUERIES))
+    conn.execute("ANALYZE")
+    conn.commit()
+
+
+def measure(conn, statement, repeat=5):
+    timings = []
+    res = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _, res = conn.execute_prepared(statement)
+        timings.append((time.perf_counter() - start) * 1000)
+        conn.commit()
+    return statistics.median(timings), res.column('diskid')
+
+
+def run(sizes):
+    for disks in sizes:
+        Solution.dropTables()
+        Solution.createTables()
+        conn = Connector.DBConnector(pooled=True)
+        try:
+            populate(conn, disks)
+            grouped, result = measure(conn, "getConflictingDisks")
+            selfJoin, legacyResult = measure(conn, "legacyConflictingDisks", repeat=1)
+            assert result == legacyResult, "results differ"
+            print("%6d disks sharing a query   group by %9.2f ms   self-join %9.2f ms"
+                  % (disks, grouped, selfJoin))
+        finally:
+            conn.close()
+    Solution.dropTables()
+
+
+if __name__ == '__main__':
+    run([int(arg) for arg in sys.argv[1:]] or [1000, 10000])
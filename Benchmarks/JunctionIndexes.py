@@ -0,0 +1,90 @@
+'''
+    Plans and latency of the lookups that go from queryID, queryPurpose or ramID into the junction tables,
+    with and without the secondary indexes createTables defines.
+    run from the repository root: python -m Benchmarks.JunctionIndexes [junction rows ...]
+    WARNING: drops and recreates the Solution.py tables
+'''
+import statistics
+import sys
+import time
+import Solution
+import Utility.DBConnector as Connector
+
+DISKS = 1000
+PURPOSES = 50
+INDEXES = {"DiskandQuery_queryID": "CREATE INDEX DiskandQuery_queryID ON DiskandQuery(queryID)",
+           "DiskandQuery_queryPurpose": "CREATE INDEX DiskandQuery_queryPurpose ON DiskandQuery(queryPurpose)",
+           "DiskandRam_ramID": "CREATE INDEX DiskandRam_ramID ON DiskandRam(ramID)"}
+# the statements run ROLLBACK afterwards, so the DELETE does not change the data
+LOOKUPS = {"getCostForPurpose": ("getCostForPurpose", ("purpose7",)),
+           "deleteQuery subselect": ("deleteQueryFreeSpace", (4242, 0)),
+           "getCloseQueries": ("getCloseQueries", (4242,)),
+           "Ram cascade": (None, "DELETE FROM Ram WHERE ramID=7")}
+
+
+def populate(conn, rows: int):
+    queries = rows // DISKS + 1
+    conn.execute("INSERT INTO Disk SELECT g, 'DELL', 1 + g % 10, 1000000000, 1 + g % 7 "
+                 "FROM generate_series(1, {}) g".format(DISKS))
+    conn.execute("INSERT INTO Query SELECT g, 'purpose' || g % {}, g % 100 "
+                 "FROM generate_series(1, {}) g".format(PURPOSES, queries))
+    conn.execute("INSERT INTO Ram SELECT g, 'DELL', 1 + g % 64 FROM generate_series(1, {}) g".format(queries))
+    conn.execute("INSERT INTO DiskandQuery SELECT g % {0} + 1, g / {0} + 1, 'purpose' || (g / {0} + 1) % {1}, "
+                 "(g / {0} + 1) % 100 FROM generate_series(0, {2} - 1) g".format(DISKS, PURPOSES, rows))
+    conn.execute("INSERT INTO DiskandRam SELECT g % {0} + 1, g / {0} + 1 "
+                 "FROM generate_series(0, {1} - 1) g".format(DISKS, rows))
+    conn.execute("ANALYZE")
+    conn.commit()
+
+
+def measure(conn, statement, params, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        if statement is None:
+            conn.execute(params)
+        else:
+            conn.execute_prepared(statement, params)
+        timings.append((time.perf_counter() - start) * 1000)
+        conn.rollback()
+    return statistics.median(timings)
+
+
+def plan(conn, statement, params) -> str:
+    if statement is None:
+        _, res = conn.execute("EXPLAIN ANALYZE " + params)
+    else:
+        _, res = conn.execute("EXPLAIN ANALYZE EXECUTE " + statement + "(" + ", ".join(repr(p) for p in params) + ")")
+    conn.rollback()
+    lines = [row[0] for row in res.rows]
+    scans = [line.strip() for line in lines if "Scan" in line or "Trigger" in line]
+    return "\n        ".join(scans)
+
+
+def run(sizes):
+    for rows in sizes:
+        Solution.dropTables()
+        Solution.createTables()
+        conn = Connector.DBConnector(pooled=True)
+        try:
+            populate(conn, rows)
+            print("%d junction rows" % rows)
+            for indexed in (False, True):
+                for name in INDEXES:
+                    conn.execute("DROP INDEX IF EXISTS " + name)
+                if indexed:
+                    for create in INDEXES.values():
+                        conn.execute(create)
+                conn.execute("ANALYZE")
+                conn.commit()
+                print("  %s secondary indexes" % ("with" if indexed else "without"))
+                for name, (statement, params) in LOOKUPS.items():
+                    print("    %-22s %10.2f ms" % (name, measure(conn, statement, params)))
+                    print("        " + plan(conn, statement, params))
+        finally:
+            conn.close()
+    Solution.dropTables()
+
+
+if __name__ == '__main__':
+    run([int(arg) for arg in sys.argv[1:]] or [100000, 1000000])
@@ -0,0 +1,64 @@
+'''
+    Latency of mostAvailableDisks (sort-and-count window over query sizes and disk free spaces) against
+    the old Disk LEFT JOIN Query formulation, and a check that both return the same top 5.
+    run from the repository root: python -m Benchmarks.MostAvailableDisks [disks:queries ...]
+    the join is skipped above LEGACY_LIMIT disk x query pairs, it would run for minutes
+    WARNING: drops and recreates the Solution.py tables
+'''
+import statistics
+import sys
+import time
+import Solution
+import Utility.DBConnector as Connector
+
+LEGACY_LIMIT = 10 ** 8
+Connector.prepare("legacyMostAvailableDisks",
+                  "SELECT C.did FROM (SELECT disk.diskid AS did ,query.queryid AS qid ,disk.speed AS ds  "
+                  "FROM Disk LEFT OUTER JOIN Query ON disk.free_space>=query.size) AS C "
+                  "GROUP BY C.did,C.ds "
+                  "ORDER BY COUNT(C.qid) DESC,C.ds DESC, C.did ASC LIMIT 5")
+
+
+def populate(conn, disks: int, queries: int):
+    # many ties on free space and speed, so the diskID tie break is exercised
+    conn.execute("INSERT INTO Disk SELECT g, 'DELL', 1 + g % 10, g % 1000, 1 FROM generate_series(1, {}) g"
+                 .format(disks))
+    conn.execute("INSERT INTO Query SELECT g, 'stuff', (g::bigint * 7919) % 1000 FROM generate_series(1, {}) g"
+                 .format(queries))
+    conn.execute("ANALYZE")
+    conn.commit()
+
+
+def measure(conn, statement, repeat=5):
+    timings = []
+    res = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _, res = conn.execute_prepared(statement)
+        timings.append((time.perf_counter() - start) * 1000)
+        conn.commit()
+    return statistics.median(timings), res.column(res.cols_header[0])
+
+
+def run(sizes):
+    for disks, queries in sizes:
+        Solution.dropTables()
+        Solution.createTables()
+        conn = Connector.DBConnector(pooled=True)
+        try:
+            populate(conn, disks, queries)
+            print("%d disks, %d queries" % (disks, queries))
+            window, top = measure(conn, "mostAvailableDisks")
+            print("    %-8s %10.2f ms  %s" % ("window", window, top))
+            if disks * queries <= LEGACY_LIMIT:
+                join, legacyTop = measure(conn, "legacyMostAvailableDisks", repeat=1)
+                print("    %-8s %10.2f ms  %s" % ("join", join, legacyTop))
+                assert top == legacyTop, "top 5 differs"
+        finally:
+            conn.close()
+    Solution.dropTables()
+
+
+if __name__ == '__main__':
+    run([tuple(int(n) for n in arg.split(":")) for arg in sys.argv[1:]]
+        or [(1000, 10000), (1000, 100000), (10000, 1000000)])
@@ -0,0 +1,53 @@
+'''
+    Time of placeQueries for every unplaced query, and a check of the applied placement: no disk over its
+    free space, no query bigger than its disk's RAM, every placed query on exactly one disk.
+    run from the repository root: python -m Benchmarks.Placement [disks:queries ...]
+    WARNING: drops and recreates the Solution.py tables
+'''
+import sys
+import time
+import Solution
+import Utility.DBConnector as Connector
+
+
+def populate(conn, disks: int, queries: int):
+    conn.execute("INSERT INTO Disk SELECT g, 'DELL', 10, 1000 + (g * 7919) % 50000, 1 + g % 13 "
+                 "FROM generate_series(1, {}) g".format(disks))
+    conn.execute("INSERT INTO Ram SELECT g, 'DELL', 50 + (g * 31) % 1000 FROM generate_series(1, {}) g".format(disks))
+    conn.execute("INSERT INTO DiskandRam SELECT g, g FROM generate_series(1, {}) g".format(disks))
+    conn.execute("INSERT INTO Query SELECT g, 'purpose' || g % 10, (g::BIGINT * 104729) % 1000 "
+                 "FROM generate_series(1, {}) g".format(queries))
+    conn.execute("ANALYZE")
+    conn.commit()
+
+
+def check(conn) -> str:
+    _, res = conn.execute("SELECT (SELECT COUNT(*) FROM Disk WHERE free_space < 0) AS overfull, "
+                          "(SELECT COUNT(*) FROM DiskandQuery INNER JOIN DiskStats "
+                          "ON(DiskandQuery.diskID = DiskStats.diskID) WHERE querySize > ram_total) AS ram, "
+                          "(SELECT COUNT(*) - COUNT(DISTINCT queryID) FROM DiskandQuery) AS duplicated, "
+                          "(SELECT COUNT(*) FROM DiskandQuery) AS placed")
+    conn.commit()
+    return ", ".join("%s %d" % (column, res[0][column]) for column in ('placed', 'overfull', 'ram', 'duplicated'))
+
+
+def run(sizes):
+    for disks, queries in sizes:
+        for minimizeCost in (False, True):
+            Solution.dropTables()
+            Solution.createTables()
+            conn = Connector.DBConnector(pooled=True)
+            try:
+                populate(conn, disks, queries)
+                start = time.perf_counter()
+                result, placement = Solution.placeQueries(minimizeCost=minimizeCost)
+                elapsed = time.perf_counter() - start
+                print("%d disks, %d queries, minimizeCost=%s: %s in %.2f s (%s)"
+                      % (disks, queries, minimizeCost, result, elapsed, check(conn)))
+            finally:
+                conn.close()
+    Solution.dropTables()
+
+
+if __name__ == '__main__':
+    run([tuple(int(n) for n in arg.split(":")) for arg in sys.argv[1:]] or [(1000, 100000), (10000, 1000000)])
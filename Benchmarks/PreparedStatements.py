@@ -0,0 +1,80 @@
+'''
+    Calls per second of getDiskProfile / addQueryToDisk through prepared statements (what Solution.py does)
+    against the old sql.Literal interpolation path, both on pooled connections.
+    run from the repository root: python -m Benchmarks.PreparedStatements [calls]
+    WARNING: drops and recreates the Solution.py tables
+'''
+import sys
+import time
+import Solution
+import Utility.DBConnector as Connector
+from Business.Disk import Disk
+from Business.Query import Query
+from psycopg2 import sql
+
+
+def literalDiskProfile(diskID: int):
+    conn = Connector.DBConnector(pooled=True)
+    try:
+        sql_query = sql.SQL("SELECT * FROM Disk WHERE diskID={id}").format(id=sql.Literal(diskID))
+        conn.execute(sql_query)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def preparedDiskProfile(diskID: int):
+    conn = Connector.DBConnector(pooled=True)
+    try:
+        conn.execute_prepared("getDiskProfile", (diskID,))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def literalAddQueryToDisk(query: Query, diskID: int):
+    conn = Connector.DBConnector(pooled=True)
+    try:
+        sql_query = sql.SQL("BEGIN;"
+                            "INSERT INTO DiskandQuery(diskID,queryID,queryPurpose,querySize) "
+                            "VALUES({diskid}, {queryid}, {querypurpose}, {querysize});"
+                            "UPDATE Disk SET free_space=free_space-{querysize} WHERE diskID={diskid};"
+                            "COMMIT;"). \
+            format(diskid=sql.Literal(diskID), queryid=sql.Literal(query.getQueryID()),
+                   querypurpose=sql.Literal(query.getPurpose()), querysize=sql.Literal(query.getSize()))
+        conn.execute(sql_query)
+    finally:
+        conn.close()
+
+
+def callsPerSecond(function, arguments) -> float:
+    start = time.perf_counter()
+    for args in arguments:
+        function(*args)
+    return len(arguments) / (time.perf_counter() - start)
+
+
+def run(calls=5000):
+    Solution.dropTables()
+    Solution.createTables()
+    try:
+        for diskID in range(1, 101):
+            Solution.addDisk(Disk(diskID, "DELL", 10, 10 ** 9, 10))
+        queries = [Query(queryID, "stuff", 1) for queryID in range(1, 2 * calls + 1)]
+        for query in queries:
+            Solution.addQuery(query)
+
+        profiles = [(diskID % 100 + 1,) for diskID in range(calls)]
+        print("getDiskProfile  literal  %10.0f calls/s" % callsPerSecond(literalDiskProfile, profiles))
+        print("getDiskProfile  prepared %10.0f calls/s" % callsPerSecond(preparedDiskProfile, profiles))
+
+        literal = [(query, query.getQueryID() % 100 + 1) for query in queries[:calls]]
+        prepared = [(query, query.getQueryID() % 100 + 1) for query in queries[calls:]]
+        print("addQueryToDisk  literal  %10.0f calls/s" % callsPerSecond(literalAddQueryToDisk, literal))
+        print("addQueryToDisk  prepared %10.0f calls/s" % callsPerSecond(Solution.addQueryToDisk, prepared))
+    finally:
+        Solution.dropTables()
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,88 @@
+'''
+    Latency of getQueriesCanBeAddedToDisk / getQueriesCanBeAddedToDiskAndRAM with Query_queryID_size against
+    the old statements without it, for a disk every query fits on, one few queries fit on and one none fit on,
+    and getQueriesCanBeAddedToDisks for BATCH disks against calling getQueriesCanBeAddedToDisk for each.
+    run from the repository root: python -m Benchmarks.QueriesCanBeAdded [queries ...]
+    WARNING: drops and recreates the Solution.py tables
+'''
+import statistics
+import sys
+import time
+import Solution
+import Utility.DBConnector as Connector
+
+# diskID: free space, every disk gets the same RAM
+DISKS = {1: 1000000000, 2: 5, 3: 0}
+BATCH = 5000
+Connector.prepare("legacyQueriesCanBeAddedToDisk",
+                  "SELECT queryID FROM Query WHERE size<=(SELECT free_space FROM Disk WHERE diskID=$1) "
+                  "ORDER BY queryID DESC LIMIT 5")
+Connector.prepare("legacyQueriesCanBeAddedToDiskAndRAM",
+                  "SELECT queryID FROM Query WHERE size<=(SELECT free_space FROM Disk WHERE diskID=$1) "
+                  "and size<=(SELECT SUM(size) FROM Ram WHERE ramID IN (SELECT ramID from DiskandRam WHERE diskID=$1))"
+                  "ORDER BY queryID ASC LIMIT 5")
+STATEMENTS = (("getQueriesCanBeAddedToDisk", "legacyQueriesCanBeAddedToDisk"),
+              ("getQueriesCanBeAddedToDiskAndRAM", "legacyQueriesCanBeAddedToDiskAndRAM"))
+
+
+# sizes 1..1000, so nothing fits on disk 3
+def populate(conn, queries: int):
+    for diskID, free_space in DISKS.items():
+        conn.execute("INSERT INTO Disk VALUES({}, 'DELL', 10, {}, 1)".format(diskID, free_space))
+    conn.execute("INSERT INTO Ram VALUES(1, 'DELL', 1000000000)")
+    conn.execute("INSERT INTO DiskandRam SELECT diskID, 1 FROM Disk")
+    conn.execute("INSERT INTO Query SELECT g, 'stuff', 1 + (g::BIGINT * 7919) % 1000 FROM generate_series(1, {}) g"
+                 .format(queries))
+    conn.execute("ANALYZE")
+    conn.commit()
+
+
+def measure(conn, statement, params, repeat=5):
+    timings = []
+    res = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _, res = conn.execute_prepared(statement, params)
+        timings.append((time.perf_counter() - start) * 1000)
+        conn.commit()
+    return statistics.median(timings), res.column('queryid')
+
+
+def run(sizes):
+    for queries in sizes:
+        Solution.dropTables()
+        Solution.createTables()
+        conn = Connector.DBConnector(pooled=True)
+        try:
+            populate(conn, queries)
+            print("%d queries" % queries)
+            indexed = {(statement, diskID): measure(conn, statement, (diskID,))
+                       for statement, _ in STATEMENTS for diskID in DISKS}
+            conn.execute("DROP INDEX Query_queryID_size")
+            conn.commit()
+            for statement, legacy in STATEMENTS:
+                for diskID in DISKS:
+                    old, legacyResult = measure(conn, legacy, (diskID,))
+                    new, result = indexed[(statement, diskID)]
+                    assert result == legacyResult, "results differ"
+                    print("    %-34s disk %d   old %9.2f ms   indexed %9.2f ms" % (statement, diskID, old, new))
+            conn.execute("CREATE INDEX Query_queryID_size ON Query(queryID, size)")
+            conn.execute("INSERT INTO Disk SELECT 100 + g, 'DELL', 10, 1 + (g * 37) % 2000, 1 "
+                         "FROM generate_series(1, {}) g".format(BATCH))
+            conn.execute("ANALYZE")
+            conn.commit()
+        finally:
+            conn.close()
+        diskIDs = list(range(101, 101 + BATCH))
+        start = time.perf_counter()
+        fitting = [Solution.getQueriesCanBeAddedToDisk(diskID) for diskID in diskIDs]
+        loop = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        assert fitting == Solution.getQueriesCanBeAddedToDisks(diskIDs), "results differ"
+        batch = (time.perf_counter() - start) * 1000
+        print("    %d disks   loop %9.2f ms   getQueriesCanBeAddedToDisks %9.2f ms" % (BATCH, loop, batch))
+    Solution.dropTables()
+
+
+if __name__ == '__main__':
+    run([int(arg) for arg in sys.argv[1:]] or [100000, 1000000])
@@ -0,0 +1,73 @@
+'''
+    Time of the same workload through Solution.py on PostgreSQL and on SQLite (Utility/SQLiteConnector.py):
+    bulk adds of DISKS disks, their RAMs and N queries, N addQueryToDisk calls, and READS calls of each
+    read function.
+    run from the repository root: python -m Benchmarks.SQLite [N ...]
+    WARNING: drops and recreates the Solution.py tables, the SQLite database is a temporary file
+'''
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import Solution
+import Utility.DBConnector as Connector
+import Utility.SQLiteConnector as SQLiteConnector
+from Business.Query import Query
+from Business.RAM import RAM
+from Business.Disk import Disk
+
+DISKS = 100
+READS = 200
+READ_FUNCTIONS = ("getDiskProfile", "averageSizeQueriesOnDisk", "getQueriesCanBeAddedToDisk", "isCompanyExclusive",
+                  "getCloseQueries")
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return (time.perf_counter() - start) * 1000
+
+
+def workload(count: int):
+    rng = random.Random(236363)
+    queries = [Query(queryID, "purpose%d" % rng.randrange(20), rng.randint(1, 100)) for queryID in range(1, count + 1)]
+    placements = [(query, rng.randint(1, DISKS)) for query in queries]
+    Solution.dropTables()
+    Solution.createTables()
+    results = {"bulk adds": timed(lambda: (Solution.addDisks([Disk(diskID, "DELL", 10, 10 ** 6, 1)
+                                                              for diskID in range(1, DISKS + 1)]),
+                                           Solution.addRAMs([RAM(ramID, "DELL", 10) for ramID in range(1, DISKS + 1)]),
+                                           Solution.addQueries(queries)))}
+    results["addRAMToDisk x %d" % DISKS] = timed(lambda: [Solution.addRAMToDisk(diskID, diskID)
+                                                          for diskID in range(1, DISKS + 1)])
+    results["addQueryToDisk x %d" % count] = timed(lambda: [Solution.addQueryToDisk(query, diskID)
+                                                           for query, diskID in placements])
+    for name in READ_FUNCTIONS:
+        ids = [rng.randint(1, DISKS if "Disk" in name or name == "isCompanyExclusive" else count)
+               for _ in range(READS)]
+        latencies = [timed(lambda: getattr(Solution, name)(id)) for id in ids]
+        results[name + " median"] = statistics.median(latencies)
+    results["mostAvailableDisks"] = timed(Solution.mostAvailableDisks)
+    results["getConflictingDisks"] = timed(Solution.getConflictingDisks)
+    Solution.dropTables()
+    return results
+
+
+def run(counts):
+    with tempfile.TemporaryDirectory() as directory:
+        for count in counts:
+            postgres = workload(count)
+            SQLiteConnector.useSQLite(os.path.join(directory, "benchmark.sqlite"))
+            try:
+                sqlite = workload(count)
+            finally:
+                Connector.setEngine(None)
+            print("N=%d" % count)
+            for name in postgres:
+                print("  %s: PostgreSQL %.2f ms, SQLite %.2f ms" % (name, postgres[name], sqlite[name]))
+
+
+if __name__ == '__main__':
+    run([int(arg) for arg in sys.argv[1:]] or [1000, 10000])
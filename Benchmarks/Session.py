@@ -0,0 +1,46 @@
+'''
+    Time of the addDisk, addRAM, addRAMToDisk, addQueryToDisk x N workflow as separate calls, inside
+    Connector.session() and inside Connector.session(savepoints=True).
+    run from the repository root: python -m Benchmarks.Session [N ...]
+    WARNING: drops and recreates the Solution.py tables
+'''
+import sys
+import time
+import Solution
+import Utility.DBConnector as Connector
+from contextlib import nullcontext
+from Business.Query import Query
+from Business.RAM import RAM
+from Business.Disk import Disk
+
+
+def workflow(diskID: int, queries):
+    Solution.addDisk(Disk(diskID, "DELL", 10, 10 ** 9, 1))
+    Solution.addRAM(RAM(diskID, "DELL", 10))
+    Solution.addRAMToDisk(diskID, diskID)
+    for query in queries:
+        Solution.addQueryToDisk(query, diskID)
+
+
+def run(counts):
+    Solution.dropTables()
+    Solution.createTables()
+    queries = [Query(queryID, "stuff", 1) for queryID in range(1, 3 * sum(counts) + 1)]
+    Solution.addQueries(queries)
+    modes = (("separate calls", nullcontext), ("session", Connector.session),
+             ("session with savepoints", lambda: Connector.session(savepoints=True)))
+    diskID = 0
+    placed = 0
+    for count in counts:
+        for name, context in modes:
+            diskID += 1
+            start = time.perf_counter()
+            with context():
+                workflow(diskID, queries[placed:placed + count])
+            placed += count
+            print("N=%d, %s: %.1f ms" % (count, name, (time.perf_counter() - start) * 1000))
+    Solution.dropTables()
+
+
+if __name__ == '__main__':
+    run([int(arg) for arg in sys.argv[1:]] or [10, 50, 200, 1000])
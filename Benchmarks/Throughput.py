@@ -0,0 +1,212 @@
+'''
+    Throughput (ops/s) and p50/p99 latency of every public function of Solution.py on a Workload population,
+    for each scale. Writes go to rows added for the benchmark (IDs above the population) and are undone by
+    the matching delete/remove calls, reads pick IDs with the population's skew. Every function is called up
+    to CALLS times or for SECONDS seconds; createTables, clearTables and dropTables run once, at the end.
+    The results are written as JSON, pass --compare with the JSON of another commit to print the change.
+    run from the repository root:
+        python -m Benchmarks.Throughput [--calls N] [--seconds S] [--output FILE] [--compare FILE] [scale ...]
+    WARNING: drops and recreates the Solution.py tables
+'''
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+import Solution
+from Utility.ReturnValue import ReturnValue
+from Benchmarks.Workload import Workload
+from Business.Query import Query
+from Business.RAM import RAM
+from Business.Disk import Disk
+
+CALLS = 200
+SECONDS = 5.0
+BATCH = 20
+
+
+# the functions of the Solution.py API, see Solution._dispatch
+def publicFunctions() -> list:
+    return [name for name in dir(Solution) if hasattr(getattr(Solution, name), '__wrapped__')]
+
+
+# (name, function of the call number returning the args of the call, run outside the timing) in the
+# order they run: a function that removes rows runs after the one that added them
+def operations(workload: Workload) -> list:
+    # the last ID used of each kind, the rows the benchmark adds come after the population
+    last = {'query': workload.queries, 'disk': workload.disks, 'ram': workload.rams}
+    # the Query objects, diskIDs and ramIDs the benchmark added
+    added = {'query': [], 'disk': [], 'ram': []}
+
+    def fresh(kind: str) -> int:
+        last[kind] += 1
+        return last[kind]
+
+    def newQuery():
+        added['query'].append(Query(fresh('query'), workload.purpose(), workload.size()))
+        return added['query'][-1]
+
+    def newDisk():
+        added['disk'].append(fresh('disk'))
+        return Disk(added['disk'][-1], "DELL", workload.skewed(10), workload.skewed(10 ** 6), workload.skewed(100))
+
+    def newRAM():
+        added['ram'].append(fresh('ram'))
+        return RAM(added['ram'][-1], "DELL", workload.skewed(64))
+
+    # the (query, disk) pairs placed by addQueryToDisk, removed again by removeQueryFromDisk
+    placed = []
+
+    def placeOne(number):
+        placed.append((added['query'][number % len(added['query'])], workload.diskID()))
+        return placed[-1]
+
+    # unplaced queries for placeQueries, added outside the timing
+    def unplaced(number):
+        batch = [newQuery() for _ in range(BATCH)]
+        Solution.addQueries(batch)
+        return [query.getQueryID() for query in batch], number % 2 == 1
+
+    # the (disk, RAM) pairs attached by addRAMToDisk, detached again by removeRAMFromDisk
+    attached = []
+
+    def attachOne(number):
+        attached.append((workload.diskID(), added['ram'][number % len(added['ram'])]))
+        return attached[-1]
+
+    return [
+        ("addQuery", lambda number: (newQuery(),)),
+        ("addQueries", lambda number: ([newQuery() for _ in range(BATCH)],)),
+        ("getQueryProfile", lambda number: (workload.queryID(),)),
+        ("getQueryProfiles", lambda number: ([workload.queryID() for _ in range(BATCH)],)),
+        ("addDisk", lambda number: (newDisk(),)),
+        ("addDisks", lambda number: ([newDisk() for _ in range(BATCH)],)),
+        ("getDiskProfile", lambda number: (workload.diskID(),)),
+        ("getDiskProfiles", lambda number: ([workload.diskID() for _ in range(BATCH)],)),
+        ("addRAM", lambda number: (newRAM(),)),
+        ("addRAMs", lambda number: ([newRAM() for _ in range(BATCH)],)),
+        ("getRAMProfile", lambda number: (workload.ramID(),)),
+        ("getRAMProfiles", lambda number: ([workload.ramID() for _ in range(BATCH)],)),
+        ("addDiskAndQuery", lambda number: (newDisk(), newQuery())),
+        ("addQueryToDisk", placeOne),
+        ("removeQueryFromDisk", lambda number: placed[number % len(placed)]),
+        ("placeQueries", unplaced),
+        ("addRAMToDisk", attachOne),
+        ("removeRAMFromDisk", lambda number: attached[number % len(attached)]),
+        ("averageSizeQueriesOnDisk", lambda number: (workload.diskID(),)),
+        ("diskTotalRAM", lambda number: (workload.diskID(),)),
+        ("getCostForPurpose", lambda number: (workload.purpose(),)),
+        ("checkPurposeCosts", lambda number: ()),
+        ("getQueriesCanBeAddedToDisk", lambda number: (workload.diskID(),)),
+        ("getQueriesCanBeAddedToDisks", lambda number: ([workload.diskID() for _ in range(BATCH)],)),
+        ("getQueriesCanBeAddedToDiskAndRAM", lambda number: (workload.diskID(),)),
+        ("isCompanyExclusive", lambda number: (workload.diskID(),)),
+        ("getConflictingDisks", lambda number: ()),
+        ("mostAvailableDisks", lambda number: ()),
+        ("getCloseQueries", lambda number: (workload.queryID(),)),
+        ("getCloseQueriesBatch", lambda number: ([workload.queryID() for _ in range(BATCH)],)),
+        ("deleteQuery", lambda number: (added['query'][number % len(added['query'])],)),
+        ("deleteDisk", lambda number: (added['disk'][number % len(added['disk'])],)),
+        ("deleteRAM", lambda number: (added['ram'][number % len(added['ram'])],)),
+    ]
+
+
+# calls, ops/s, p50/p99 latency and how many calls returned each ReturnValue
+def summary(latencies, returned) -> dict:
+    total = sum(latencies)
+    if len(latencies) > 1:
+        percentiles = statistics.quantiles(latencies, n=100, method='inclusive')
+        p50, p99 = percentiles[49], percentiles[98]
+    else:
+        p50 = p99 = latencies[0]
+    return {"calls": len(latencies), "ops_per_sec": len(latencies) / total if total > 0 else None,
+            "p50_ms": p50 * 1000, "p99_ms": p99 * 1000, "returned": returned}
+
+
+# latencies in seconds of up to calls calls of Solution.name, stopping after seconds seconds, and the
+# number of calls that returned each ReturnValue
+def measure(name: str, arguments, calls: int, seconds: float) -> (list, dict):
+    function = getattr(Solution, name)
+    latencies = []
+    returned = {}
+    deadline = time.perf_counter() + seconds
+    for number in range(calls):
+        args = arguments(number)
+        start = time.perf_counter()
+        result = function(*args)
+        latencies.append(time.perf_counter() - start)
+        if isinstance(result, tuple):
+            result = result[0]
+        if isinstance(result, ReturnValue):
+            returned[result.name] = returned.get(result.name, 0) + 1
+        if start + latencies[-1] > deadline:
+            break
+    return latencies, returned
+
+
+def benchmark(scale: int, calls: int, seconds: float, seed: int) -> dict:
+    workload = Workload(scale, seed)
+    Solution.dropTables()
+    Solution.createTables()
+    start = time.perf_counter()
+    workload.populate()
+    results = {"queries": workload.queries, "disks": workload.disks, "rams": workload.rams,
+               "populate_sec": time.perf_counter() - start, "functions": {}}
+    for name, arguments in operations(workload):
+        results["functions"][name] = summary(*measure(name, arguments, calls, seconds))
+    for name in ("clearTables", "dropTables", "createTables"):
+        results["functions"][name] = summary(*measure(name, lambda number: (), 1, seconds))
+    Solution.dropTables()
+    missing = set(publicFunctions()) - set(results["functions"])
+    assert not missing, "not benchmarked: " + ", ".join(sorted(missing))
+    return results
+
+
+def commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def report(results: dict, baseline: dict):
+    for scale, result in results["scales"].items():
+        old = baseline["scales"].get(scale, {}).get("functions", {}) if baseline else {}
+        print("scale %s: %d queries, %d disks, populated in %.1f s" % (scale, result["queries"], result["disks"],
+                                                                     result["populate_sec"]))
+        for name, stats in result["functions"].items():
+            line = "    %-34s %10.1f ops/s   p50 %9.3f ms   p99 %9.3f ms" % (name, stats["ops_per_sec"] or 0,
+                                                                           stats["p50_ms"], stats["p99_ms"])
+            if name in old:
+                line += "   p50 %+6.1f%%" % ((stats["p50_ms"] / old[name]["p50_ms"] - 1) * 100)
+            print(line)
+
+
+def run(scales, calls=CALLS, seconds=SECONDS, seed=236363, output="benchmark.json", compare=None):
+    results = {"commit": commit(), "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "calls": calls,
+               "seconds": seconds, "seed": seed, "scales": {}}
+    for scale in scales:
+        results["scales"][str(scale)] = benchmark(scale, calls, seconds, seed)
+    with open(output, "w") as file:
+        json.dump(results, file, indent=2)
+    baseline = None
+    if compare is not None:
+        with open(compare) as file:
+            baseline = json.load(file)
+    report(results, baseline)
+    print("written to " + output)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("scales", nargs="*", type=int, default=[1000, 100000])
+    parser.add_argument("--calls", type=int, default=CALLS, help="calls per function")
+    parser.add_argument("--seconds", type=float, default=SECONDS, help="time limit per function")
+    parser.add_argument("--seed", type=int, default=236363)
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument("--compare", help="JSON of an earlier run")
+    args = parser.parse_args()
+    run(args.scales, args.calls, args.seconds, args.seed, args.output, args.compare)
+    sys.exit(0)
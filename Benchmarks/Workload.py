@@ -0,0 +1,115 @@
+'''
+    Synthetic Disk/RAM/Query populations for the benchmarks, generated inside postgres so that 10^7 queries
+    load in minutes. A scale of N is N queries, N / 100 disks and as many RAMs. Purposes, sizes, free space
+    and the disks queries are placed on are skewed: value k of n is drawn log-uniformly (floor(e^(u ln n))),
+    so low values are far more frequent, like Zipf's law. The same scale and seed give the same population.
+    run from the repository root: python -m Benchmarks.Workload [scale ...] to print its shape
+    WARNING: drops and recreates the Solution.py tables
+'''
+import math
+import random
+import sys
+import time
+import Solution
+import Utility.DBConnector as Connector
+
+PURPOSES = 200
+MAX_SIZE = 10000
+MAX_FREE_SPACE = 10 ** 8
+# share of the queries placed on a disk, and of those also placed on a second disk
+PLACED = 0.5
+SHARED = 0.05
+
+
+# floor(e^(u ln n)) in SQL: 1..n, skewed towards 1
+def _skewed(n: int) -> str:
+    return "LEAST(FLOOR(EXP(random() * LN({0}))), {0})::INTEGER".format(n)
+
+
+class Workload:
+    # constructor, the sizes of a population of scale queries
+    def __init__(self, scale: int, seed=236363):
+        self.scale = scale
+        self.seed = seed
+        self.queries = scale
+        self.disks = max(10, scale // 100)
+        self.rams = self.disks
+        self.rng = random.Random(seed)
+
+    # value k of 1..n with the skew of the population
+    def skewed(self, n: int) -> int:
+        return min(int(math.exp(self.rng.random() * math.log(n))), n)
+
+    def queryID(self) -> int:
+        return self.skewed(self.queries)
+
+    def diskID(self) -> int:
+        return self.skewed(self.disks)
+
+    def ramID(self) -> int:
+        return self.skewed(self.rams)
+
+    def purpose(self) -> str:
+        return "purpose%d" % self.skewed(PURPOSES)
+
+    def size(self) -> int:
+        return self.skewed(MAX_SIZE)
+
+    # fill the (just created) tables of Solution.py, the triggers keep DiskStats and PurposeCost up to date.
+    # The free space of a disk stands for what is left after its queries
+    def populate(self):
+        conn = Connector.DBConnector(pooled=True)
+        try:
+            conn.execute("SELECT setseed({})".format((self.seed % 10 ** 6) / 10 ** 6))
+            conn.execute("INSERT INTO Query SELECT g, 'purpose' || {}, {} - 1 FROM generate_series(1, {}) g"
+                         .format(_skewed(PURPOSES), _skewed(MAX_SIZE + 1), self.queries))
+            conn.execute("INSERT INTO Disk SELECT g, CASE WHEN random() < 0.7 THEN 'DELL' ELSE 'HP' END, {}, "
+                         "{} - 1, {} FROM generate_series(1, {}) g"
+                         .format(_skewed(10), _skewed(MAX_FREE_SPACE + 1), _skewed(100), self.disks))
+            conn.execute("INSERT INTO Ram SELECT g, CASE WHEN random() < 0.7 THEN 'DELL' ELSE 'HP' END, {} "
+                         "FROM generate_series(1, {}) g".format(_skewed(64), self.rams))
+            # one RAM on most disks, a few disks share theirs with a neighbour
+            conn.execute("INSERT INTO DiskandRam SELECT g, g FROM generate_series(1, {}) g WHERE random() < 0.9"
+                         .format(self.disks))
+            conn.execute("INSERT INTO DiskandRam SELECT g, g + 1 FROM generate_series(1, {}) g "
+                         "WHERE random() < 0.1".format(self.disks - 1))
+            conn.execute("INSERT INTO DiskandQuery SELECT {}, queryID, purpose, size FROM Query "
+                         "WHERE random() < {}".format(_skewed(self.disks), PLACED))
+            conn.execute("INSERT INTO DiskandQuery SELECT {}, queryID, queryPurpose, querySize FROM DiskandQuery "
+                         "WHERE random() < {} ON CONFLICT DO NOTHING".format(_skewed(self.disks), SHARED))
+            conn.commit()
+            conn.execute("ANALYZE")
+            conn.commit()
+        finally:
+            conn.close()
+
+
+def run(scales):
+    for scale in scales:
+        workload = Workload(scale)
+        Solution.dropTables()
+        Solution.createTables()
+        start = time.perf_counter()
+        workload.populate()
+        elapsed = time.perf_counter() - start
+        conn = Connector.DBConnector(pooled=True)
+        try:
+            _, res = conn.execute("SELECT (SELECT COUNT(*) FROM Query) AS queries, "
+                                  "(SELECT COUNT(*) FROM Disk) AS disks, "
+                                  "(SELECT COUNT(*) FROM DiskandQuery) AS placements, "
+                                  "(SELECT COUNT(DISTINCT purpose) FROM Query) AS purposes, "
+                                  "(SELECT percentile_disc(ARRAY[0.5, 0.99]) WITHIN GROUP (ORDER BY size) "
+                                  "FROM Query) AS sizes, "
+                                  "(SELECT MAX(query_count) FROM DiskStats) AS busiest")
+            conn.commit()
+        finally:
+            conn.close()
+        row = res[0]
+        print("scale %d: %d queries, %d disks, %d placements, %d purposes, size p50/p99 %s, busiest disk %d "
+              "queries, loaded in %.1f s" % (scale, row['queries'], row['disks'], row['placements'],
+                                             row['purposes'], row['sizes'], row['busiest'], elapsed))
+    Solution.dropTables()
+
+
+if __name__ == '__main__':
+    run([int(arg) for arg in sys.argv[1:]] or [1000, 100000])
@@ -0,0 +1,62 @@
+import unittest
+import Solution
+from Utility.ReturnValue import ReturnValue
+from Tests.abstractTest import AbstractTest
+from Business.Query import Query
+from Business.RAM import RAM
+from Business.Disk import Disk
+
+
+class Test(AbstractTest):
+    # the profile cache is not used inside a session
+    rollback = False
+
+    def setUp(self) -> None:
+        super().setUp()
+        Solution.enableProfileCache(maxSize=2, ttl=60)
+
+    def tearDown(self) -> None:
+        Solution.disableProfileCache()
+        super().tearDown()
+
+    def test_hits_and_evictions(self) -> None:
+        self.assertEqual(ReturnValue.OK, Solution.addDisk(Disk(1, "DELL", 10, 10, 10)), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.addDisk(Disk(2, "DELL", 10, 10, 10)), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.addDisk(Disk(3, "DELL", 10, 10, 10)), "Should work")
+        for diskID in (1, 1, 2, 3, 1):
+            self.assertEqual(diskID, Solution.getDiskProfile(diskID).getDiskID(), "Should work")
+        stats = Solution.profileCacheStats()['disk']
+        self.assertEqual(1, stats['hits'], "Second read of disk 1")
+        self.assertEqual(4, stats['misses'], "Disk 1 was evicted by disks 2 and 3")
+        self.assertEqual(2, stats['evictions'], "Only 2 disks fit")
+        self.assertEqual([1, 3], [disk.getDiskID() for disk in Solution.getDiskProfiles([1, 3])], "Should work")
+        self.assertEqual(3, Solution.profileCacheStats()['disk']['hits'], "Both disks were cached")
+
+    def test_invalidation(self) -> None:
+        self.assertEqual(ReturnValue.OK, Solution.addDiskAndQuery(Disk(1, "DELL", 10, 10, 10),
+                                                                  Query(1, "stuff", 3)), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.addRAM(RAM(1, "DELL", 10)), "Should work")
+        self.assertEqual(10, Solution.getDiskProfile(1).getFreeSpace(), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.addQueryToDisk(Query(1, "stuff", 3), 1), "Should work")
+        self.assertEqual(7, Solution.getDiskProfile(1).getFreeSpace(), "addQueryToDisk invalidates the disk")
+        self.assertEqual(ReturnValue.OK, Solution.deleteQuery(Query(1, "stuff", 3)), "Should work")
+        self.assertEqual(10, Solution.getDiskProfile(1).getFreeSpace(), "deleteQuery invalidates its disks")
+        self.assertEqual(None, Solution.getQueryProfile(1).getQueryID(), "deleteQuery invalidates the query")
+        self.assertEqual(1, Solution.getRAMProfile(1).getRamID(), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.deleteRAM(1), "Should work")
+        self.assertEqual(None, Solution.getRAMProfile(1).getRamID(), "deleteRAM invalidates the RAM")
+        self.assertEqual(ReturnValue.OK, Solution.deleteDisk(1), "Should work")
+        self.assertEqual(None, Solution.getDiskProfile(1).getDiskID(), "deleteDisk invalidates the disk")
+
+    def test_ttl(self) -> None:
+        Solution.enableProfileCache(maxSize=2, ttl=0)
+        self.assertEqual(ReturnValue.OK, Solution.addQuery(Query(1, "stuff", 3)), "Should work")
+        query = Solution.getQueryProfile(1)
+        query.setSize(5)
+        self.assertEqual(3, Solution.getQueryProfile(1).getSize(), "Cached profiles are copied")
+        self.assertEqual(1, Solution.profileCacheStats()['query']['expirations'], "Entry expired immediately")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,90 @@
+import unittest
+import random
+import Solution
+import Utility.DBConnector as Connector
+from Utility.ReturnValue import ReturnValue
+from Tests.abstractTest import AbstractTest
+from Business.Query import Query
+from Business.Disk import Disk
+
+
+class Test(AbstractTest):
+    # queryID -> getCloseQueries computed by the original DiskandQuery self-join
+    @staticmethod
+    def selfJoin(queryIDs) -> dict:
+        close = {}
+        conn = Connector.DBConnector(pooled=True)
+        try:
+            for queryID in queryIDs:
+                _, res = conn.execute("SELECT D.queryid FROM (SELECT count(a.queryid),b.queryid "
+                                      "FROM diskandquery AS a INNER JOIN diskandquery AS b "
+                                      "ON a.diskid=b.diskid and a.queryid<>b.queryid "
+                                      "WHERE a.queryid={0} GROUP BY b.queryid) AS D "
+                                      "WHERE D.count>=(SELECT COUNT(diskid) FROM diskandquery "
+                                      "WHERE diskandquery.queryid={0})/(2*1.0) "
+                                      "UNION SELECT queryID FROM Query WHERE queryID<>{0} and NOT EXISTS"
+                                      "(SELECT queryID FROM DiskandQuery WHERE queryID={0}) "
+                                      "ORDER BY queryid ASC LIMIT 10".format(queryID))
+                close[queryID] = res.column('queryid')
+            conn.commit()
+        finally:
+            conn.close()
+        return close
+
+    def assertSameAsSelfJoin(self, queryIDs) -> None:
+        for queryID, close in self.selfJoin(queryIDs).items():
+            self.assertEqual(close, Solution.getCloseQueries(queryID), "Same as the self-join for %d" % queryID)
+
+    def test_getCloseQueries(self) -> None:
+        rng = random.Random(236363)
+        for diskID in range(1, 7):
+            self.assertEqual(ReturnValue.OK, Solution.addDisk(Disk(diskID, "DELL", 10, 1000, 10)), "Should work")
+        queries = [Query(queryID, "stuff", 1) for queryID in range(1, 16)]
+        for query in queries:
+            self.assertEqual(ReturnValue.OK, Solution.addQuery(query), "Should work")
+        self.assertEqual([2, 3, 4, 5, 6, 7, 8, 9, 10, 11], Solution.getCloseQueries(1), "No disks, all are close")
+        for _ in range(120):
+            query, diskID = rng.choice(queries), rng.randint(1, 6)
+            if rng.random() < 0.7:
+                Solution.addQueryToDisk(query, diskID)
+            else:
+                Solution.removeQueryFromDisk(query, diskID)
+        # several rows on the same disk in one statement
+        conn = Connector.DBConnector(pooled=True)
+        try:
+            conn.execute("INSERT INTO Disk VALUES(7, 'DELL', 10, 1000, 10);"
+                         "INSERT INTO DiskandQuery SELECT 7, g, 'stuff', 1 FROM generate_series(1, 15, 2) g;"
+                         "INSERT INTO DiskandQuery SELECT d, 16 - d, 'stuff', 1 FROM generate_series(1, 7) d "
+                         "ON CONFLICT DO NOTHING;"
+                         "DELETE FROM DiskandQuery WHERE diskID=7 AND queryID > 8")
+            conn.commit()
+        finally:
+            conn.close()
+        self.assertSameAsSelfJoin(range(1, 17))
+        # deleting disks and queries cascades to DiskandQuery
+        for diskID in (7, 3):
+            self.assertEqual(ReturnValue.OK, Solution.deleteDisk(diskID), "Should work")
+        for query in queries[::3]:
+            self.assertEqual(ReturnValue.OK, Solution.deleteQuery(query), "Should work")
+        self.assertSameAsSelfJoin(range(1, 17))
+        self.assertEqual([2, 3, 5, 6, 8, 9, 11, 12, 14, 15], Solution.getCloseQueries(1),
+                         "A deleted query is on no disk, every remaining query is close")
+
+    def test_getCloseQueriesBatch(self) -> None:
+        for diskID in range(1, 4):
+            self.assertEqual(ReturnValue.OK, Solution.addDisk(Disk(diskID, "DELL", 10, 1000, 10)), "Should work")
+        for queryID in range(1, 13):
+            self.assertEqual(ReturnValue.OK, Solution.addQuery(Query(queryID, "stuff", 1)), "Should work")
+        for queryID, diskID in ((1, 1), (2, 1), (3, 1), (1, 2), (4, 2), (5, 3), (4, 3)):
+            self.assertEqual(ReturnValue.OK, Solution.addQueryToDisk(Query(queryID, "stuff", 1), diskID),
+                             "Should work")
+        close = self.selfJoin([1, 4, 99])
+        self.assertEqual([close[4], close[1], close[99], close[4]], Solution.getCloseQueriesBatch([4, 1, 99, 4]),
+                         "Same lists as getCloseQueries, in input order")
+        self.assertEqual([close[1]], Solution.getCloseQueriesBatch([1]), "Should work")
+        self.assertEqual([], Solution.getCloseQueriesBatch([]), "Nothing to get")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
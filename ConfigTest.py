@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+import Utility.DBConnector as Connector
+from Utility.Exceptions import DatabaseException
+from Tests.abstractTest import AbstractTest
+
+
+class Test(AbstractTest):
+    # reloadConfig closes the pool the session of a test runs on
+    rollback = False
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.environment = os.environ.pop(Connector.CONFIG_ENV_VAR, None)
+
+    def tearDown(self) -> None:
+        os.environ.pop(Connector.CONFIG_ENV_VAR, None)
+        if self.environment is not None:
+            os.environ[Connector.CONFIG_ENV_VAR] = self.environment
+        Connector.reloadConfig()
+        self.directory.cleanup()
+        super().tearDown()
+
+    # path of a database.ini with database=name in [postgresql]
+    def ini(self, file: str, name: str, section='postgresql') -> str:
+        path = os.path.join(self.directory.name, file)
+        with open(path, 'w') as ini:
+            ini.write("[%s]\nhost=localhost\ndatabase=%s\n" % (section, name))
+        return path
+
+    def test_explicit_path(self) -> None:
+        path = self.ini("explicit.ini", "explicit")
+        os.environ[Connector.CONFIG_ENV_VAR] = self.ini("environment.ini", "environment")
+        self.assertEqual("explicit", Connector.loadConfig(path)['database'], "An explicit path comes first")
+        self.assertEqual(path, Connector.configPath(), "Should work")
+        self.assertEqual("explicit", Connector.loadConfig()['database'], "And is used by later calls")
+        self.assertEqual("environment", Connector.reloadConfig()['database'], "reloadConfig() forgets it")
+
+    def test_environment(self) -> None:
+        default = Connector.reloadConfig()['database']
+        path = self.ini("environment.ini", "environment")
+        os.environ[Connector.CONFIG_ENV_VAR] = path
+        self.assertEqual(default, Connector.loadConfig()['database'], "The configuration is cached")
+        self.assertEqual("environment", Connector.reloadConfig()['database'], "$DATABASE_INI comes before Utility/")
+        self.assertEqual(path, Connector.configPath(), "Should work")
+        del os.environ[Connector.CONFIG_ENV_VAR]
+        self.assertEqual(default, Connector.reloadConfig()['database'], "Back to Utility/database.ini")
+
+    def test_missing(self) -> None:
+        with self.assertRaises(DatabaseException.database_ini_ERROR):
+            Connector.loadConfig(os.path.join(self.directory.name, "missing.ini"))
+        with self.assertRaises(DatabaseException.database_ini_ERROR):
+            Connector.loadConfig(self.ini("sqlite.ini", "other", section='sqlite'))
+        self.assertEqual("other", Connector.loadConfig(section='sqlite')['database'], "Sections are separate")
+        os.environ[Connector.CONFIG_ENV_VAR] = os.path.join(self.directory.name, "missing.ini")
+        with self.assertRaises(DatabaseException.database_ini_ERROR):
+            Connector.reloadConfig()
+
+    def test_reload(self) -> None:
+        path = self.ini("reload.ini", "before")
+        self.assertEqual("before", Connector.loadConfig(path)['database'], "Should work")
+        self.ini("reload.ini", "after")
+        self.assertEqual("before", Connector.loadConfig()['database'], "Parsed once")
+        self.assertEqual("after", Connector.reloadConfig(path)['database'], "Parsed again")
+        config = Connector.loadConfig()
+        config['database'] = "changed"
+        self.assertEqual("after", Connector.loadConfig()['database'], "Callers get a copy")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,149 @@
+import unittest
+import random
+from decimal import Decimal
+import Solution
+import SimpleTest
+import NotSoSimpleTest
+import PreparedTest
+from Utility.MemoryBackend import MemoryBackend
+from Tests.abstractTest import AbstractTest
+from Business.Query import Query
+from Business.RAM import RAM
+from Business.Disk import Disk
+
+
+# runs the tests of a suite on a fresh MemoryBackend
+class OnMemory:
+    rollback = False
+
+    def setUp(self) -> None:
+        Solution.setBackend(MemoryBackend())
+        super().setUp()
+
+    def tearDown(self) -> None:
+        super().tearDown()
+        Solution.setBackend(None)
+
+
+class Simple(OnMemory, SimpleTest.Test):
+    pass
+
+
+class NotSoSimple(OnMemory, NotSoSimpleTest.Test):
+    pass
+
+
+class OutOfRange(OnMemory, PreparedTest.OutOfRange):
+    pass
+
+
+# comparable form of a result
+def plain(result):
+    if isinstance(result, Query):
+        return 'query', result.getQueryID(), result.getPurpose(), result.getSize()
+    if isinstance(result, Disk):
+        return 'disk', result.getDiskID(), result.getCompany(), result.getSpeed(), result.getFreeSpace(), \
+            result.getCost()
+    if isinstance(result, RAM):
+        return 'ram', result.getRamID(), result.getCompany(), result.getSize()
+    if isinstance(result, (list, tuple)):
+        return [plain(item) for item in result]
+    if isinstance(result, dict):
+        return {key: plain(value) for key, value in result.items()}
+    if isinstance(result, (int, float, Decimal)) and not isinstance(result, bool):
+        return round(float(result), 9)
+    return result
+
+
+# count random (name, args) calls of the Solution.py API over a few IDs, with NULL, negative and out of
+# range values mixed in
+def randomCalls(rng: random.Random, count: int):
+    def id():
+        return rng.choice([1, 2, 3, 4, 5, 6, 7, 8, 1, 2, 3, 0, -1, None, 2 ** 31])
+
+    def size():
+        return rng.choice([0, 1, 2, 3, 5, 8, 13, 21, 34, -1, None])
+
+    def purpose():
+        return rng.choice(["stuff", "other", "more", None])
+
+    def company():
+        return rng.choice(["DELL", "HP", None])
+
+    def query():
+        return Query(id(), purpose(), size())
+
+    def disk():
+        return Disk(id(), company(), rng.choice([1, 5, 9, 0]), rng.choice([0, 10, 30, 60, 100, -5]),
+                    rng.choice([1, 2, 7, 0]))
+
+    def ram():
+        return RAM(id(), company(), rng.choice([1, 5, 20, 50, 0]))
+
+    operations = [
+        (4, "addQuery", lambda: (query(),)),
+        (1, "addQueries", lambda: ([query() for _ in range(3)],)),
+        (1, "getQueryProfile", lambda: (id(),)),
+        (1, "getQueryProfiles", lambda: ([id(), id()],)),
+        (1, "deleteQuery", lambda: (query(),)),
+        (3, "addDisk", lambda: (disk(),)),
+        (1, "addDisks", lambda: ([disk() for _ in range(3)],)),
+        (1, "getDiskProfile", lambda: (id(),)),
+        (1, "getDiskProfiles", lambda: ([id(), id()],)),
+        (1, "deleteDisk", lambda: (id(),)),
+        (2, "addRAM", lambda: (ram(),)),
+        (1, "addRAMs", lambda: ([ram() for _ in range(2)],)),
+        (1, "getRAMProfile", lambda: (id(),)),
+        (1, "getRAMProfiles", lambda: ([id(), id()],)),
+        (1, "deleteRAM", lambda: (id(),)),
+        (1, "addDiskAndQuery", lambda: (disk(), query())),
+        (8, "addQueryToDisk", lambda: (query(), id())),
+        (3, "removeQueryFromDisk", lambda: (query(), id())),
+        (1, "placeQueries", lambda: (rng.choice([None, [id(), id(), id()]]), rng.random() < 0.5)),
+        (4, "addRAMToDisk", lambda: (id(), id())),
+        (1, "removeRAMFromDisk", lambda: (id(), id())),
+        (1, "averageSizeQueriesOnDisk", lambda: (id(),)),
+        (1, "diskTotalRAM", lambda: (id(),)),
+        (1, "getCostForPurpose", lambda: (purpose(),)),
+        (1, "checkPurposeCosts", lambda: ()),
+        (1, "getQueriesCanBeAddedToDisk", lambda: (id(),)),
+        (1, "getQueriesCanBeAddedToDisks", lambda: ([id(), id(), id()], rng.choice([1, 5, 10]))),
+        (1, "getQueriesCanBeAddedToDiskAndRAM", lambda: (id(),)),
+        (1, "isCompanyExclusive", lambda: (id(),)),
+        (1, "getConflictingDisks", lambda: ()),
+        (1, "mostAvailableDisks", lambda: ()),
+        (1, "getCloseQueries", lambda: (id(),)),
+        (1, "getCloseQueriesBatch", lambda: ([id(), id()],)),
+    ]
+    weighted = [(name, arguments) for weight, name, arguments in operations for _ in range(weight)]
+    for _ in range(count):
+        name, arguments = rng.choice(weighted)
+        yield name, arguments()
+
+
+# calls that fail without tables
+DROPPED_CALLS = (("addQuery", (Query(1, "stuff", 1),)), ("getDiskProfile", (1,)), ("diskTotalRAM", (1,)),
+                 ("placeQueries", ()), ("getCloseQueriesBatch", ([1, 2],)), ("addRAMs", ([RAM(1, "HP", 1)],)))
+
+
+class Test(AbstractTest):
+    def test_same_as_postgres(self) -> None:
+        memory = MemoryBackend()
+        memory.createTables()
+        for step, (name, args) in enumerate(randomCalls(random.Random(236363), 3000)):
+            expected = getattr(Solution, name)(*args)
+            self.assertEqual(plain(expected), plain(getattr(memory, name)(*args)),
+                             "Step %d, %s%s should be the same as on PostgreSQL" % (step, name, plain(args)))
+            if step == 1500:
+                Solution.clearTables()
+                memory.clearTables()
+        Solution.dropTables()
+        memory.dropTables()
+        for name, args in DROPPED_CALLS:
+            self.assertEqual(plain(getattr(Solution, name)(*args)), plain(getattr(memory, name)(*args)),
+                             "Without tables, " + name + " should fail the same way")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,65 @@
+import unittest
+import random
+import Solution
+import Utility.Placement as Placement
+from Utility.ReturnValue import ReturnValue
+from Tests.abstractTest import AbstractTest
+from Business.Query import Query
+from Business.RAM import RAM
+from Business.Disk import Disk
+
+
+class Test(AbstractTest):
+    def test_assign(self) -> None:
+        rng = random.Random(236363)
+        for _ in range(50):
+            queries = [(queryID, rng.randint(0, 30)) for queryID in range(1, rng.randint(1, 40))]
+            disks = [(diskID, rng.randint(0, 60), rng.choice([0, 5, 20, 40])) for diskID in range(1, rng.randint(1, 9))]
+            # first fit decreasing, one disk at a time
+            expected = {}
+            free = {diskID: free_space for diskID, free_space, _ in disks}
+            for queryID, size in sorted(queries, key=lambda query: (-query[1], query[0])):
+                for diskID, _, ram in disks:
+                    if ram > 0 and size <= ram and size <= free[diskID]:
+                        free[diskID] -= size
+                        expected[queryID] = diskID
+                        break
+            self.assertEqual(expected, Placement.assign(queries, disks), "Same as trying every disk")
+        self.assertEqual({}, Placement.assign([(1, 1)], []), "No disks")
+
+    def test_placeQueries(self) -> None:
+        for diskID, free_space, cost in ((1, 10, 5), (2, 10, 1), (3, 100, 9)):
+            self.assertEqual(ReturnValue.OK, Solution.addDisk(Disk(diskID, "DELL", 10, free_space, cost)),
+                             "Should work")
+        for ramID, size, diskID in ((1, 8, 1), (2, 8, 2), (3, 2, 3)):
+            self.assertEqual(ReturnValue.OK, Solution.addRAM(RAM(ramID, "DELL", size)), "Should work")
+            self.assertEqual(ReturnValue.OK, Solution.addRAMToDisk(ramID, diskID), "Should work")
+        for queryID, size in ((1, 6), (2, 5), (3, 4), (4, 2), (5, 9), (6, 1)):
+            self.assertEqual(ReturnValue.OK, Solution.addQuery(Query(queryID, "stuff", size)), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.addQueryToDisk(Query(6, "stuff", 1), 3), "Should work")
+        self.assertEqual((ReturnValue.OK, {1: 1, 2: 2, 3: 1, 4: 2}), Solution.placeQueries([1, 2, 3, 4, 5, 6, 7]),
+                         "Query 5 needs more RAM than any disk has, query 6 is placed already")
+        self.assertEqual([0, 3, 99], [Solution.getDiskProfile(diskID).getFreeSpace() for diskID in (1, 2, 3)],
+                         "Free space is taken")
+        self.assertEqual(5, Solution.averageSizeQueriesOnDisk(1), "Should work")
+        self.assertEqual(6 * 5 + 4 * 5 + 5 * 1 + 2 * 1 + 1 * 9, Solution.getCostForPurpose("stuff"), "Should work")
+        self.assertEqual((ReturnValue.OK, {}), Solution.placeQueries(), "Nothing left that fits")
+        self.assertEqual((ReturnValue.OK, {}), Solution.placeQueries([]), "Nothing to place")
+
+    def test_placeQueries_minimizeCost(self) -> None:
+        for diskID, cost in ((1, 5), (2, 1), (3, 3)):
+            self.assertEqual(ReturnValue.OK, Solution.addDisk(Disk(diskID, "DELL", 10, 10, cost)), "Should work")
+            self.assertEqual(ReturnValue.OK, Solution.addRAM(RAM(diskID, "DELL", 10)), "Should work")
+            self.assertEqual(ReturnValue.OK, Solution.addRAMToDisk(diskID, diskID), "Should work")
+        self.assertEqual([ReturnValue.OK] * 4, Solution.addQueries([Query(queryID, "stuff", 6)
+                                                                    for queryID in range(1, 5)]), "Should work")
+        self.assertEqual((ReturnValue.OK, {1: 2, 2: 3, 3: 1}), Solution.placeQueries(minimizeCost=True),
+                         "Cheapest disk first")
+        self.assertEqual((ReturnValue.OK, {}), Solution.placeQueries([4]), "4 free on every disk")
+        Solution.dropTables()
+        self.assertEqual((ReturnValue.ERROR, {}), Solution.placeQueries(), "Should error")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
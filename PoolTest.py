@@ -0,0 +1,91 @@
+import unittest
+import threading
+import time
+import psycopg2
+import Utility.DBConnector as Connector
+from Utility.DBConnector import ConnectionPool
+from Utility.Exceptions import DatabaseException
+from Tests.abstractTest import AbstractTest
+
+
+class Test(AbstractTest):
+    def setUp(self) -> None:
+        super().setUp()
+        self.pools = []
+
+    def tearDown(self) -> None:
+        for pool in self.pools:
+            pool.close()
+        super().tearDown()
+
+    def pool(self, **settings) -> ConnectionPool:
+        self.pools.append(ConnectionPool(Connector.DBConnector.connect, **settings))
+        return self.pools[-1]
+
+    def test_max_size(self) -> None:
+        pool = self.pool(max_size=2, timeout=0.2)
+        first, second = pool.checkout(), pool.checkout()
+        self.assertEqual(2, pool.size(), "Should work")
+        start = time.monotonic()
+        with self.assertRaises(DatabaseException.ConnectionInvalid):
+            pool.checkout()
+        self.assertGreaterEqual(time.monotonic() - start, 0.2, "Waited for the timeout")
+        self.assertEqual(2, pool.size(), "No connection over max_size")
+        threading.Timer(0.05, pool.checkin, (first,)).start()
+        self.assertIs(first.connection, pool.checkout().connection, "Waits for a returned connection")
+        pool.checkin(second)
+        self.assertEqual(1, pool.idle(), "Should work")
+
+    def test_dead_connection_is_replaced(self) -> None:
+        pool = self.pool(max_size=1, health_check_interval=0)
+        entry = pool.checkout()
+        pid = entry.connection.get_backend_pid()
+        pool.checkin(entry)
+        killer = Connector.DBConnector.connect()
+        try:
+            with killer.cursor() as cursor:
+                cursor.execute("SELECT pg_terminate_backend(%s)", (pid,))
+            killer.commit()
+        finally:
+            killer.close()
+        time.sleep(0.1)
+        replacement = pool.checkout()
+        self.assertNotEqual(pid, replacement.connection.get_backend_pid(), "A new connection")
+        self.assertNotEqual(0, entry.connection.closed, "The dead one is closed")
+        self.assertEqual(1, pool.size(), "Should work")
+        pool.checkin(replacement)
+
+    def test_max_idle(self) -> None:
+        pool = self.pool(max_idle=0.05)
+        entry = pool.checkout()
+        pool.checkin(entry)
+        time.sleep(0.1)
+        fresh = pool.checkout()
+        self.assertIsNot(entry.connection, fresh.connection, "The idle connection was evicted")
+        self.assertNotEqual(0, entry.connection.closed, "And closed")
+        self.assertEqual(1, pool.size(), "Should work")
+        pool.checkin(fresh)
+
+    # a query string ending with COMMIT leaves psycopg2 believing a transaction is open, the next user
+    # of the connection would then run without a transaction
+    def test_checkin_resets_transaction(self) -> None:
+        pool = self.pool(max_size=1)
+        entry = pool.checkout()
+        with entry.connection.cursor() as cursor:
+            cursor.execute("SELECT 1; COMMIT")
+        pool.checkin(entry)
+        entry = pool.checkout()
+        self.assertEqual(psycopg2.extensions.STATUS_READY, entry.connection.status, "Reset on checkin")
+        with entry.connection.cursor() as cursor:
+            cursor.execute("CREATE TABLE PoolTest_rollback(x INTEGER)")
+        entry.connection.rollback()
+        with entry.connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass('PoolTest_rollback')")
+            self.assertEqual(None, cursor.fetchone()[0], "The next user runs in a transaction")
+        entry.connection.rollback()
+        pool.checkin(entry)
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
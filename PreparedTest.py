@@ -0,0 +1,92 @@
+import unittest
+import Solution
+import Utility.DBConnector as Connector
+from Utility.ReturnValue import ReturnValue
+from Utility.Exceptions import DatabaseException
+from Tests.abstractTest import AbstractTest
+from Business.Query import Query
+from Business.Disk import Disk
+
+
+class Test(AbstractTest):
+    # the statements are checked on the pooled connections, not in a rolled-back session
+    rollback = False
+
+    # the backend pid and the SQL text and prepare time of the statement name on a pooled connection,
+    # after running name
+    @staticmethod
+    def executePrepared(name: str, params=()):
+        conn = Connector.DBConnector(pooled=True)
+        try:
+            _, res = conn.execute_prepared(name, params)
+            _, prepared = conn.execute("SELECT pg_backend_pid() AS pid, statement, prepare_time "
+                                       "FROM pg_prepared_statements WHERE name='{}'".format(name.lower()))
+            conn.commit()
+        finally:
+            conn.close()
+        return res, prepared
+
+    def test_prepared_once(self) -> None:
+        Connector.prepare("preparedTestOnce", "SELECT $1::INTEGER + 1 AS x")
+        res, first = self.executePrepared("preparedTestOnce", (1,))
+        self.assertEqual(2, res[0]['x'], "Should work")
+        self.assertEqual(1, first.size(), "PREPAREd on first use")
+        res, second = self.executePrepared("preparedTestOnce", (2,))
+        self.assertEqual(3, res[0]['x'], "Should work")
+        self.assertEqual(first[0]['pid'], second[0]['pid'], "The same pooled connection")
+        self.assertEqual(first[0]['prepare_time'], second[0]['prepare_time'], "Not PREPAREd again")
+
+    def test_changed_text(self) -> None:
+        Connector.prepare("preparedTestChanged", "SELECT 1 AS x")
+        res, first = self.executePrepared("preparedTestChanged")
+        self.assertEqual(1, res[0]['x'], "Should work")
+        Connector.prepare("preparedTestChanged", "SELECT 2 AS x")
+        self.assertEqual("SELECT 2 AS x", Connector.statement("preparedTestChanged"), "Should work")
+        res, second = self.executePrepared("preparedTestChanged")
+        self.assertEqual(2, res[0]['x'], "The new text runs")
+        self.assertEqual(first[0]['pid'], second[0]['pid'], "The same pooled connection")
+        self.assertEqual(1, second.size(), "The old statement was DEALLOCATEd")
+        self.assertIn("SELECT 2 AS x", second[0]['statement'], "and PREPAREd again")
+
+    def test_unknown(self) -> None:
+        self.assertIsNone(Connector.statement("preparedTestUnknown"), "Should work")
+        conn = Connector.DBConnector(pooled=True)
+        try:
+            with self.assertRaises(DatabaseException.UNKNOWN_ERROR):
+                conn.execute_prepared("preparedTestUnknown")
+        finally:
+            conn.close()
+        with self.assertRaises(ValueError):
+            Connector.prepare("drop table", "SELECT 1")
+
+
+# an ID outside the INTEGER range matches no row, as it did with the literal SQL of Solution.py
+class OutOfRange(AbstractTest):
+    def test_out_of_range_id(self) -> None:
+        big = 2 ** 31
+        self.assertEqual(ReturnValue.OK, Solution.addQuery(Query(1, "stuff", 1)), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.addDisk(Disk(1, "DELL", 1, 10, 1)), "Should work")
+        self.assertEqual(ReturnValue.NOT_EXISTS, Solution.deleteDisk(big), "Should work")
+        self.assertEqual(ReturnValue.NOT_EXISTS, Solution.deleteRAM(big), "Should work")
+        self.assertEqual(ReturnValue.NOT_EXISTS, Solution.removeRAMFromDisk(1, big), "Should work")
+        self.assertEqual(ReturnValue.NOT_EXISTS, Solution.removeRAMFromDisk(big, 1), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.deleteQuery(Query(big, "stuff", 1)), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.removeQueryFromDisk(Query(big, "stuff", 1), 1), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.removeQueryFromDisk(Query(1, "stuff", 1), big), "Should work")
+        self.assertEqual(0, Solution.diskTotalRAM(big), "Should work")
+        self.assertEqual(0, Solution.averageSizeQueriesOnDisk(big), "Should work")
+        self.assertEqual([1], Solution.getCloseQueries(big), "Should work")
+        self.assertEqual([[1], []], Solution.getCloseQueriesBatch([big, 1]), "Should work")
+        self.assertIsNone(Solution.getDiskProfile(big).getDiskID(), "Should work")
+        self.assertEqual([], Solution.getQueriesCanBeAddedToDisk(big), "Should work")
+        self.assertEqual([[], [1]], Solution.getQueriesCanBeAddedToDisks([big, 1]), "Should work")
+        self.assertFalse(Solution.isCompanyExclusive(big), "Should work")
+        # inserts still fail
+        self.assertEqual(ReturnValue.ERROR, Solution.addQuery(Query(big, "stuff", 1)), "Should work")
+        self.assertEqual(ReturnValue.ERROR, Solution.addQueryToDisk(Query(1, "stuff", 1), big), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.deleteDisk(1), "Should work")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
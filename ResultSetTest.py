@@ -0,0 +1,165 @@
+import unittest
+import Utility.DBConnector as Connector
+from Tests.abstractTest import AbstractTest
+
+try:
+    import numpy
+except ImportError:  # numpy is optional, see DBConnector.toNumpy
+    numpy = None
+
+# an INTEGER, a BIGINT, a DOUBLE PRECISION, a BOOLEAN and a TEXT column, without NULLs
+VALUES = ("SELECT * FROM (VALUES (1, 9007199254740993::BIGINT, 1.5::FLOAT8, TRUE, 'a'), "
+          "(2, -1::BIGINT, 2.5::FLOAT8, FALSE, 'b'), (3, 0::BIGINT, -0.5::FLOAT8, TRUE, 'c')) "
+          "AS V(i, b, f, t, s) ORDER BY i")
+# the same columns, with a NULL in every one but i
+NULLS = ("SELECT * FROM (VALUES (1, 7::BIGINT, 1.5::FLOAT8, TRUE, 'a'), (2, NULL, NULL, NULL, NULL), "
+         "(3, 0::BIGINT, -0.5::FLOAT8, FALSE, 'c')) AS V(i, b, f, t, s) ORDER BY i")
+
+
+class Test(AbstractTest):
+    # ResultSet of query
+    @staticmethod
+    def query(query: str):
+        conn = Connector.DBConnector(pooled=True)
+        try:
+            _, res = conn.execute(query)
+            conn.commit()
+        finally:
+            conn.close()
+        return res
+
+    def test_row(self) -> None:
+        res = self.query("SELECT 1 AS diskID, 'DELL' AS Company, NULL::INTEGER AS speed")
+        row = res[0]
+        self.assertEqual(1, row['diskID'], "Columns are looked up by name")
+        self.assertEqual(1, row['DISKID'], "In any case")
+        self.assertEqual('DELL', row['company'], "Names are folded to lower case")
+        self.assertEqual(None, row['speed'], "NULL is None")
+        self.assertEqual(None, row[0], "Only names are keys")
+        with self.assertRaises(KeyError):
+            row['cost']
+        self.assertTrue('Company' in row, "Should work")
+        self.assertFalse('cost' in row, "Should work")
+        self.assertFalse(0 in row, "Should work")
+        self.assertEqual(3, len(row), "Should work")
+        self.assertEqual(['diskid', 'company', 'speed'], list(row), "Keys in column order")
+        self.assertEqual([1, 'DELL', None], list(row.values()), "Values in column order")
+        self.assertEqual({'diskid': 1, 'company': 'DELL', 'speed': None}, dict(row), "Should work")
+        self.assertEqual(1, row.get('DiskID'), "Mapping methods work")
+        self.assertEqual(7, row.get('cost', 7), "Mapping methods work")
+
+    def test_column(self) -> None:
+        res = self.query("SELECT g AS ID, g * 2 AS double FROM generate_series(3, 1, -1) g")
+        self.assertEqual([3, 2, 1], res.column('id'), "In row order")
+        self.assertEqual([6, 4, 2], res.column('DOUBLE'), "In any case")
+        self.assertEqual([3, 2, 1], [row['id'] for row in res], "Iteration is in row order")
+        with self.assertRaises(KeyError):
+            res.column('missing')
+        empty = self.query("SELECT 1 AS id WHERE FALSE")
+        self.assertTrue(empty.isEmpty(), "Should work")
+        self.assertEqual([], empty.column('id'), "An empty result has empty columns")
+        self.assertEqual([], list(empty), "Should work")
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_toNumpy(self) -> None:
+        columns = self.query(VALUES).toNumpy()
+        self.assertEqual(['i', 'b', 'f', 't', 's'], list(columns), "A column per field, in order")
+        self.assertEqual(['int32', 'int64', 'float64', 'bool', 'object'],
+                         [str(column.dtype) for column in columns.values()], "Dtypes follow the column types")
+        self.assertEqual([9007199254740993, -1, 0], columns['b'].tolist(), "Integers without NULLs are exact")
+        self.assertEqual([True, False, True], columns['t'].tolist(), "Should work")
+        self.assertEqual(['a', 'b', 'c'], columns['s'].tolist(), "Should work")
+        self.assertEqual([1.5, 2.5, -0.5], columns['f'].tolist(), "Should work")
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_toNumpy_nulls(self) -> None:
+        columns = self.query(NULLS).toNumpy()
+        self.assertEqual('int32', str(columns['i'].dtype), "A column without NULLs keeps its dtype")
+        self.assertEqual('float64', str(columns['b'].dtype), "NULL integers become nan")
+        self.assertTrue(numpy.isnan(columns['b'][1]), "NULL integers become nan")
+        self.assertEqual([7.0, 0.0], columns['b'][[0, 2]].tolist(), "Should work")
+        self.assertTrue(numpy.isnan(columns['f'][1]), "Should work")
+        self.assertEqual('object', str(columns['t'].dtype), "NULL booleans are not False")
+        self.assertEqual([True, None, False], columns['t'].tolist(), "NULL booleans are not False")
+        self.assertEqual(['a', None, 'c'], columns['s'].tolist(), "Should work")
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_toStructuredArray(self) -> None:
+        array = self.query(VALUES).toStructuredArray()
+        self.assertEqual(('i', 'b', 'f', 't', 's'), array.dtype.names, "A field per column")
+        self.assertEqual((2, -1, 2.5, False, 'b'), array[1].tolist(), "Rows keep their values")
+        self.assertEqual(9007199254740993, int(array[0]['b']), "Should work")
+        nulls = self.query(NULLS).toStructuredArray()
+        self.assertEqual([True, None, False], nulls['t'].tolist(), "Should work")
+        self.assertEqual({}, self.query("SELECT 1 WHERE FALSE").toNumpy(), "No rows, no columns")
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_stream_toNumpy(self) -> None:
+        conn = Connector.DBConnector(pooled=True)
+        try:
+            columns = conn.execute_stream(NULLS, fetch_size=2).toNumpy()
+            conn.commit()
+        finally:
+            conn.close()
+        self.assertEqual([1, 2, 3], columns['i'].tolist(), "Batches are concatenated")
+        self.assertEqual('float64', str(columns['b'].dtype), "A batch with NULLs makes the column float64")
+        self.assertEqual([True, None, False], columns['t'].tolist(), "Should work")
+
+
+
+class Stream(AbstractTest):
+    # close() returns the connections to the pool, instead of leaving them in the session of the test
+    rollback = False
+
+    def test_stream(self) -> None:
+        conn = Connector.DBConnector(pooled=True)
+        try:
+            stream = conn.execute_stream("SELECT g AS ID FROM generate_series(1, 10) g ORDER BY g", fetch_size=3)
+            self.assertFalse(stream.isEmpty(), "Should work")
+            self.assertEqual(10, stream.size(), "Counted on the server")
+            self.assertEqual(list(range(1, 11)), [row['id'] for row in stream], "size() consumes no rows")
+            self.assertEqual([], list(stream), "Only one pass")
+            stream = conn.execute_stream("SELECT g AS id FROM generate_series(1, 10) g ORDER BY g", fetch_size=3)
+            rows = iter(stream)
+            self.assertEqual([1, 2, 3, 4], [next(rows)['ID'] for _ in range(4)], "Across two batches")
+            self.assertEqual(10, stream.size(), "The size of the whole result")
+            self.assertEqual([5, 6, 7, 8, 9, 10], [row['id'] for row in rows], "The rest of the rows")
+            stream = conn.execute_stream("SELECT g AS id FROM generate_series(1, 6) g ORDER BY g", fetch_size=3)
+            self.assertEqual(6, stream.size(), "A multiple of fetch_size")
+            self.assertEqual([1, 2, 3, 4, 5, 6], stream.column('id'), "Should work")
+            empty = conn.execute_stream("SELECT 1 AS id WHERE FALSE", fetch_size=3)
+            self.assertTrue(empty.isEmpty(), "Should work")
+            self.assertEqual(0, empty.size(), "Should work")
+            self.assertEqual([], empty.column('id'), "Should work")
+            conn.commit()
+        finally:
+            conn.close()
+
+    def test_stream_close(self) -> None:
+        conn = Connector.DBConnector(pooled=True)
+        try:
+            stream = conn.execute_stream("SELECT g AS id FROM generate_series(1, 10) g ORDER BY g", fetch_size=3)
+            rows = iter(stream)
+            self.assertEqual(1, next(rows)['id'], "Should work")
+            stream.close()
+            self.assertEqual([], list(rows), "The remaining rows are discarded")
+            self.assertEqual(2, conn.execute("SELECT 2 AS two")[1][0]['two'], "The connection goes on")
+            conn.commit()
+            stream = conn.execute_stream("SELECT g AS id FROM generate_series(1, 10) g ORDER BY g", fetch_size=3)
+        finally:
+            conn.close()
+        self.assertEqual([], list(stream), "Closed with its connection")
+        stream.close()
+        conn = Connector.DBConnector(pooled=True)
+        try:
+            self.assertEqual([1, 2], conn.execute_stream("SELECT g AS id FROM generate_series(1, 2) g "
+                                                         "ORDER BY g").column('id'),
+                             "The pooled connection is reused")
+            conn.commit()
+        finally:
+            conn.close()
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,85 @@
+import os
+import random
+import tempfile
+import unittest
+import Solution
+import SimpleTest
+import NotSoSimpleTest
+import BatchTest
+import PlacementTest
+import PreparedTest
+import Utility.DBConnector as Connector
+import Utility.SQLiteConnector as SQLiteConnector
+from MemoryTest import plain, randomCalls, DROPPED_CALLS
+from Tests.abstractTest import AbstractTest
+
+
+# runs the tests of a suite on a fresh SQLite database file
+class OnSQLite:
+    rollback = False
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        SQLiteConnector.useSQLite(os.path.join(self.directory.name, "test.sqlite"))
+        super().setUp()
+
+    def tearDown(self) -> None:
+        super().tearDown()
+        Connector.setEngine(None)
+        self.directory.cleanup()
+
+
+class Simple(OnSQLite, SimpleTest.Test):
+    pass
+
+
+class NotSoSimple(OnSQLite, NotSoSimpleTest.Test):
+    pass
+
+
+class Batch(OnSQLite, BatchTest.Test):
+    pass
+
+
+class Placement(OnSQLite, PlacementTest.Test):
+    pass
+
+
+class OutOfRange(OnSQLite, PreparedTest.OutOfRange):
+    pass
+
+
+class Test(AbstractTest):
+    # createTables runs on both engines
+    rollback = False
+
+    # Solution.py on SQLite, then on PostgreSQL
+    @staticmethod
+    def both(path: str, name: str, args):
+        SQLiteConnector.useSQLite(path)
+        try:
+            result = getattr(Solution, name)(*args)
+        finally:
+            Connector.setEngine(None)
+        return result, getattr(Solution, name)(*args)
+
+    def test_same_as_postgres(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "test.sqlite")
+            self.both(path, "createTables", ())
+            for step, (name, args) in enumerate(randomCalls(random.Random(236363), 3000)):
+                result, expected = self.both(path, name, args)
+                self.assertEqual(plain(expected), plain(result),
+                                 "Step %d, %s%s should be the same as on PostgreSQL" % (step, name, plain(args)))
+                if step == 1500:
+                    self.both(path, "clearTables", ())
+            self.both(path, "dropTables", ())
+            for name, args in DROPPED_CALLS:
+                result, expected = self.both(path, name, args)
+                self.assertEqual(plain(expected), plain(result),
+                                 "Without tables, " + name + " should fail the same way")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,48 @@
+import unittest
+import Solution
+import Utility.DBConnector as Connector
+from Utility.ReturnValue import ReturnValue
+from Tests.abstractTest import AbstractTest
+from Business.Disk import Disk
+
+
+class Test(AbstractTest):
+    # the test changes the schema, which closes the pool the session of the test would run on
+    rollback = False
+
+    def tearDown(self) -> None:
+        for name in ("schema_test_a", "schema_test_b"):
+            Connector.setSchema(name)
+            Solution.dropTables()
+        Connector.setSchema(None)
+        conn = Connector.DBConnector()
+        try:
+            conn.execute("DROP SCHEMA IF EXISTS schema_test_a, schema_test_b")
+            conn.commit()
+        finally:
+            conn.close()
+        super().tearDown()
+
+    def test_schemas_are_isolated(self) -> None:
+        Connector.setSchema("schema_test_a")
+        self.assertEqual("schema_test_a", Connector.schema(), "Should work")
+        Solution.createTables()
+        self.assertEqual(ReturnValue.OK, Solution.addDisk(Disk(1, "DELL", 10, 10, 10)), "Should work")
+        Connector.setSchema("schema_test_b")
+        Solution.createTables()
+        self.assertEqual(None, Solution.getDiskProfile(1).getDiskID(), "Schema b has its own Disk table")
+        self.assertEqual(ReturnValue.OK, Solution.addDisk(Disk(1, "HP", 10, 10, 10)), "Same diskID in schema b")
+        Connector.setSchema("schema_test_a")
+        self.assertEqual("DELL", Solution.getDiskProfile(1).getCompany(), "Schema a is unchanged")
+        Solution.clearTables()
+        Connector.setSchema("schema_test_b")
+        self.assertEqual("HP", Solution.getDiskProfile(1).getCompany(), "clearTables only clears schema a")
+
+    def test_invalid_name(self) -> None:
+        with self.assertRaises(ValueError):
+            Connector.setSchema("a; DROP TABLE Disk")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
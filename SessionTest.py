@@ -0,0 +1,136 @@
+import unittest
+import Solution
+import Utility.DBConnector as Connector
+from Utility.ReturnValue import ReturnValue
+from Utility.Exceptions import DatabaseException
+from Tests.abstractTest import AbstractTest
+from Business.Query import Query
+from Business.RAM import RAM
+from Business.Disk import Disk
+
+
+class Test(AbstractTest):
+    # the tests commit sessions of their own
+    rollback = False
+
+    # what another connection sees, i.e. what was committed
+    def committedDisks(self) -> list:
+        conn = Connector.DBConnector()
+        try:
+            _, res = conn.execute("SELECT diskID FROM Disk ORDER BY diskID")
+            conn.commit()
+        finally:
+            conn.close()
+        return res.column('diskid')
+
+    def test_commit_once(self) -> None:
+        with Connector.session():
+            self.assertEqual(ReturnValue.OK, Solution.addDisk(Disk(1, "DELL", 10, 10, 10)), "Should work")
+            self.assertEqual(ReturnValue.OK, Solution.addRAM(RAM(1, "DELL", 10)), "Should work")
+            self.assertEqual(ReturnValue.OK, Solution.addRAMToDisk(1, 1), "Should work")
+            self.assertEqual(ReturnValue.OK, Solution.addQuery(Query(1, "stuff", 3)), "Should work")
+            self.assertEqual(ReturnValue.OK, Solution.addQueryToDisk(Query(1, "stuff", 3), 1), "Should work")
+            self.assertEqual(7, Solution.getDiskProfile(1).getFreeSpace(), "The session sees its own changes")
+            self.assertEqual([], self.committedDisks(), "Nothing committed yet")
+        self.assertEqual([1], self.committedDisks(), "Committed at exit")
+        self.assertEqual(10, Solution.diskTotalRAM(1), "Should work")
+
+    def test_failed_call_is_isolated(self) -> None:
+        with Connector.session(savepoints=True):
+            self.assertEqual(ReturnValue.OK, Solution.addDisk(Disk(1, "DELL", 10, 10, 10)), "Should work")
+            self.assertEqual(ReturnValue.ALREADY_EXISTS, Solution.addDisk(Disk(1, "DELL", 10, 10, 10)),
+                             "Same mapping as outside a session")
+            self.assertEqual(ReturnValue.BAD_PARAMS, Solution.addDisk(Disk(2, "DELL", 0, 10, 10)), "Should work")
+            self.assertEqual(ReturnValue.OK, Solution.addQuery(Query(1, "stuff", 30)), "Should work")
+            self.assertEqual(ReturnValue.ERROR, Solution.addDiskAndQuery(Disk(3, "DELL", 10, 10, 10),
+                                                                              Query(2, "stuff", -1)),
+                             "Both statements are undone")
+            self.assertEqual(ReturnValue.BAD_PARAMS, Solution.addQueryToDisk(Query(1, "stuff", 30), 1),
+                             "Not enough free space")
+            self.assertEqual(ReturnValue.OK, Solution.addDisk(Disk(4, "DELL", 10, 10, 10)),
+                             "The session goes on after failures")
+            self.assertEqual([1, 4], [disk.getDiskID() for disk in Solution.getDiskProfiles([1, 3, 4])
+                                      if disk.getDiskID() is not None], "Should work")
+        self.assertEqual([1, 4], self.committedDisks(), "Failed calls left nothing behind")
+        self.assertEqual(0, Solution.averageSizeQueriesOnDisk(1), "Should work")
+
+    def test_rollback_on_exception(self) -> None:
+        Solution.enableProfileCache()
+        try:
+            self.assertEqual(ReturnValue.OK, Solution.addDisk(Disk(1, "DELL", 10, 10, 10)), "Should work")
+            self.assertEqual(10, Solution.getDiskProfile(1).getFreeSpace(), "Cached")
+            with self.assertRaises(KeyError):
+                with Connector.session():
+                    self.assertEqual(ReturnValue.OK, Solution.addQuery(Query(1, "stuff", 3)), "Should work")
+                    self.assertEqual(ReturnValue.OK, Solution.addQueryToDisk(Query(1, "stuff", 3), 1),
+                                     "Should work")
+                    with Connector.session():
+                        self.assertEqual(7, Solution.getDiskProfile(1).getFreeSpace(), "Nested session joins")
+                    raise KeyError("abort")
+            self.assertEqual(10, Solution.getDiskProfile(1).getFreeSpace(), "Everything was rolled back")
+            self.assertEqual(None, Solution.getQueryProfile(1).getQueryID(), "Everything was rolled back")
+            self.assertEqual(None, Connector.currentSession(), "Should work")
+        finally:
+            Solution.disableProfileCache()
+
+    def test_without_savepoints(self) -> None:
+        with Connector.session():
+            self.assertEqual(ReturnValue.OK, Solution.addDisk(Disk(1, "DELL", 10, 10, 10)), "Should work")
+            self.assertEqual(ReturnValue.OK, Solution.addDisk(Disk(2, "DELL", 10, 10, 10)), "Should work")
+        self.assertEqual([1, 2], self.committedDisks(), "Committed at exit")
+        with self.assertRaises(DatabaseException.ConnectionInvalid):
+            with Connector.session(savepoints=False):
+                self.assertEqual(ReturnValue.OK, Solution.addDisk(Disk(3, "DELL", 10, 10, 10)), "Should work")
+                self.assertEqual(ReturnValue.ALREADY_EXISTS, Solution.addDisk(Disk(1, "DELL", 10, 10, 10)),
+                                 "Same mapping as outside a session")
+                self.assertEqual(ReturnValue.ERROR, Solution.addDisk(Disk(4, "DELL", 10, 10, 10)),
+                                 "The session was rolled back")
+        self.assertEqual([1, 2], self.committedDisks(), "Nothing of the failed session is left")
+        self.assertEqual(ReturnValue.OK, Solution.addDisk(Disk(3, "DELL", 10, 10, 10)), "Should work")
+
+    # a DBConnector's savepoint covers its statements since its last commit()
+    def test_savepoint_per_commit(self) -> None:
+        with Connector.session(savepoints=True):
+            conn = Connector.DBConnector(pooled=True)
+            try:
+                conn.rollback()
+                conn.execute("INSERT INTO Disk VALUES(1, 'DELL', 10, 10, 10)")
+                conn.commit()
+                conn.execute("INSERT INTO Disk VALUES(2, 'DELL', 10, 10, 10)")
+            finally:
+                conn.close()
+            conn = Connector.DBConnector(pooled=True)
+            try:
+                conn.execute("INSERT INTO Disk VALUES(3, 'DELL', 10, 10, 10)")
+                conn.commit()
+                conn.execute("INSERT INTO Disk VALUES(4, 'DELL', 10, 10, 10)")
+                conn.rollback()
+                conn.execute("INSERT INTO Disk VALUES(5, 'DELL', 10, 10, 10)")
+                conn.commit()
+            finally:
+                conn.close()
+        self.assertEqual([1, 3, 5], self.committedDisks(), "Uncommitted statements are undone at close")
+
+    def test_call_after_rollback(self) -> None:
+        with self.assertRaises(DatabaseException.ConnectionInvalid):
+            with Connector.session(savepoints=False):
+                self.assertEqual(ReturnValue.OK, Solution.addDisk(Disk(1, "DELL", 10, 10, 10)), "Should work")
+                self.assertEqual(ReturnValue.NOT_EXISTS, Solution.addQueryToDisk(Query(1, "stuff", 1), 1),
+                                 "Query does not exist, the session is rolled back")
+                self.assertEqual(ReturnValue.ERROR, Solution.addDisk(Disk(2, "DELL", 10, 10, 10)),
+                                 "The session was rolled back")
+                self.assertEqual(None, Solution.getDiskProfile(1).getDiskID(), "The session was rolled back")
+                self.assertEqual(ReturnValue.ERROR, Solution.addQueryToDisk(Query(1, "stuff", 1), 1),
+                                 "The session was rolled back")
+        self.assertEqual([], self.committedDisks(), "Nothing of the failed session is left")
+        with Connector.session(savepoints=True):
+            self.assertEqual(ReturnValue.OK, Solution.addDisk(Disk(1, "DELL", 10, 10, 10)), "Should work")
+            self.assertEqual(ReturnValue.NOT_EXISTS, Solution.addQueryToDisk(Query(1, "stuff", 1), 1),
+                             "Only this call is rolled back")
+            self.assertEqual(ReturnValue.OK, Solution.addDisk(Disk(2, "DELL", 10, 10, 10)), "Should work")
+        self.assertEqual([1, 2], self.committedDisks(), "Committed at exit")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
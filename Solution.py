@@ -1,19 +1,338 @@
-from typing import List
+from typing import List, Dict, Tuple
+import functools
+from collections.abc import Hashable
 import Utility.DBConnector as Connector
+import Utility.Placement as Placement
 from Utility.ReturnValue import ReturnValue
 from Utility.Exceptions import DatabaseException
 from Business.Query import Query
 from Business.RAM import RAM
 from Business.Disk import Disk
-from psycopg2 import sql
+from Utility.Cache import LRUCache
 
 
+# server-side prepared statements, PREPAREd once per pooled connection and run with EXECUTE. IDs that are
+# looked up are BIGINT parameters, so an ID outside the INTEGER range matches no row as it does in a literal
+# comparison; INTEGER = BIGINT still uses the indexes
+Connector.prepare("addQuery", "INSERT INTO Query(queryID, purpose, size) VALUES($1, $2, $3)")
+Connector.prepare("getQueryProfile", "SELECT * FROM Query WHERE queryID=$1::BIGINT")
+Connector.prepare("deleteQueryFreeSpace",
+                  "UPDATE Disk SET free_space=free_space+$2::BIGINT "
+                  "WHERE diskID IN (SELECT diskID FROM DiskandQuery WHERE queryID=$1::BIGINT) RETURNING diskID")
+Connector.prepare("deleteQuery", "DELETE FROM Query WHERE queryID=$1::BIGINT")
+Connector.prepare("addDisk", "INSERT INTO Disk(diskID, company, speed, free_space, cost) VALUES($1, $2, $3, $4, $5)")
+Connector.prepare("getDiskProfile", "SELECT * FROM Disk WHERE diskID=$1::BIGINT")
+Connector.prepare("deleteDisk", "DELETE FROM Disk WHERE diskID=$1::BIGINT")
+Connector.prepare("addRAM", "INSERT INTO Ram(ramID, company, size) VALUES($1, $2, $3)")
+Connector.prepare("getRAMProfile", "SELECT * FROM Ram WHERE ramID=$1::BIGINT")
+Connector.prepare("deleteRAM", "DELETE FROM Ram WHERE ramID=$1::BIGINT")
+Connector.prepare("getQueryProfiles", "SELECT * FROM Query WHERE queryID = ANY($1::BIGINT[])")
+Connector.prepare("getDiskProfiles", "SELECT * FROM Disk WHERE diskID = ANY($1::BIGINT[])")
+Connector.prepare("getRAMProfiles", "SELECT * FROM Ram WHERE ramID = ANY($1::BIGINT[])")
+Connector.prepare("addQueryToDisk",
+                  "INSERT INTO DiskandQuery(diskID, queryID, queryPurpose, querySize) VALUES($1, $2, $3, $4)")
+Connector.prepare("addQueryToDiskFreeSpace", "UPDATE Disk SET free_space=free_space-$2::BIGINT WHERE diskID=$1::BIGINT")
+Connector.prepare("removeQueryFromDiskFreeSpace",
+                  "UPDATE Disk SET free_space=free_space+$3::BIGINT WHERE diskID=$1::BIGINT "
+                  "and EXISTS (SELECT * FROM DiskandQuery WHERE queryID=$2::BIGINT and diskID=$1::BIGINT)")
+Connector.prepare("removeQueryFromDisk", "DELETE FROM DiskandQuery WHERE queryID=$2::BIGINT and diskID=$1::BIGINT")
+# placeQueries reads every disk and the unplaced queries in the transaction that applies the placement,
+# the disks are locked so their free space cannot change in between. $1 NULL means every unplaced query
+Connector.prepare("placementDisks",
+                  "SELECT Disk.diskID, free_space, cost, ram_total FROM Disk "
+                  "INNER JOIN DiskStats ON(Disk.diskID = DiskStats.diskID) ORDER BY Disk.diskID FOR UPDATE OF Disk")
+Connector.prepare("placementQueries",
+                  "SELECT queryID, purpose, size FROM Query WHERE ($1::BIGINT[] IS NULL OR queryID = ANY($1::BIGINT[])) "
+                  "AND NOT EXISTS(SELECT * FROM DiskandQuery WHERE DiskandQuery.queryID=Query.queryID) "
+                  "FOR SHARE OF Query")
+Connector.prepare("addRAMToDisk", "INSERT INTO DiskandRam(diskID, ramID) VALUES($1, $2)")
+Connector.prepare("removeRAMFromDisk", "DELETE FROM DiskandRam WHERE diskID=$1::BIGINT AND ramID=$2::BIGINT")
+Connector.prepare("averageSizeQueriesOnDisk",
+                  "SELECT (SELECT query_size_sum::NUMERIC / NULLIF(query_count, 0) FROM DiskStats WHERE diskID=$1::BIGINT) "
+                  "AS avg")
+Connector.prepare("diskTotalRAM", "SELECT (SELECT ram_total FROM DiskStats WHERE diskID=$1::BIGINT) AS sum")
+Connector.prepare("getCostForPurpose", "SELECT (SELECT total FROM PurposeCost WHERE purpose=$1) AS sum")
+Connector.prepare("checkPurposeCosts",
+                  "SELECT COALESCE(P.purpose, A.purpose) AS purpose, COALESCE(P.total, 0) AS stored, "
+                  "COALESCE(A.total, 0) AS actual FROM PurposeCost AS P FULL OUTER JOIN "
+                  "(SELECT queryPurpose AS purpose, SUM(cost::BIGINT * querySize)::BIGINT AS total "
+                  "FROM Disk INNER JOIN DiskandQuery ON(Disk.diskID = DiskandQuery.diskID) "
+                  "GROUP BY queryPurpose) AS A ON(P.purpose = A.purpose) "
+                  "WHERE COALESCE(P.total, 0) <> COALESCE(A.total, 0)")
+# the bound is read once in a CTE and compared as an InitPlan, so Query_queryID_size is walked in queryID
+# order and the scan stops at the 5th query that fits. A disk without RAM admits no query
+Connector.prepare("getQueriesCanBeAddedToDisk",
+                  "WITH B AS (SELECT free_space AS bound FROM Disk WHERE diskID=$1::BIGINT) "
+                  "SELECT queryID FROM Query WHERE size<=(SELECT bound FROM B) "
+                  "ORDER BY queryID DESC LIMIT 5")
+# getQueriesCanBeAddedToDisk for many disks: the top $2 is looked up once per distinct free space of the
+# disks and joined back to them, ord is the position in $1
+Connector.prepare("getQueriesCanBeAddedToDisks",
+                  "WITH B AS (SELECT id, ord FROM unnest($1::BIGINT[]) WITH ORDINALITY AS B(id, ord)), "
+                  "F AS (SELECT DISTINCT free_space FROM Disk WHERE diskID IN (SELECT id FROM B)), "
+                  "T AS (SELECT F.free_space, Q.queryID FROM F CROSS JOIN LATERAL "
+                  "(SELECT queryID FROM Query WHERE size<=F.free_space ORDER BY queryID DESC LIMIT $2) AS Q) "
+                  "SELECT B.ord, T.queryID FROM B INNER JOIN Disk ON(Disk.diskID = B.id) "
+                  "INNER JOIN T ON(T.free_space = Disk.free_space) "
+                  "ORDER BY B.ord, T.queryID DESC")
+Connector.prepare("getQueriesCanBeAddedToDiskAndRAM",
+                  "WITH B AS (SELECT CASE WHEN ram_total > 0 THEN LEAST(free_space, ram_total) END AS bound "
+                  "FROM Disk INNER JOIN DiskStats ON(Disk.diskID = DiskStats.diskID) WHERE Disk.diskID=$1::BIGINT) "
+                  "SELECT queryID FROM Query WHERE size<=(SELECT bound FROM B) "
+                  "ORDER BY queryID ASC LIMIT 5")
+Connector.prepare("isCompanyExclusive",
+                  "SELECT company FROM Disk WHERE  diskID=$1::BIGINT and company=ALL(SELECT company from Ram "
+                  "WHERE ramID IN (SELECT ramID from DiskandRam WHERE diskID=$1::BIGINT))")
+# queries on more than one disk are found with one pass over DiskandQuery, instead of pairing every two
+# disks that share a query
+Connector.prepare("getConflictingDisks",
+                  "SELECT DISTINCT diskID FROM DiskandQuery WHERE queryID IN "
+                  "(SELECT queryID FROM DiskandQuery GROUP BY queryID HAVING COUNT(*) > 1) "
+                  "ORDER BY diskID ASC")
+# queries that fit a disk are counted with one sort of all query sizes and disk free spaces: a running
+# count of query rows, where a query sorts before a disk with the same value, instead of joining every
+# disk with every query
+Connector.prepare("mostAvailableDisks",
+                  "SELECT diskID FROM ("
+                  "SELECT diskID, speed, kind, SUM(1 - kind) OVER (ORDER BY size, kind ROWS UNBOUNDED PRECEDING) AS fits "
+                  "FROM (SELECT size, 0 AS kind, NULL::INTEGER AS diskID, NULL::INTEGER AS speed FROM Query "
+                  "UNION ALL SELECT free_space, 1, diskID, speed FROM Disk) AS sizes) AS ranked "
+                  "WHERE kind = 1 "
+                  "ORDER BY fits DESC, speed DESC, diskID ASC LIMIT 5")
+# queries sharing at least half of the disks of $1. Only the disks of $1 and the queries on them are
+# visited (DiskandQuery_queryID, then the primary key); without disks, every other query is close
+_CLOSE_QUERIES = ("WITH T AS (SELECT diskID FROM DiskandQuery WHERE queryID={id}) "
+                  "SELECT S.queryID FROM (SELECT D.queryID, COUNT(*) AS shared FROM T "
+                  "INNER JOIN DiskandQuery AS D ON(D.diskID = T.diskID) WHERE D.queryID<>{id} "
+                  "GROUP BY D.queryID) AS S "
+                  "WHERE 2 * S.shared >= (SELECT COUNT(*) FROM T) "
+                  "UNION "
+                  "SELECT queryID FROM Query WHERE queryID<>{id} AND NOT EXISTS(SELECT * FROM T) "
+                  "ORDER BY queryID ASC LIMIT 10")
+Connector.prepare("getCloseQueries", _CLOSE_QUERIES.format(id="$1::BIGINT"))
+Connector.prepare("getCloseQueriesBatch",
+                  "SELECT B.ord, C.queryID FROM unnest($1::BIGINT[]) WITH ORDINALITY AS B(id, ord) "
+                  "CROSS JOIN LATERAL (" + _CLOSE_QUERIES.format(id="B.id") + ") AS C "
+                  "ORDER BY B.ord, C.queryID")
+
+# pre-validation of bulk inserts, mirroring the NOT NULL and CHECK constraints of createTables:
+# an INTEGER column is checked against its minimum value, a TEXT column is marked _TEXT
+_TEXT = None
+_QUERY_CHECKS = (1, _TEXT, 0)
+_DISK_CHECKS = (1, _TEXT, 1, 0, 1)
+_RAM_CHECKS = (1, _TEXT, 1)
+
+
+# True if the row can be inserted, False if it violates a constraint (BAD_PARAMS) and None if only
+# the database can tell, e.g. a value of an unexpected type or outside the INTEGER range
+def _validRow(row, checks):
+    for value, minimum in zip(row, checks):
+        if value is None:
+            continue
+        if minimum is _TEXT:
+            if type(value) is not str:
+                return None
+        elif type(value) is not int or not -2 ** 31 <= value < 2 ** 31:
+            return None
+    for value, minimum in zip(row, checks):
+        if value is None or (minimum is not _TEXT and value < minimum):
+            return False
+    return True
+
+
+# insert one row of a bulk insert inside its own savepoint, with the same ReturnValue mapping as addDisk
+def _savepointAdd(conn, statement: str, row) -> ReturnValue:
+    conn.execute("SAVEPOINT bulk_row")
+    try:
+        conn.execute_prepared(statement, row)
+        conn.execute("RELEASE SAVEPOINT bulk_row")
+        return ReturnValue.OK
+    except DatabaseException.NOT_NULL_VIOLATION as e:
+        result = ReturnValue.BAD_PARAMS
+    except DatabaseException.CHECK_VIOLATION as e:
+        result = ReturnValue.BAD_PARAMS
+    except DatabaseException.UNIQUE_VIOLATION as e:
+        result = ReturnValue.ALREADY_EXISTS
+    except DatabaseException.ConnectionInvalid as e:
+        raise
+    except Exception as e:
+        result = ReturnValue.ERROR
+    conn.execute("ROLLBACK TO SAVEPOINT bulk_row")
+    return result
+
+
+# insert many rows in one transaction. rows failing pre-validation are BAD_PARAMS without a round trip,
+# the rest go out as multi-row INSERT ... ON CONFLICT DO NOTHING RETURNING id and whatever is not returned
+# already existed. rows only the database can validate, later rows with the same ID as one of them, or
+# all rows if the batch fails anyway, are inserted one by one in input order under savepoints after the batch
+def _bulkAdd(insert: str, single: str, rows: list, checks) -> List[ReturnValue]:
+    results = [ReturnValue.ERROR] * len(rows)
+    candidates, batch, doubtful, seen, doubtfulIDs = [], [], [], set(), set()
+    for index, row in enumerate(rows):
+        valid = _validRow(row, checks)
+        if valid is None:
+            doubtful.append(index)
+            if isinstance(row[0], Hashable):
+                doubtfulIDs.add(row[0])
+        elif not valid:
+            results[index] = ReturnValue.BAD_PARAMS
+        elif row[0] in doubtfulIDs:
+            doubtful.append(index)
+        else:
+            candidates.append(index)
+            if row[0] in seen:
+                results[index] = ReturnValue.ALREADY_EXISTS
+            else:
+                seen.add(row[0])
+                batch.append(index)
+    conn = None
+    try:
+        conn = Connector.DBConnector(pooled=True)
+        if len(batch) > 0:
+            conn.execute("SAVEPOINT bulk")
+            try:
+                _, res = conn.execute_values(insert, [rows[index] for index in batch], fetch=True)
+                inserted = set(row[0] for row in res.rows)
+                for index in batch:
+                    results[index] = ReturnValue.OK if rows[index][0] in inserted else ReturnValue.ALREADY_EXISTS
+                conn.execute("RELEASE SAVEPOINT bulk")
+            except DatabaseException.ConnectionInvalid as e:
+                raise
+            except Exception as e:
+                conn.execute("ROLLBACK TO SAVEPOINT bulk")
+                doubtful = sorted(doubtful + candidates)
+        for index in doubtful:
+            results[index] = _savepointAdd(conn, single, rows[index])
+        conn.commit()
+    except DatabaseException.ConnectionInvalid as e:
+        return [ReturnValue.ERROR] * len(rows)
+    except Exception as e:
+        return [ReturnValue.ERROR] * len(rows)
+    finally:
+        conn.close()
+    return results
+
+
+# optional read-through cache in front of the profile functions, kind -> LRUCache. see enableProfileCache
+_profileCaches = {}
+
+
+# cache Disk/RAM/Query profiles in process, bounded to maxSize entries per kind, each kept for ttl seconds.
+# every function that changes a profile invalidates it
+def enableProfileCache(maxSize=1024, ttl=60.0):
+    global _profileCaches
+    _profileCaches = {'disk': LRUCache(maxSize, ttl), 'ram': LRUCache(maxSize, ttl), 'query': LRUCache(maxSize, ttl)}
+
+
+def disableProfileCache():
+    global _profileCaches
+    _profileCaches = {}
+
+
+# hit/miss/eviction counters per kind, empty when the cache is disabled
+def profileCacheStats() -> dict:
+    return {kind: cache.stats() for kind, cache in _profileCaches.items()}
+
+
+# (cached profile or None, stamp to pass to _cacheProfile). Inside a session the cache is not used, the
+# session sees its own uncommitted changes, which other threads must not
+def _cachedProfile(kind: str, id):
+    cache = _profileCaches.get(kind)
+    if cache is None or id is None or not isinstance(id, Hashable) or Connector.currentSession() is not None:
+        return None, None
+    return cache.get(id), cache.stamp()
+
+
+def _cacheProfile(kind: str, id, stamp, profile: tuple):
+    cache = _profileCaches.get(kind)
+    if cache is not None and stamp is not None:
+        cache.put(id, profile, stamp)
+
+
+# inside a session the profiles are invalidated again once it ended, another thread may have cached
+# the committed profile in between
+def _invalidateProfiles(kind: str, ids):
+    cache = _profileCaches.get(kind)
+    if cache is not None:
+        ids = [id for id in ids if isinstance(id, Hashable)]
+        for id in ids:
+            cache.invalidate(id)
+        session = Connector.currentSession()
+        if session is not None:
+            session.onEnd(lambda: _invalidateProfiles(kind, ids))
+
+
+def _clearProfileCaches():
+    for cache in _profileCaches.values():
+        cache.clear()
+    session = Connector.currentSession()
+    if session is not None:
+        session.onEnd(_clearProfileCaches)
+
+
+# the profiles of many IDs, from the cache or with one statement for the rest. returns ID -> profile
+# tuple in the order of columns (empty on any error)
+def _profiles(kind: str, statement: str, ids: list, columns: tuple) -> dict:
+    found = {}
+    missing = set()
+    stamp = None
+    for id in ids:
+        if id is None or not isinstance(id, Hashable) or id in found or id in missing:
+            continue
+        profile, stamp = _cachedProfile(kind, id)
+        if profile is not None:
+            found[id] = profile
+        else:
+            missing.add(id)
+    if len(missing) == 0:
+        return found
+    conn = None
+    try:
+        conn = Connector.DBConnector(pooled=True)
+        rows_effected, res = conn.execute_prepared(statement, (list(missing),))
+        conn.commit()
+        for row in res:
+            found[row[columns[0]]] = tuple(row[column] for column in columns)
+            _cacheProfile(kind, row[columns[0]], stamp, found[row[columns[0]]])
+    except DatabaseException as e:
+        return {}
+    except Exception as e:
+        return {}
+    finally:
+        conn.close()
+    return found
+
+
+# optional engine the public functions below run on instead of PostgreSQL, see setBackend
+_backend = None
+
+
+# run the functions below on backend, any object with them as methods such as
+# Utility.MemoryBackend.MemoryBackend(), or on PostgreSQL again with None
+def setBackend(backend=None):
+    global _backend
+    _backend = backend
+
+
+def _dispatch(function):
+    @functools.wraps(function)
+    def dispatched(*args, **kwargs):
+        if _backend is not None:
+            return getattr(_backend, function.__name__)(*args, **kwargs)
+        return function(*args, **kwargs)
+    return dispatched
+
+
+# the tables are created in the schema of Connector.schema() when there is one (e.g. one per test worker),
+# dropTables leaves the empty schema for the next createTables
+@_dispatch
 def createTables():
     conn = None
     try:
-        conn = Connector.DBConnector()
-        conn.execute("BEGIN;"
-                     "CREATE TABLE Query(queryID INTEGER NOT NULL ,"
+        conn = Connector.DBConnector(pooled=True)
+        if Connector.schema() is not None:
+            conn.execute("CREATE SCHEMA IF NOT EXISTS " + Connector.schema())
+        conn.execute("CREATE TABLE Query(queryID INTEGER NOT NULL ,"
                      "purpose TEXT NOT NULL,"
                      "size INTEGER NOT NULL,"
                      "UNIQUE(queryID),"
@@ -47,7 +366,98 @@ def createTables():
                      "FOREIGN KEY(diskID) REFERENCES Disk(diskID) ON DELETE CASCADE,"
                      "FOREIGN KEY(queryID) REFERENCES Query(queryID) ON DELETE CASCADE,"
                      "PRIMARY KEY (diskID,queryID));"
-                     "COMMIT;")
+                     # the primary keys lead with diskID, these serve the lookups from the other side
+                     "CREATE INDEX DiskandQuery_queryID ON DiskandQuery(queryID);"
+                     "CREATE INDEX DiskandQuery_queryPurpose ON DiskandQuery(queryPurpose);"
+                     "CREATE INDEX DiskandRam_ramID ON DiskandRam(ramID);"
+                     # top 5 by queryID among the queries that fit, without visiting the heap for size
+                     "CREATE INDEX Query_queryID_size ON Query(queryID, size);"
+                     # per disk aggregates, kept up to date by the triggers below. The triggers on the junction
+                     # tables run once per statement over its transition table, so a bulk insert updates every
+                     # aggregate row once instead of once per inserted row
+                     "CREATE TABLE DiskStats(diskID INTEGER PRIMARY KEY,"
+                     "query_count INTEGER NOT NULL DEFAULT 0,"
+                     "query_size_sum BIGINT NOT NULL DEFAULT 0,"
+                     "ram_total BIGINT NOT NULL DEFAULT 0,"
+                     "FOREIGN KEY(diskID) REFERENCES Disk(diskID) ON DELETE CASCADE);"
+                     "CREATE OR REPLACE FUNCTION DiskStats_disk() RETURNS TRIGGER AS $$ BEGIN "
+                     "INSERT INTO DiskStats(diskID) SELECT diskID FROM new_rows; RETURN NULL; "
+                     "END $$ LANGUAGE plpgsql;"
+                     "CREATE TRIGGER DiskStats_disk AFTER INSERT ON Disk REFERENCING NEW TABLE AS new_rows "
+                     "FOR EACH STATEMENT EXECUTE FUNCTION DiskStats_disk();"
+                     # a disk delete cascades to DiskStats as well, updating a missing row is a no-op
+                     "CREATE OR REPLACE FUNCTION DiskStats_query() RETURNS TRIGGER AS $$ BEGIN "
+                     "IF TG_OP = 'INSERT' THEN "
+                     "UPDATE DiskStats SET query_count=query_count+S.count, query_size_sum=query_size_sum+S.size "
+                     "FROM (SELECT diskID, COUNT(*) AS count, SUM(querySize) AS size FROM new_rows GROUP BY diskID) AS S "
+                     "WHERE DiskStats.diskID=S.diskID; "
+                     "ELSE "
+                     "UPDATE DiskStats SET query_count=query_count-S.count, query_size_sum=query_size_sum-S.size "
+                     "FROM (SELECT diskID, COUNT(*) AS count, SUM(querySize) AS size FROM old_rows GROUP BY diskID) AS S "
+                     "WHERE DiskStats.diskID=S.diskID; "
+                     "END IF; RETURN NULL; "
+                     "END $$ LANGUAGE plpgsql;"
+                     "CREATE TRIGGER DiskStats_addQuery AFTER INSERT ON DiskandQuery REFERENCING NEW TABLE AS new_rows "
+                     "FOR EACH STATEMENT EXECUTE FUNCTION DiskStats_query();"
+                     "CREATE TRIGGER DiskStats_removeQuery AFTER DELETE ON DiskandQuery "
+                     "REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION DiskStats_query();"
+                     # a RAM delete subtracts its size itself, by the time the cascade removes the DiskandRam
+                     # rows the Ram row is gone and the join below matches nothing
+                     "CREATE OR REPLACE FUNCTION DiskStats_ram() RETURNS TRIGGER AS $$ BEGIN "
+                     "IF TG_OP = 'INSERT' THEN "
+                     "UPDATE DiskStats SET ram_total=ram_total+S.size "
+                     "FROM (SELECT N.diskID, SUM(Ram.size) AS size FROM new_rows AS N "
+                     "INNER JOIN Ram ON(Ram.ramID = N.ramID) GROUP BY N.diskID) AS S "
+                     "WHERE DiskStats.diskID=S.diskID; "
+                     "ELSE "
+                     "UPDATE DiskStats SET ram_total=ram_total-S.size "
+                     "FROM (SELECT O.diskID, SUM(Ram.size) AS size FROM old_rows AS O "
+                     "INNER JOIN Ram ON(Ram.ramID = O.ramID) GROUP BY O.diskID) AS S "
+                     "WHERE DiskStats.diskID=S.diskID; "
+                     "END IF; RETURN NULL; "
+                     "END $$ LANGUAGE plpgsql;"
+                     "CREATE TRIGGER DiskStats_addRam AFTER INSERT ON DiskandRam REFERENCING NEW TABLE AS new_rows "
+                     "FOR EACH STATEMENT EXECUTE FUNCTION DiskStats_ram();"
+                     "CREATE TRIGGER DiskStats_removeRam AFTER DELETE ON DiskandRam REFERENCING OLD TABLE AS old_rows "
+                     "FOR EACH STATEMENT EXECUTE FUNCTION DiskStats_ram();"
+                     "CREATE OR REPLACE FUNCTION DiskStats_deleteRam() RETURNS TRIGGER AS $$ BEGIN "
+                     "UPDATE DiskStats SET ram_total=ram_total-OLD.size "
+                     "WHERE diskID IN (SELECT diskID FROM DiskandRam WHERE ramID=OLD.ramID); RETURN OLD; "
+                     "END $$ LANGUAGE plpgsql;"
+                     "CREATE TRIGGER DiskStats_deleteRam BEFORE DELETE ON Ram "
+                     "FOR EACH ROW EXECUTE FUNCTION DiskStats_deleteRam();"
+                     # SUM(cost * querySize) of every purpose, checkPurposeCosts() recomputes it from scratch
+                     "CREATE TABLE PurposeCost(purpose TEXT PRIMARY KEY,"
+                     "total BIGINT NOT NULL DEFAULT 0);"
+                     "CREATE OR REPLACE FUNCTION PurposeCost_query() RETURNS TRIGGER AS $$ BEGIN "
+                     "IF TG_OP = 'INSERT' THEN "
+                     "INSERT INTO PurposeCost(purpose, total) "
+                     "SELECT N.queryPurpose, SUM(Disk.cost::BIGINT * N.querySize) FROM new_rows AS N "
+                     "INNER JOIN Disk ON(Disk.diskID = N.diskID) GROUP BY N.queryPurpose "
+                     "ON CONFLICT (purpose) DO UPDATE SET total=PurposeCost.total+EXCLUDED.total; "
+                     "ELSE "
+                     "UPDATE PurposeCost SET total=total-S.cost "
+                     "FROM (SELECT O.queryPurpose, SUM(Disk.cost::BIGINT * O.querySize) AS cost FROM old_rows AS O "
+                     "INNER JOIN Disk ON(Disk.diskID = O.diskID) GROUP BY O.queryPurpose) AS S "
+                     "WHERE purpose=S.queryPurpose; "
+                     "END IF; RETURN NULL; "
+                     "END $$ LANGUAGE plpgsql;"
+                     "CREATE TRIGGER PurposeCost_addQuery AFTER INSERT ON DiskandQuery REFERENCING NEW TABLE AS new_rows "
+                     "FOR EACH STATEMENT EXECUTE FUNCTION PurposeCost_query();"
+                     "CREATE TRIGGER PurposeCost_removeQuery AFTER DELETE ON DiskandQuery "
+                     "REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION PurposeCost_query();"
+                     # a disk delete subtracts its queries itself, the cascaded DiskandQuery deletes no longer
+                     # see the disk's cost
+                     "CREATE OR REPLACE FUNCTION PurposeCost_deleteDisk() RETURNS TRIGGER AS $$ BEGIN "
+                     "UPDATE PurposeCost SET total=total-S.cost FROM "
+                     "(SELECT queryPurpose, SUM(querySize) * OLD.cost AS cost FROM DiskandQuery "
+                     "WHERE diskID=OLD.diskID GROUP BY queryPurpose) AS S "
+                     "WHERE purpose=S.queryPurpose; RETURN OLD; "
+                     "END $$ LANGUAGE plpgsql;"
+                     "CREATE TRIGGER PurposeCost_deleteDisk BEFORE DELETE ON Disk "
+                     "FOR EACH ROW EXECUTE FUNCTION PurposeCost_deleteDisk();")
+        conn.commit()
+        _clearProfileCaches()
     except DatabaseException.ConnectionInvalid as e:
         conn.rollback()
     except DatabaseException.NOT_NULL_VIOLATION as e:
@@ -65,17 +475,19 @@ def createTables():
         conn.close()
 
 
+@_dispatch
 def clearTables():
     conn = None
     try:
-        conn = Connector.DBConnector()
-        conn.execute("BEGIN;"
-                     "DELETE FROM Query;"
+        conn = Connector.DBConnector(pooled=True)
+        conn.execute("DELETE FROM Query;"
                      "DELETE FROM Disk;"
                      "DELETE FROM Ram;"
                      "DELETE FROM DiskandQuery;"
                      "DELETE FROM DiskandRam;"
-                     "COMMIT;")
+                     "DELETE FROM PurposeCost;")
+        conn.commit()
+        _clearProfileCaches()
     except DatabaseException.ConnectionInvalid as e:
         conn.rollback()
     except Exception as e:
@@ -84,17 +496,22 @@ def clearTables():
         conn.close()
 
 
+@_dispatch
 def dropTables():
     conn = None
     try:
-        conn = Connector.DBConnector()
-        conn.execute("BEGIN;"
-                     "DROP TABLE IF EXISTS Query CASCADE;"
+        conn = Connector.DBConnector(pooled=True)
+        conn.execute("DROP TABLE IF EXISTS Query CASCADE;"
                      "DROP TABLE IF EXISTS Disk CASCADE;"
                      "DROP TABLE IF EXISTS Ram CASCADE;"
                      "DROP TABLE IF EXISTS DiskandQuery CASCADE;"
                      "DROP TABLE IF EXISTS DiskandRam CASCADE;"
-                     "COMMIT;")
+                     "DROP TABLE IF EXISTS DiskStats CASCADE;"
+                     "DROP TABLE IF EXISTS PurposeCost CASCADE;"
+                     "DROP FUNCTION IF EXISTS DiskStats_disk, DiskStats_query, DiskStats_ram, DiskStats_deleteRam,"
+                     "PurposeCost_query, PurposeCost_deleteDisk;")
+        conn.commit()
+        _clearProfileCaches()
     except DatabaseException.ConnectionInvalid as e:
         conn.rollback()
     except Exception as e:
@@ -103,14 +520,12 @@ def dropTables():
         conn.close()
 
 
+@_dispatch
 def addQuery(query: Query) -> ReturnValue:
     conn = None
     try:
-        conn = Connector.DBConnector()
-        query = sql.SQL("INSERT INTO Query(queryID, purpose,size) VALUES({id}, {purpose}, {size})").\
-            format(id=sql.Literal(query.getQueryID()),purpose=sql.Literal(query.getPurpose()),
-                   size=sql.Literal(query.getSize()))
-        rows_effected, _ = conn.execute(query)
+        conn = Connector.DBConnector(pooled=True)
+        rows_effected, _ = conn.execute_prepared("addQuery", (query.getQueryID(), query.getPurpose(), query.getSize()))
         conn.commit()
     except DatabaseException.NOT_NULL_VIOLATION as e:
         return ReturnValue.BAD_PARAMS
@@ -123,24 +538,38 @@ def addQuery(query: Query) -> ReturnValue:
     except Exception as e:
         return ReturnValue.ERROR
     finally:
+        _invalidateProfiles('query', [query.getQueryID()])
         conn.close()
     return ReturnValue.OK
 
 
+# add many queries in one transaction, returns the ReturnValue addQuery would give for each of them
+@_dispatch
+def addQueries(queries: List[Query]) -> List[ReturnValue]:
+    results = _bulkAdd("INSERT INTO Query(queryID, purpose, size) VALUES %s "
+                        "ON CONFLICT (queryID) DO NOTHING RETURNING queryID", "addQuery",
+                        [(query.getQueryID(), query.getPurpose(), query.getSize()) for query in queries], _QUERY_CHECKS)
+    _invalidateProfiles('query', [query.getQueryID() for query in queries])
+    return results
+
+
+@_dispatch
 def getQueryProfile(queryID: int) -> Query:
+    cached, stamp = _cachedProfile('query', queryID)
+    if cached is not None:
+        return Query(*cached)
     conn = None
     query = Query.badQuery()
     try:
-        conn = Connector.DBConnector()
-        sql_query = sql.SQL("SELECT * FROM Query WHERE queryID={id}"). \
-            format(id=sql.Literal(queryID))
-        rows_effected, res = conn.execute(sql_query)
+        conn = Connector.DBConnector(pooled=True)
+        rows_effected, res = conn.execute_prepared("getQueryProfile", (queryID,))
         conn.commit()
         if(rows_effected==0):
             return query
         query.setQueryID(res[0]['queryID'])
         query.setPurpose(res[0]['purpose'])
         query.setSize(res[0]['size'])
+        _cacheProfile('query', queryID, stamp, (query.getQueryID(), query.getPurpose(), query.getSize()))
         return query
     except DatabaseException as e:
         return query
@@ -150,16 +579,22 @@ def getQueryProfile(queryID: int) -> Query:
         conn.close()
 
 
+# the profiles of many queries in input order, Query.badQuery() for IDs that do not exist
+@_dispatch
+def getQueryProfiles(queryIDs: List[int]) -> List[Query]:
+    found = _profiles('query', "getQueryProfiles", queryIDs, ('queryID', 'purpose', 'size'))
+    return [Query(*found[queryID]) if queryID in found else Query.badQuery() for queryID in queryIDs]
+
+
+@_dispatch
 def deleteQuery(query: Query) -> ReturnValue:
     conn = None
     try:
-        conn = Connector.DBConnector()
-        sql_query = sql.SQL("BEGIN;"
-                            "UPDATE Disk SET free_space= free_space+{size} WHERE diskID IN (SELECT diskID FROM DiskandQuery WHERE queryID={id});"
-                            "DELETE FROM Query WHERE queryID={id};"
-                            "COMMIT;"). \
-            format(size=sql.Literal(query.getSize()),id=sql.Literal(query.getQueryID()))
-        rows_effected, _ = conn.execute(sql_query)
+        conn = Connector.DBConnector(pooled=True)
+        _, disks = conn.execute_prepared("deleteQueryFreeSpace", (query.getQueryID(), query.getSize()))
+        rows_effected, _ = conn.execute_prepared("deleteQuery", (query.getQueryID(),))
+        conn.commit()
+        _invalidateProfiles('disk', disks.column('diskid'))
     except DatabaseException as e:
         conn.rollback()
         return ReturnValue.ERROR
@@ -167,20 +602,18 @@ def deleteQuery(query: Query) -> ReturnValue:
         conn.rollback()
         return ReturnValue.ERROR
     finally:
+        _invalidateProfiles('query', [query.getQueryID()])
         conn.close()
     return ReturnValue.OK
 
 
+@_dispatch
 def addDisk(disk: Disk) -> ReturnValue:
     conn = None
     try:
-        conn = Connector.DBConnector()
-        query = sql.SQL("INSERT INTO Disk(diskID,company,speed,free_space,cost) "
-                        "VALUES({id}, {company}, {speed}, {free_space},{cost})"). \
-            format(id=sql.Literal(disk.getDiskID()), company=sql.Literal(disk.getCompany()),
-                   speed=sql.Literal(disk.getSpeed()), free_space=sql.Literal(disk.getFreeSpace()),
-                   cost=sql.Literal(disk.getCost()))
-        rows_effected, _ = conn.execute(query)
+        conn = Connector.DBConnector(pooled=True)
+        rows_effected, _ = conn.execute_prepared("addDisk", (disk.getDiskID(), disk.getCompany(), disk.getSpeed(),
+                                                             disk.getFreeSpace(), disk.getCost()))
         conn.commit()
     except DatabaseException.NOT_NULL_VIOLATION as e:
         return ReturnValue.BAD_PARAMS
@@ -193,19 +626,32 @@ def addDisk(disk: Disk) -> ReturnValue:
     except Exception as e:
         return ReturnValue.ERROR
     finally:
+        _invalidateProfiles('disk', [disk.getDiskID()])
         conn.close()
     return ReturnValue.OK
 
 
+# add many disks in one transaction, returns the ReturnValue addDisk would give for each of them
+@_dispatch
+def addDisks(disks: List[Disk]) -> List[ReturnValue]:
+    results = _bulkAdd("INSERT INTO Disk(diskID, company, speed, free_space, cost) VALUES %s "
+                        "ON CONFLICT (diskID) DO NOTHING RETURNING diskID", "addDisk",
+                        [(disk.getDiskID(), disk.getCompany(), disk.getSpeed(), disk.getFreeSpace(), disk.getCost())
+                         for disk in disks], _DISK_CHECKS)
+    _invalidateProfiles('disk', [disk.getDiskID() for disk in disks])
+    return results
 
+
+@_dispatch
 def getDiskProfile(diskID: int) -> Disk:
+    cached, stamp = _cachedProfile('disk', diskID)
+    if cached is not None:
+        return Disk(*cached)
     conn = None
     disk = Disk.badDisk()
     try:
-        conn = Connector.DBConnector()
-        sql_query = sql.SQL("SELECT * FROM Disk WHERE diskID={id}"). \
-            format(id=sql.Literal(diskID))
-        rows_effected, res = conn.execute(sql_query)
+        conn = Connector.DBConnector(pooled=True)
+        rows_effected, res = conn.execute_prepared("getDiskProfile", (diskID,))
         conn.commit()
         if (rows_effected == 0):
             return disk
@@ -214,6 +660,8 @@ def getDiskProfile(diskID: int) -> Disk:
         disk.setSpeed(res[0]['speed'])
         disk.setFreeSpace(res[0]['free_space'])
         disk.setCost(res[0]['cost'])
+        _cacheProfile('disk', diskID, stamp, (disk.getDiskID(), disk.getCompany(), disk.getSpeed(),
+                                              disk.getFreeSpace(), disk.getCost()))
 
     except DatabaseException as e:
         return disk
@@ -224,13 +672,19 @@ def getDiskProfile(diskID: int) -> Disk:
     return disk
 
 
+# the profiles of many disks in input order, Disk.badDisk() for IDs that do not exist
+@_dispatch
+def getDiskProfiles(diskIDs: List[int]) -> List[Disk]:
+    found = _profiles('disk', "getDiskProfiles", diskIDs, ('diskID', 'company', 'speed', 'free_space', 'cost'))
+    return [Disk(*found[diskID]) if diskID in found else Disk.badDisk() for diskID in diskIDs]
+
+
+@_dispatch
 def deleteDisk(diskID: int) -> ReturnValue:
     conn = None
     try:
-        conn = Connector.DBConnector()
-        sql_query = sql.SQL("DELETE FROM Disk WHERE diskID={id};"). \
-            format(id=sql.Literal(diskID))
-        rows_effected, _ = conn.execute(sql_query)
+        conn = Connector.DBConnector(pooled=True)
+        rows_effected, _ = conn.execute_prepared("deleteDisk", (diskID,))
         conn.commit()
         if rows_effected==0:
             return ReturnValue.NOT_EXISTS
@@ -239,18 +693,17 @@ def deleteDisk(diskID: int) -> ReturnValue:
     except Exception as e:
         return ReturnValue.ERROR
     finally:
+        _invalidateProfiles('disk', [diskID])
         conn.close()
     return ReturnValue.OK
 
 
+@_dispatch
 def addRAM(ram: RAM) -> ReturnValue:
     conn = None
     try:
-        conn = Connector.DBConnector()
-        query = sql.SQL("INSERT INTO Ram(ramID, company,size) VALUES({id}, {company}, {size})"). \
-            format(id=sql.Literal(ram.getRamID()), company=sql.Literal(ram.getCompany()),
-                   size=sql.Literal(ram.getSize()))
-        rows_effected, _ = conn.execute(query)
+        conn = Connector.DBConnector(pooled=True)
+        rows_effected, _ = conn.execute_prepared("addRAM", (ram.getRamID(), ram.getCompany(), ram.getSize()))
         conn.commit()
     except DatabaseException.NOT_NULL_VIOLATION as e:
         return ReturnValue.BAD_PARAMS
@@ -263,24 +716,38 @@ def addRAM(ram: RAM) -> ReturnValue:
     except Exception as e:
         return ReturnValue.ERROR
     finally:
+        _invalidateProfiles('ram', [ram.getRamID()])
         conn.close()
     return ReturnValue.OK
 
 
+# add many RAMs in one transaction, returns the ReturnValue addRAM would give for each of them
+@_dispatch
+def addRAMs(rams: List[RAM]) -> List[ReturnValue]:
+    results = _bulkAdd("INSERT INTO Ram(ramID, company, size) VALUES %s "
+                        "ON CONFLICT (ramID) DO NOTHING RETURNING ramID", "addRAM",
+                        [(ram.getRamID(), ram.getCompany(), ram.getSize()) for ram in rams], _RAM_CHECKS)
+    _invalidateProfiles('ram', [ram.getRamID() for ram in rams])
+    return results
+
+
+@_dispatch
 def getRAMProfile(ramID: int) -> RAM:
+    cached, stamp = _cachedProfile('ram', ramID)
+    if cached is not None:
+        return RAM(*cached)
     conn = None
     ram = RAM.badRAM()
     try:
-        conn = Connector.DBConnector()
-        sql_query = sql.SQL("SELECT * FROM Ram WHERE ramID={id}"). \
-            format(id=sql.Literal(ramID))
-        rows_effected, res = conn.execute(sql_query)
+        conn = Connector.DBConnector(pooled=True)
+        rows_effected, res = conn.execute_prepared("getRAMProfile", (ramID,))
         conn.commit()
         if (rows_effected == 0):
             return ram
         ram.setRamID(res[0]['ramID'])
         ram.setCompany(res[0]['company'])
         ram.setSize(res[0]['size'])
+        _cacheProfile('ram', ramID, stamp, (ram.getRamID(), ram.getCompany(), ram.getSize()))
 
     except DatabaseException as e:
         return ram
@@ -291,13 +758,19 @@ def getRAMProfile(ramID: int) -> RAM:
     return ram
 
 
+# the profiles of many RAMs in input order, RAM.badRAM() for IDs that do not exist
+@_dispatch
+def getRAMProfiles(ramIDs: List[int]) -> List[RAM]:
+    found = _profiles('ram', "getRAMProfiles", ramIDs, ('ramID', 'company', 'size'))
+    return [RAM(*found[ramID]) if ramID in found else RAM.badRAM() for ramID in ramIDs]
+
+
+@_dispatch
 def deleteRAM(ramID: int) -> ReturnValue:
     conn = None
     try:
-        conn = Connector.DBConnector()
-        sql_query = sql.SQL("DELETE FROM Ram WHERE ramID={id};"). \
-            format(id=sql.Literal(ramID))
-        rows_effected, _ = conn.execute(sql_query)
+        conn = Connector.DBConnector(pooled=True)
+        rows_effected, _ = conn.execute_prepared("deleteRAM", (ramID,))
         conn.commit()
         if rows_effected == 0:
             return ReturnValue.NOT_EXISTS
@@ -306,24 +779,20 @@ def deleteRAM(ramID: int) -> ReturnValue:
     except Exception as e:
         return ReturnValue.ERROR
     finally:
+        _invalidateProfiles('ram', [ramID])
         conn.close()
     return ReturnValue.OK
 
 
+@_dispatch
 def addDiskAndQuery(disk: Disk, query: Query) -> ReturnValue:
     conn = None
     try:
-        conn = Connector.DBConnector()
-        sql_query = sql.SQL("BEGIN;"
-                        "INSERT INTO Disk(diskID,company,speed,free_space,cost) "
-                        "VALUES({diskid}, {company}, {speed}, {free_space},{cost});"
-                        "INSERT INTO Query(queryID, purpose,size) VALUES({queryid}, {purpose}, {size});"
-                        "COMMIT;"). \
-        format(diskid=sql.Literal(disk.getDiskID()), company=sql.Literal(disk.getCompany()),
-                   speed=sql.Literal(disk.getSpeed()), free_space=sql.Literal(disk.getFreeSpace()),
-                   cost=sql.Literal(disk.getCost()),queryid=sql.Literal(query.getQueryID()), purpose=sql.Literal(query.getPurpose()),
-                   size=sql.Literal(query.getSize()))
-        rows_effected, _ = conn.execute(sql_query)
+        conn = Connector.DBConnector(pooled=True)
+        conn.execute_prepared("addDisk", (disk.getDiskID(), disk.getCompany(), disk.getSpeed(),
+                                          disk.getFreeSpace(), disk.getCost()))
+        rows_effected, _ = conn.execute_prepared("addQuery", (query.getQueryID(), query.getPurpose(), query.getSize()))
+        conn.commit()
     except DatabaseException.UNIQUE_VIOLATION as e:
         conn.rollback()
         return ReturnValue.ALREADY_EXISTS
@@ -334,22 +803,20 @@ def addDiskAndQuery(disk: Disk, query: Query) -> ReturnValue:
         conn.rollback()
         return ReturnValue.ERROR
     finally:
+        _invalidateProfiles('disk', [disk.getDiskID()])
+        _invalidateProfiles('query', [query.getQueryID()])
         conn.close()
     return ReturnValue.OK
 
 
+@_dispatch
 def addQueryToDisk(query: Query, diskID: int) -> ReturnValue:
     conn = None
     try:
-        conn = Connector.DBConnector()
-        sql_query = sql.SQL("BEGIN;"
-                            "INSERT INTO DiskandQuery(diskID,queryID,queryPurpose,querySize) "
-                            "VALUES({diskid}, {queryid}, {querypurpose}, {querysize});"
-                            "UPDATE Disk SET free_space=free_space-{querysize} WHERE diskID={diskid};"
-                            "COMMIT;").\
-                    format(diskid=sql.Literal(diskID),queryid=sql.Literal(query.getQueryID()),querypurpose=sql.Literal(query.getPurpose()),
-                   querysize=sql.Literal(query.getSize()))
-        rows_effected, _ = conn.execute(sql_query)
+        conn = Connector.DBConnector(pooled=True)
+        conn.execute_prepared("addQueryToDisk", (diskID, query.getQueryID(), query.getPurpose(), query.getSize()))
+        rows_effected, _ = conn.execute_prepared("addQueryToDiskFreeSpace", (diskID, query.getSize()))
+        conn.commit()
     except DatabaseException.FOREIGN_KEY_VIOLATION as e:
         conn.rollback()
         return ReturnValue.NOT_EXISTS
@@ -366,21 +833,19 @@ def addQueryToDisk(query: Query, diskID: int) -> ReturnValue:
         conn.rollback()
         return ReturnValue.ERROR
     finally:
+        _invalidateProfiles('disk', [diskID])
         conn.close()
     return ReturnValue.OK
 
 
+@_dispatch
 def removeQueryFromDisk(query: Query, diskID: int) -> ReturnValue:
     conn = None
     try:
-        conn = Connector.DBConnector()
-        sql_query = sql.SQL("BEGIN;"
-                            "UPDATE Disk SET free_space=free_space+{querysize} WHERE diskID={diskid} and EXISTS (SELECT *FROM DiskandQuery WHERE queryID={queryid} and diskID={diskid});"
-                            "DELETE FROM DiskandQuery WHERE queryID={queryid} and diskID={diskid};"
-                            "COMMIT;"). \
-            format(diskid=sql.Literal(diskID), queryid=sql.Literal(query.getQueryID()),
-                   querysize=sql.Literal(query.getSize()))
-        rows_effected, _ = conn.execute(sql_query)
+        conn = Connector.DBConnector(pooled=True)
+        conn.execute_prepared("removeQueryFromDiskFreeSpace", (diskID, query.getQueryID(), query.getSize()))
+        rows_effected, _ = conn.execute_prepared("removeQueryFromDisk", (diskID, query.getQueryID()))
+        conn.commit()
     except DatabaseException.ConnectionInvalid as e:
         conn.rollback()
         return ReturnValue.ERROR
@@ -388,19 +853,61 @@ def removeQueryFromDisk(query: Query, diskID: int) -> ReturnValue:
         conn.rollback()
         return ReturnValue.ERROR
     finally:
+        _invalidateProfiles('disk', [diskID])
         conn.close()
     return ReturnValue.OK
 
 
+# place the given queries (all queries that are on no disk if None) on disks, largest first, each on the
+# first disk that has the free space and at least its size in RAM, by diskID or by cost if minimizeCost.
+# Queries already on a disk are skipped, queries that fit nowhere are left out of the returned
+# queryID -> diskID placement. The placement is applied in one transaction
+@_dispatch
+def placeQueries(queryIDs: List[int] = None, minimizeCost=False) -> Tuple[ReturnValue, Dict[int, int]]:
+    if queryIDs is not None and len(queryIDs) == 0:
+        return ReturnValue.OK, {}
+    conn = None
+    placement = {}
+    try:
+        conn = Connector.DBConnector(pooled=True)
+        rows_effected, disks = conn.execute_prepared("placementDisks")
+        rows_effected, queries = conn.execute_prepared("placementQueries",
+                                                       (None if queryIDs is None else list(queryIDs),))
+        if minimizeCost:
+            disks = sorted(disks, key=lambda row: (row['cost'], row['diskID']))
+        placement = Placement.assign([(row['queryID'], row['size']) for row in queries],
+                                     [(row['diskID'], row['free_space'], row['ram_total']) for row in disks])
+        used = {}
+        rows = []
+        for row in queries:
+            diskID = placement.get(row['queryID'])
+            if diskID is not None:
+                used[diskID] = used.get(diskID, 0) + row['size']
+                rows.append((diskID, row['queryID'], row['purpose'], row['size']))
+        # large pages, the statement triggers of DiskandQuery run once per page
+        conn.execute_values("INSERT INTO DiskandQuery(diskID, queryID, queryPurpose, querySize) VALUES %s", rows,
+                            page_size=20000)
+        conn.execute_values("UPDATE Disk SET free_space=free_space-V.used FROM (VALUES %s) AS V(diskID, used) "
+                            "WHERE Disk.diskID=V.diskID", list(used.items()))
+        conn.commit()
+    except DatabaseException.ConnectionInvalid as e:
+        conn.rollback()
+        return ReturnValue.ERROR, {}
+    except Exception as e:
+        conn.rollback()
+        return ReturnValue.ERROR, {}
+    finally:
+        _invalidateProfiles('disk', set(placement.values()))
+        conn.close()
+    return ReturnValue.OK, placement
+
+
+@_dispatch
 def addRAMToDisk(ramID: int, diskID: int) -> ReturnValue:
     conn = None
     try:
-        conn = Connector.DBConnector()
-        sql_query = sql.SQL(
-                            "INSERT INTO DiskandRam(diskID,ramID) "
-                            "VALUES({diskid}, {ramid})"). \
-            format(diskid=sql.Literal(diskID), ramid=sql.Literal(ramID))
-        rows_effected, _ = conn.execute(sql_query)
+        conn = Connector.DBConnector(pooled=True)
+        rows_effected, _ = conn.execute_prepared("addRAMToDisk", (diskID, ramID))
         conn.commit()
     except DatabaseException.FOREIGN_KEY_VIOLATION as e:
         return ReturnValue.NOT_EXISTS
@@ -415,14 +922,12 @@ def addRAMToDisk(ramID: int, diskID: int) -> ReturnValue:
     return ReturnValue.OK
 
 
+@_dispatch
 def removeRAMFromDisk(ramID: int, diskID: int) -> ReturnValue:
     conn = None
     try:
-        conn = Connector.DBConnector()
-        sql_query = sql.SQL(
-            "DELETE FROM DiskandRam WHERE diskID={diskid} AND ramID={ramid}"). \
-            format(diskid=sql.Literal(diskID), ramid=sql.Literal(ramID))
-        rows_effected, _ = conn.execute(sql_query)
+        conn = Connector.DBConnector(pooled=True)
+        rows_effected, _ = conn.execute_prepared("removeRAMFromDisk", (diskID, ramID))
         conn.commit()
         if rows_effected==0:
             return ReturnValue.NOT_EXISTS
@@ -434,13 +939,12 @@ def removeRAMFromDisk(ramID: int, diskID: int) -> ReturnValue:
         conn.close()
     return ReturnValue.OK
 
+@_dispatch
 def averageSizeQueriesOnDisk(diskID: int) -> float:
     conn= None
     try:
-        conn = Connector.DBConnector()
-        sql_query = sql.SQL("SELECT AVG(querySize) FROM DiskandQuery WHERE diskID={diskid}"). \
-        format(diskid=sql.Literal(diskID))
-        rows_effected, res = conn.execute(sql_query)
+        conn = Connector.DBConnector(pooled=True)
+        rows_effected, res = conn.execute_prepared("averageSizeQueriesOnDisk", (diskID,))
         conn.commit()
         if res[0]['AVG'] == None:
             return 0
@@ -453,13 +957,12 @@ def averageSizeQueriesOnDisk(diskID: int) -> float:
     return res[0]['AVG']
 
 
+@_dispatch
 def diskTotalRAM(diskID: int) -> int:
     conn = None
     try:
-        conn = Connector.DBConnector()
-        sql_query = sql.SQL("SELECT SUM(size) FROM Ram WHERE ramID IN (SELECT ramID from DiskandRam WHERE diskID={diskid})"). \
-            format(diskid=sql.Literal(diskID))
-        rows_effected, res = conn.execute(sql_query)
+        conn = Connector.DBConnector(pooled=True)
+        rows_effected, res = conn.execute_prepared("diskTotalRAM", (diskID,))
         conn.commit()
         if res[0]['SUM'] == None:
             return 0
@@ -472,14 +975,12 @@ def diskTotalRAM(diskID: int) -> int:
     return res[0]['SUM']
 
 
+@_dispatch
 def getCostForPurpose(purpose: str) -> int:
     conn = None
     try:
-        conn = Connector.DBConnector()
-        sql_query = sql.SQL(
-            "SELECT SUM(disk.cost * querysize) FROM disk INNER JOIN diskandquery ON(disk.diskid = diskandquery.diskid and diskandquery.querypurpose={purpose})"). \
-            format(purpose=sql.Literal(purpose))
-        rows_effected, res = conn.execute(sql_query)
+        conn = Connector.DBConnector(pooled=True)
+        rows_effected, res = conn.execute_prepared("getCostForPurpose", (purpose,))
         conn.commit()
         if res[0]['SUM'] == None:
             return 0
@@ -492,14 +993,35 @@ def getCostForPurpose(purpose: str) -> int:
     return res[0]['SUM']
 
 
+# purposes whose PurposeCost total differs from SUM(cost * querySize) recomputed from Disk and DiskandQuery,
+# mapped to (stored, actual). repair=True also overwrites the stored totals. None if the check failed
+@_dispatch
+def checkPurposeCosts(repair=False) -> dict:
+    conn = None
+    try:
+        conn = Connector.DBConnector(pooled=True)
+        rows_effected, res = conn.execute_prepared("checkPurposeCosts")
+        drift = {row['purpose']: (row['stored'], row['actual']) for row in res}
+        if repair and drift:
+            conn.execute_values("INSERT INTO PurposeCost(purpose, total) VALUES %s "
+                                "ON CONFLICT (purpose) DO UPDATE SET total=EXCLUDED.total",
+                                [(purpose, actual) for purpose, (_, actual) in drift.items()])
+        conn.commit()
+    except DatabaseException.ConnectionInvalid as e:
+        return None
+    except Exception as e:
+        return None
+    finally:
+        conn.close()
+    return drift
+
+
+@_dispatch
 def getQueriesCanBeAddedToDisk(diskID: int) -> List[int]:
     conn = None
-    list1=[]
     try:
-        conn = Connector.DBConnector()
-        sql_query = sql.SQL("SELECT queryID FROM Query WHERE size<=(SELECT free_space FROM Disk WHERE diskID={diskid}) ORDER BY queryID DESC LIMIT 5" ).\
-            format(diskid=sql.Literal(diskID))
-        rows_effected, res=conn.execute(sql_query)
+        conn = Connector.DBConnector(pooled=True)
+        rows_effected, res=conn.execute_prepared("getQueriesCanBeAddedToDisk", (diskID,))
         conn.commit()
     except DatabaseException.ConnectionInvalid as e:
         return []
@@ -507,23 +1029,40 @@ def getQueriesCanBeAddedToDisk(diskID: int) -> List[int]:
         return []
     finally:
         conn.close()
-    for index in range(res.size()):
-        list1.insert(index,res[index]['queryid'])
-    return list1
+    return res.column('queryid')
+
+
+# the top k of getQueriesCanBeAddedToDisk for every disk in one statement, in the order of diskIDs,
+# [] for a disk that does not exist
+@_dispatch
+def getQueriesCanBeAddedToDisks(diskIDs: List[int], k=5) -> List[List[int]]:
+    fitting = [[] for _ in diskIDs]
+    if len(diskIDs) == 0:
+        return fitting
+    conn = None
+    try:
+        conn = Connector.DBConnector(pooled=True)
+        rows_effected, res = conn.execute_prepared("getQueriesCanBeAddedToDisks", (list(diskIDs), k))
+        conn.commit()
+    except DatabaseException.ConnectionInvalid as e:
+        return fitting
+    except Exception as e:
+        return fitting
+    finally:
+        conn.close()
+    for row in res:
+        fitting[row['ord'] - 1].append(row['queryid'])
+    return fitting
 
 
 
 
+@_dispatch
 def getQueriesCanBeAddedToDiskAndRAM(diskID: int) -> List[int]:
     conn = None
-    list1=[]
     try:
-        conn = Connector.DBConnector()
-        sql_query = sql.SQL("SELECT queryID FROM Query WHERE size<=(SELECT free_space FROM Disk WHERE diskID={diskid}) "
-                            "and size<=(SELECT SUM(size) FROM Ram WHERE ramID IN (SELECT ramID from DiskandRam WHERE diskID={diskid}))"
-                            "ORDER BY queryID ASC LIMIT 5"). \
-            format(diskid=sql.Literal(diskID))
-        rows_effected, res = conn.execute(sql_query)
+        conn = Connector.DBConnector(pooled=True)
+        rows_effected, res = conn.execute_prepared("getQueriesCanBeAddedToDiskAndRAM", (diskID,))
         conn.commit()
     except DatabaseException.ConnectionInvalid as e:
         return []
@@ -531,19 +1070,15 @@ def getQueriesCanBeAddedToDiskAndRAM(diskID: int) -> List[int]:
         return []
     finally:
         conn.close()
-    for index in range(res.size()):
-        list1.insert(index, res[index]['queryid'])
-    return list1
+    return res.column('queryid')
 
 
+@_dispatch
 def isCompanyExclusive(diskID: int) -> bool:
     conn = None
     try:
-        conn = Connector.DBConnector()
-        sql_query = sql.SQL(
-            "SELECT company FROM Disk WHERE  diskID={diskid} and company=ALL(SELECT company from Ram WHERE ramID IN (SELECT ramID from DiskandRam WHERE diskID={diskid}))"). \
-            format(diskid=sql.Literal(diskID))
-        rows_effected, res = conn.execute(sql_query)
+        conn = Connector.DBConnector(pooled=True)
+        rows_effected, res = conn.execute_prepared("isCompanyExclusive", (diskID,))
         conn.commit()
         if rows_effected==0:
             return False
@@ -556,12 +1091,12 @@ def isCompanyExclusive(diskID: int) -> bool:
     return True
 
 
+@_dispatch
 def getConflictingDisks() -> List[int]:
     conn = None
-    list1=[]
     try:
-        conn = Connector.DBConnector()
-        rows_effected, res = conn.execute("SELECT DISTINCT a.diskid FROM diskandquery AS a INNER JOIN diskandquery AS b ON a.queryid=b.queryid and a.diskid<>b.diskid ORDER BY a.diskid ASC")
+        conn = Connector.DBConnector(pooled=True)
+        rows_effected, res = conn.execute_prepared("getConflictingDisks")
         conn.commit()
     except DatabaseException.ConnectionInvalid as e:
         return []
@@ -569,21 +1104,17 @@ def getConflictingDisks() -> List[int]:
         return []
     finally:
         conn.close()
-    for index in range(res.size()):
-        list1.insert(index, res[index]['diskid'])
-    return list1
+    return res.column('diskid')
 
 
 
 
+@_dispatch
 def mostAvailableDisks() -> List[int]:
     conn = None
-    list1=[]
     try:
-        conn = Connector.DBConnector()
-        rows_effected, res = conn.execute("SELECT C.did FROM (SELECT disk.diskid AS did ,query.queryid AS qid ,disk.speed AS ds  FROM Disk LEFT OUTER JOIN Query ON disk.free_space>=query.size) AS C "
-                                          "GROUP BY C.did,C.ds "
-                                          "ORDER BY COUNT(C.qid) DESC,C.ds DESC, C.did ASC LIMIT 5")
+        conn = Connector.DBConnector(pooled=True)
+        rows_effected, res = conn.execute_prepared("mostAvailableDisks")
         conn.commit()
     except DatabaseException.ConnectionInvalid as e:
         return []
@@ -591,30 +1122,15 @@ def mostAvailableDisks() -> List[int]:
         return []
     finally:
         conn.close()
-    for index in range(res.size()):
-        list1.insert(index,res[index]['did'])
-    return list1
+    return res.column('diskid')
 
 
+@_dispatch
 def getCloseQueries(queryID: int) -> List[int]:
     conn = None
-    list1=[]
-    try:
-        conn = Connector.DBConnector()
-        sql_query = sql.SQL("SELECT D.queryid"
-                            " FROM (SELECT count(a.queryid),b.queryid "
-                                    "FROM diskandquery AS a INNER JOIN diskandquery AS b ON a.diskid=b.diskid and a.queryid<>b.queryid "
-                                    "WHERE a.queryid={id} GROUP BY b.queryid) AS D"
-                            " WHERE D.count>=(SELECT COUNT(diskid)"
-                                            "FROM diskandquery"
-                                            " WHERE diskandquery.queryid={id})/(2*1.0) "
-                            " UNION "
-                            "SELECT queryID "
-                            "FROM Query "
-                            "WHERE queryID<>{id} and NOT EXISTS(SELECT queryID FROM DiskandQuery WHERE queryID={id}) "
-                            "ORDER BY queryid ASC LIMIT 10"). \
-            format(id=sql.Literal(queryID))
-        rows_effected, res = conn.execute(sql_query)
+    try:
+        conn = Connector.DBConnector(pooled=True)
+        rows_effected, res = conn.execute_prepared("getCloseQueries", (queryID,))
         conn.commit()
     except DatabaseException.ConnectionInvalid as e:
         return []
@@ -622,9 +1138,29 @@ def getCloseQueries(queryID: int) -> List[int]:
         return []
     finally:
         conn.close()
-    for index in range(res.size()):
-        list1.insert(index,res[index]['queryid'])
-    return list1
+    return res.column('queryid')
+
+
+# getCloseQueries for many queries in one statement, the lists are in the order of queryIDs
+@_dispatch
+def getCloseQueriesBatch(queryIDs: List[int]) -> List[List[int]]:
+    close = [[] for _ in queryIDs]
+    if len(queryIDs) == 0:
+        return close
+    conn = None
+    try:
+        conn = Connector.DBConnector(pooled=True)
+        rows_effected, res = conn.execute_prepared("getCloseQueriesBatch", (list(queryIDs),))
+        conn.commit()
+    except DatabaseException.ConnectionInvalid as e:
+        return close
+    except Exception as e:
+        return close
+    finally:
+        conn.close()
+    for row in res:
+        close[row['ord'] - 1].append(row['queryid'])
+    return close
 
 
 
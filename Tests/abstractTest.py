@@ -1,12 +1,45 @@
+import atexit
 import unittest
+from contextlib import ExitStack
 import Solution
+import Utility.DBConnector as Connector
+
+# whether the tables of Solution.py exist and are empty, see AbstractTest.rollback
+_schema = False
+
+
+# the tables are dropped once the tests ran, as they are after each test without rollback
+@atexit.register
+def _dropSchema():
+    if _schema:
+        Solution.dropTables()
 
 
 class AbstractTest(unittest.TestCase):
+    # the tables are created once and each test runs in a Connector.session() that is rolled back after it,
+    # instead of creating and dropping the tables around every test. The session has savepoints, so calls
+    # that fail do not abort the rest of the test. A test that needs its own transactions (sessions, other
+    # threads, the profile cache) or another backend sets rollback = False
+    rollback = True
+
     # before each test, setUp is executed
     def setUp(self) -> None:
-        Solution.createTables()
+        global _schema
+        if not self.rollback:
+            if _schema:
+                Solution.dropTables()
+                _schema = False
+            Solution.createTables()
+            return
+        if not _schema:
+            Solution.dropTables()
+            Solution.createTables()
+            _schema = True
+        stack = ExitStack()
+        stack.enter_context(Connector.session(savepoints=True)).discard()
+        self.addCleanup(stack.close)
 
     # after each test, tearDown is executed
     def tearDown(self) -> None:
-        Solution.dropTables()
+        if not self.rollback:
+            Solution.dropTables()
@@ -0,0 +1,56 @@
+'''
+    Runs test modules sharded over worker processes, like pytest-xdist: the tests are dealt round-robin to
+    the workers and every worker has its own schema (DATABASE_SCHEMA=gw0, gw1, ...), so they share one
+    database without seeing each other's tables.
+    run from the repository root: python -m Tests.parallel [-n WORKERS] [module ...]
+    without modules every *Test.py of the repository root is run
+'''
+import argparse
+import glob
+import os
+import subprocess
+import sys
+import time
+import unittest
+import Utility.DBConnector as Connector
+
+
+# ids of the tests of modules, in the order unittest runs them
+def testIds(modules) -> list:
+    def flatten(suite):
+        for test in suite:
+            if isinstance(test, unittest.TestSuite):
+                yield from flatten(test)
+            else:
+                yield test.id()
+    return list(flatten(unittest.TestLoader().loadTestsFromNames(modules)))
+
+
+def run(workers: int, modules) -> bool:
+    tests = testIds(modules)
+    shards = [tests[worker::workers] for worker in range(workers) if len(tests[worker::workers]) > 0]
+    start = time.perf_counter()
+    processes = []
+    for worker, shard in enumerate(shards):
+        environment = dict(os.environ)
+        environment[Connector.SCHEMA_ENV_VAR] = "gw%d" % worker
+        processes.append(subprocess.Popen([sys.executable, "-m", "unittest"] + shard, env=environment,
+                                          stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True))
+    passed = True
+    for worker, process in enumerate(processes):
+        output, _ = process.communicate()
+        passed = passed and process.returncode == 0
+        print("gw%d, %d tests, exit code %d" % (worker, len(shards[worker]), process.returncode))
+        if process.returncode != 0:
+            print(output)
+    print("%d tests on %d workers in %.2f s" % (len(tests), len(shards), time.perf_counter() - start))
+    return passed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=os.cpu_count(), help="number of workers")
+    parser.add_argument("modules", nargs="*")
+    args = parser.parse_args()
+    modules = args.modules or sorted(os.path.basename(path)[:-3] for path in glob.glob("*Test.py"))
+    sys.exit(0 if run(max(1, args.n), modules) else 1)
@@ -0,0 +1,78 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+# thread-safe LRU cache with a bounded size and a time to live for every entry.
+# put() takes the stamp() read before the value was loaded and drops the value if anything was
+# invalidated in the meantime, so a slow reader cannot put back a value a writer just invalidated
+class LRUCache:
+    # constructor
+    def __init__(self, max_size=1024, ttl=60.0):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.__entries = OrderedDict()
+        self.__stamp = 0
+        self.__lock = threading.Lock()
+
+    # the cached value, or None on a miss
+    def get(self, key):
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires, value = entry
+            if expires is not None and expires <= time.monotonic():
+                del self.__entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    # current invalidation stamp, read it before loading a value to put()
+    def stamp(self):
+        with self.__lock:
+            return self.__stamp
+
+    # cache a value loaded after stamp was read, the least recently used entry is evicted when full
+    def put(self, key, value, stamp):
+        with self.__lock:
+            if stamp != self.__stamp:
+                return
+            self.__entries[key] = (None if self.ttl is None else time.monotonic() + self.ttl, value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_size:
+                self.__entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self.__lock:
+            self.__stamp += 1
+            self.invalidations += 1
+            self.__entries.pop(key, None)
+
+    def clear(self):
+        with self.__lock:
+            self.__stamp += 1
+            self.__entries.clear()
+
+    def size(self):
+        with self.__lock:
+            return len(self.__entries)
+
+    # counters for sizing the cache
+    def stats(self) -> dict:
+        with self.__lock:
+            return {'size': len(self.__entries), 'max_size': self.max_size, 'hits': self.hits,
+                    'misses': self.misses, 'evictions': self.evictions, 'expirations': self.expirations,
+                    'invalidations': self.invalidations}
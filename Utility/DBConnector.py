@@ -1,10 +1,70 @@
 import psycopg2
-from psycopg2 import errors, sql
+from psycopg2 import errors, extras, sql
 from configparser import ConfigParser
 from Utility.Exceptions import DatabaseException
+import itertools
 import os
+import threading
+import time
+from collections.abc import Mapping
+from contextlib import contextmanager
 from typing import Union
 
+try:
+    import numpy
+except ImportError:  # numpy is optional, it is only needed by the columnar export
+    numpy = None
+
+
+# numpy dtype for a column, chosen from the postgres type oid in cursor.description
+_NUMPY_TYPES = {16: 'bool', 20: 'int64', 21: 'int16', 23: 'int32', 26: 'uint32',
+                700: 'float32', 701: 'float64', 1700: 'float64'}
+
+
+# one batch of a column. A batch with NULLs cannot keep the column's dtype: numbers become float64 with
+# nan (so int64 values above 2^53 lose precision), bools stay python objects with None. Without NULLs
+# integers are exact. A column whose batches differ is concatenated to the common dtype
+def _numpyColumn(values, type_code):
+    dtype = _NUMPY_TYPES.get(type_code, 'object')
+    if dtype != 'object' and any(val is None for val in values):
+        if dtype != 'bool':
+            return numpy.array([numpy.nan if val is None else val for val in values], dtype='float64')
+        dtype = 'object'
+    if dtype == 'object':
+        column = numpy.empty(len(values), dtype=object)
+        column[:] = values
+        return column
+    return numpy.fromiter(values, dtype=dtype, count=len(values))
+
+
+# per-column numpy arrays built from batches of row tuples, only one batch is transposed at a time
+def _numpyColumns(cols_header, types, batches) -> dict:
+    if numpy is None:
+        raise ImportError("numpy is required for the columnar export of a ResultSet")
+    chunks = [[] for _ in cols_header]
+    for batch in batches:
+        if len(batch) == 0:
+            continue
+        for index, values in enumerate(zip(*batch)):
+            chunks[index].append(_numpyColumn(values, types[index]))
+    columns = {}
+    for index, col in enumerate(cols_header):
+        if len(chunks[index]) == 0:
+            columns[col] = numpy.empty(0, dtype=_NUMPY_TYPES.get(types[index], 'object'))
+        elif len(chunks[index]) == 1:
+            columns[col] = chunks[index][0]
+        else:
+            columns[col] = numpy.concatenate(chunks[index])
+    return columns
+
+
+def _structuredArray(columns: dict):
+    size = len(next(iter(columns.values()))) if columns else 0
+    array = numpy.empty(size, dtype=[(col, values.dtype) for col, values in columns.items()])
+    for col, values in columns.items():
+        array[col] = values
+    return array
+
 
 class ResultSetDict(dict):
     def __getitem__(self, item):
@@ -13,17 +73,49 @@ class ResultSetDict(dict):
         return super().__getitem__(item.lower())
 
 
+# read-only view of one row, column names are resolved through the ResultSet's cols index map
+# so no per-row dict is built
+class ResultSetRow(Mapping):
+    __slots__ = ('__values', '__cols')
+
+    def __init__(self, values, cols: ResultSetDict):
+        self.__values = values
+        self.__cols = cols
+
+    def __getitem__(self, item):
+        if type(item) is not str:
+            return None
+        return self.__values[self.__cols[item]]
+
+    def __contains__(self, item):
+        return type(item) is str and item.lower() in self.__cols
+
+    def __iter__(self):
+        return iter(self.__cols)
+
+    def __len__(self):
+        return len(self.__cols)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
 class ResultSet:
     # constructor
     def __init__(self, description=None, results=None):
         self.rows = []
         self.cols_header = []
+        self.types = []
         self.cols = ResultSetDict()
         self.__fromQuery(description, results)
 
     def __getitem__(self, row):
         return self.__getRow(row)
 
+    def __iter__(self):
+        for row in range(len(self.rows)):
+            yield self.__getRow(row)
+
     # so you can use print(ResultSet)
     def __str__(self):
         string = ""
@@ -44,81 +136,732 @@ class ResultSet:
     def isEmpty(self):
         return self.size() == 0
 
+    # all the values of one column, in row order
+    def column(self, col: str) -> list:
+        if len(self.rows) == 0:
+            return []
+        index = self.cols[col]
+        return [row[index] for row in self.rows]
+
+    # column name -> numpy array, dtypes follow the column types (requires numpy)
+    def toNumpy(self) -> dict:
+        return _numpyColumns(self.cols_header, self.types, [self.rows])
+
+    # the rows as one numpy structured array with a field per column (requires numpy)
+    def toStructuredArray(self):
+        return _structuredArray(self.toNumpy())
+
     def __getRow(self, row: int):
         if len(self.rows) <= row:
             print('Invalid row ' + str(row))
             return ResultSetDict()
-        row_to_return = ResultSetDict()
-        for val, col in zip(self.rows[row], self.cols_header):
-            row_to_return[col] = val
-        return row_to_return
+        return ResultSetRow(self.rows[row], self.cols)
 
     def __fromQuery(self, description, results: list):
         if results is None or len(results) == 0:  # no results
             self.cols = ResultSetDict()
         else:
-            self.rows = results.copy()
+            # fetchall() already returns a fresh list, so it is kept instead of copied
+            self.rows = results if isinstance(results, list) else list(results)
             self.cols_header = [d.name for d in description]
+            self.types = [d.type_code for d in description]
             self.cols = ResultSetDict()
             for col, index in zip(self.cols_header, range(len(results[0]))):
                 self.cols[col] = index
 
 
-class DBConnector:
+# translate constraint violations raised by psycopg2 into DatabaseException
+@contextmanager
+def _constraintErrors():
+    try:
+        yield
+    except errors.lookup("23502"):
+        raise DatabaseException.NOT_NULL_VIOLATION("NOT_NULL_VIOLATION")
+    except errors.lookup("23503"):
+        raise DatabaseException.FOREIGN_KEY_VIOLATION("FOREIGN_KEY_VIOLATION")
+    except errors.lookup("23505"):
+        raise DatabaseException.UNIQUE_VIOLATION("UNIQUE_VIOLATION")
+    except errors.lookup("23514"):
+        raise DatabaseException.CHECK_VIOLATION("CHECK_VIOLATION")
+
+
+# rows fetched for each round trip of a StreamingResultSet
+DEFAULT_FETCH_SIZE = 2000
+
+_cursor_names = itertools.count(1)
+
+
+# ResultSet backed by a named server-side cursor, rows are fetched fetch_size at a time while iterating.
+# only one pass over the rows is possible. the cursor lives in the current transaction,
+# so consume the rows before commit()/rollback()/close()
+class StreamingResultSet:
     # constructor
-    def __init__(self):
+    def __init__(self, connection, query, params=None, fetch_size=DEFAULT_FETCH_SIZE):
+        self.cols_header = []
+        self.types = []
+        self.cols = ResultSetDict()
+        self.fetch_size = fetch_size
+        self.__connection = connection
+        self.__name = "stream_" + str(next(_cursor_names))
+        self.__cursor = connection.cursor(self.__name, scrollable=True)
+        self.__cursor.execute(query, params)
+        self.__buffer = []
+        self.__position = 0
+        self.__fetched = 0
+        self.__size = None
+        self.__done = False
+        self.__fetch()
+
+    def __iter__(self):
+        while True:
+            while self.__position < len(self.__buffer):
+                row = self.__buffer[self.__position]
+                self.__position += 1
+                yield ResultSetRow(row, self.cols)
+            if self.__done:
+                return
+            self.__fetch()
+
+    # the remaining rows as column name -> numpy array, built batch by batch straight from the
+    # cursor buffer without collecting the rows in a list. consumes the StreamingResultSet (requires numpy)
+    def toNumpy(self) -> dict:
+        return _numpyColumns(self.cols_header, self.types, self.__batches())
+
+    # the remaining rows as one numpy structured array, consumes the StreamingResultSet (requires numpy)
+    def toStructuredArray(self):
+        return _structuredArray(self.toNumpy())
+
+    def __batches(self):
+        while True:
+            batch = self.__buffer[self.__position:] if self.__position else self.__buffer
+            self.__buffer = []
+            self.__position = 0
+            yield batch
+            if self.__done:
+                return
+            self.__fetch()
+
+    # all the remaining values of one column, consumes the StreamingResultSet
+    def column(self, col: str) -> list:
+        values = []
+        for row in self:
+            values.append(row[col])
+        return values
+
+    # is the StreamingResultSet empty? answered from the first batch
+    def isEmpty(self):
+        return self.__fetched == 0
+
+    # what is the size of the StreamingResultSet? counted on the server with MOVE, no rows are transferred
+    def size(self):
+        if self.__size is None:
+            if self.__done:
+                self.__size = self.__fetched
+            else:
+                name = sql.Identifier(self.__name)
+                with self.__connection.cursor() as cursor:
+                    cursor.execute(sql.SQL("MOVE FORWARD ALL IN {}").format(name))
+                    remaining = cursor.rowcount
+                    cursor.execute(sql.SQL("MOVE ABSOLUTE {} IN {}").format(sql.Literal(self.__fetched), name))
+                self.__size = self.__fetched + remaining
+        return self.__size
+
+    # close the server-side cursor, remaining rows are discarded
+    def close(self):
+        self.__done = True
+        self.__buffer = []
+        self.__closeCursor()
+
+    def __closeCursor(self):
+        if not self.__cursor.closed and not self.__connection.closed:
+            try:
+                self.__cursor.close()
+            except psycopg2.Error:
+                pass
+
+    def __fetch(self):
+        rows = self.__cursor.fetchmany(self.fetch_size)
+        if not self.cols_header and self.__cursor.description is not None:
+            self.cols_header = [d.name for d in self.__cursor.description]
+            self.types = [d.type_code for d in self.__cursor.description]
+            for index, col in enumerate(self.cols_header):
+                self.cols[col] = index
+        self.__fetched += len(rows)
+        self.__buffer = rows
+        self.__position = 0
+        if len(rows) < self.fetch_size:
+            self.__done = True
+            self.__closeCursor()
+
+
+# a warm connection kept by the ConnectionPool
+class PooledConnection:
+    def __init__(self, connection):
+        self.connection = connection
+        self.last_used = time.monotonic()
+        # prepared statements that exist on this connection, name -> SQL text
+        self.prepared = {}
+
+    def idle_time(self):
+        return time.monotonic() - self.last_used
+
+
+# bounded, thread-safe pool of warm connections.
+# idle connections are handed out LIFO, checked with SELECT 1 when they have been idle for longer
+# than health_check_interval, and closed once they have been idle for longer than max_idle
+class ConnectionPool:
+    # constructor
+    def __init__(self, connect, max_size=10, max_idle=300.0, health_check_interval=30.0, timeout=30.0):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.__connect = connect
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.health_check_interval = health_check_interval
+        self.timeout = timeout
+        self.__idle = []
+        self.__size = 0
+        self.__closed = False
+        self.__lock = threading.Condition()
+
+    # number of open connections, checked out or idle
+    def size(self):
+        with self.__lock:
+            return self.__size
+
+    # number of idle connections waiting in the pool
+    def idle(self):
+        with self.__lock:
+            return len(self.__idle)
+
+    # get a healthy connection, opening a new one if the pool is not full.
+    # waits up to timeout seconds for a connection to be returned when the pool is full
+    def checkout(self) -> PooledConnection:
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self.__lock:
+                if self.__closed:
+                    raise DatabaseException.ConnectionInvalid("Connection pool is closed")
+                self.__evict_idle()
+                entry = self.__idle.pop() if self.__idle else None
+                if entry is None:
+                    if self.__size < self.max_size:
+                        self.__size += 1
+                    else:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0 or not self.__lock.wait(remaining):
+                            raise DatabaseException.ConnectionInvalid("Timed out waiting for a pooled connection")
+                        continue
+            # connecting and health checks are done outside the lock
+            if entry is None:
+                try:
+                    return PooledConnection(self.__connect())
+                except Exception:
+                    self.__forget()
+                    raise
+            if self.__healthy(entry):
+                return entry
+            self.__discard(entry)
+
+    # return a connection to the pool, rolling back anything left open
+    def checkin(self, entry: PooledConnection, discard=False):
+        if not discard:
+            discard = not self.__reset(entry)
+        if discard:
+            self.__discard(entry)
+            return
+        entry.last_used = time.monotonic()
+        with self.__lock:
+            if self.__closed:
+                self.__size -= 1
+                entry.connection.close()
+            else:
+                self.__idle.append(entry)
+            self.__lock.notify()
+
+    # close every idle connection, connections still checked out are closed when returned
+    def close(self):
+        with self.__lock:
+            self.__closed = True
+            idle, self.__idle = self.__idle, []
+            self.__size -= len(idle)
+            self.__lock.notify_all()
+        for entry in idle:
+            entry.connection.close()
+
+    def __healthy(self, entry: PooledConnection) -> bool:
+        if entry.connection.closed:
+            return False
+        if entry.idle_time() < self.health_check_interval:
+            return True
+        try:
+            with entry.connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            entry.connection.rollback()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def __reset(entry: PooledConnection) -> bool:
+        if entry.connection.closed:
+            return False
+        try:
+            # psycopg2 keeps its own transaction state, which goes stale when a query string ends with COMMIT
+            if entry.connection.status != psycopg2.extensions.STATUS_READY or \
+                    entry.connection.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                entry.connection.rollback()
+            return True
+        except Exception:
+            return False
+
+    # must be called while holding the lock
+    def __evict_idle(self):
+        if self.max_idle is None:
+            return
+        keep = []
+        for entry in self.__idle:
+            if entry.idle_time() > self.max_idle:
+                self.__size -= 1
+                entry.connection.close()
+            else:
+                keep.append(entry)
+        self.__idle = keep
+
+    def __discard(self, entry: PooledConnection):
         try:
-            # Obtain the configuration parameters
-            params = DBConnector.__config()
-            self.connection = psycopg2.connect(**params)
-            self.connection.autocommit = False
+            entry.connection.close()
+        except Exception:
+            pass
+        self.__forget()
+
+    def __forget(self):
+        with self.__lock:
+            self.__size -= 1
+            self.__lock.notify()
+
+
+# environment variable that overrides where database.ini is looked up
+CONFIG_ENV_VAR = "DATABASE_INI"
+
+_config = {}
+_config_path = None
+_config_override = None
+_config_lock = threading.Lock()
+
+
+# places database.ini is looked for, in order: explicit path, $DATABASE_INI,
+# Utility/ under the working directory, Utility/ under its parent, and next to this module
+def _configCandidates(filename=None):
+    if filename is None:
+        filename = _config_override
+    if filename is not None:
+        return [filename]
+    if os.environ.get(CONFIG_ENV_VAR):
+        return [os.environ[CONFIG_ENV_VAR]]
+    return [os.path.join(os.getcwd(), "Utility", "database.ini"),
+            os.path.join(os.path.dirname(os.getcwd()), "Utility", "database.ini"),
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), "database.ini")]
+
+
+def _readConfig(filename, section):
+    # create a parser
+    parser = ConfigParser()
+    # read config file, a missing file is simply not read
+    parser.read(filename)
+    if not parser.has_section(section):
+        return None
+    return {key: value for key, value in parser.items(section)}
+
+
+# grant credentials. the file is resolved and parsed once per process and the parameters are cached,
+# pass filename to load a specific file instead, it is used by later calls until reloadConfig()
+def loadConfig(filename=None, section='postgresql') -> dict:
+    global _config, _config_path, _config_override
+    with _config_lock:
+        if filename is not None:
+            _config_override = filename
+            _config = {}
+        if section not in _config:
+            for candidate in _configCandidates(filename):
+                db = _readConfig(candidate, section)
+                if db is not None:
+                    _config[section], _config_path = db, candidate
+                    break
+            else:
+                raise DatabaseException.database_ini_ERROR("Please modify database.ini file under Utility")
+        return dict(_config[section])
+
+
+# path of the file the cached configuration was read from, None before the first load
+def configPath():
+    return _config_path
+
+
+# drop the cached configuration and read it again. the shared pool is closed so that
+# new connections use the new parameters. Without filename a file passed before is forgotten and
+# database.ini is looked up again ($DATABASE_INI, then the default places)
+def reloadConfig(filename=None, section='postgresql') -> dict:
+    global _config, _config_override
+    with _config_lock:
+        _config = {}
+        _config_override = None
+    closePool()
+    return loadConfig(filename, section)
+
+
+# server-side prepared statements, name -> SQL text with $1, $2, ... placeholders
+_statements = {}
+_statements_lock = threading.Lock()
+
+
+# register a statement for DBConnector.execute_prepared
+def prepare(name: str, query: str):
+    if not name.isidentifier():
+        raise ValueError("Invalid prepared statement name " + name)
+    with _statements_lock:
+        _statements[name] = query
+
+
+# the SQL text of a statement registered with prepare(), None if there is none
+def statement(name: str):
+    with _statements_lock:
+        return _statements.get(name)
+
+
+# what DBConnector(pooled) returns instead of a PostgreSQL connection when set, see setEngine
+_engine = None
+
+
+# run every DBConnector on another engine: engine(pooled) returns an object with the methods of DBConnector,
+# e.g. Utility.SQLiteConnector.SQLiteConnector (see useSQLite there). None goes back to PostgreSQL
+def setEngine(engine=None):
+    global _engine
+    _engine = engine
+
+
+# environment variables that choose the schema of the tables, in order: $DATABASE_SCHEMA, then the worker
+# id pytest-xdist sets in every worker process ($PYTEST_XDIST_WORKER, e.g. gw0)
+SCHEMA_ENV_VAR = "DATABASE_SCHEMA"
+WORKER_ENV_VAR = "PYTEST_XDIST_WORKER"
+
+_schema = None
+
+
+# the schema every connection puts first in its search_path, None for the default (public). Processes
+# with different schemas can create, fill and drop the same unqualified tables concurrently in one database
+def schema():
+    name = _schema or os.environ.get(SCHEMA_ENV_VAR) or os.environ.get(WORKER_ENV_VAR)
+    if name is not None and not name.isidentifier():
+        raise ValueError("Invalid schema name " + name)
+    return name.lower() if name else None
+
+
+# use the tables of schema name, None goes back to $DATABASE_SCHEMA/$PYTEST_XDIST_WORKER or public.
+# the shared pool is closed so that new connections use the new search_path
+def setSchema(name=None):
+    global _schema
+    if name is not None and not name.isidentifier():
+        raise ValueError("Invalid schema name " + name)
+    _schema = name
+    closePool()
+
+
+_pool = None
+_pool_settings = {}
+_pool_lock = threading.Lock()
+
+
+# change the settings of the shared pool, the current pool is closed and rebuilt on next use
+def configurePool(**settings):
+    global _pool, _pool_settings
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+        _pool = None
+        _pool_settings = settings
+
+
+# the shared pool used by DBConnector(pooled=True)
+def getPool() -> ConnectionPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(DBConnector.connect, **_pool_settings)
+        return _pool
+
+
+# close the shared pool, e.g. at process exit
+def closePool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+        _pool = None
+
+
+# the Session open on each thread, see session()
+_sessions = threading.local()
+
+
+# the Session the current thread runs in, None outside of session()
+def currentSession():
+    return getattr(_sessions, 'current', None)
+
+
+# unit of work: every DBConnector(pooled=True) created on this thread inside the with block shares one
+# pooled connection and one transaction, committed once when the block exits and rolled back if it
+# raises. A nested session() joins the open one. Callbacks registered with onEnd() run after the
+# transaction ended either way. A session that was discard()ed is rolled back when the block exits,
+# e.g. to undo a test.
+# By default a failed call (even ALREADY_EXISTS) rolls the whole session back: the calls after it return
+# ERROR and the with block raises ConnectionInvalid. With savepoints=True the statements of each
+# DBConnector since its last commit() run in a savepoint, so its rollback()/close() only undo its own
+# statements and a failed call does not abort the others. Every savepoint is a subtransaction though,
+# and postgres gets slower at updating a row that many subtransactions of the same transaction updated
+# before, as the DiskStats and PurposeCost triggers do for every call: past a few hundred calls such a
+# session is slower than calling the functions outside of it (see Benchmarks/Session.py)
+@contextmanager
+def session(savepoints=False):
+    active = currentSession()
+    if active is not None:
+        yield active
+        return
+    active = Session(getPool(), savepoints)
+    _sessions.current = active
+    try:
+        yield active
+    except BaseException:
+        _sessions.current = None
+        active.end(commit=False)
+        raise
+    _sessions.current = None
+    if active.discarded:
+        active.end(commit=False)
+        return
+    if active.failed or active.connection.info.transaction_status == psycopg2.extensions.TRANSACTION_STATUS_INERROR:
+        active.end(commit=False)
+        raise DatabaseException.ConnectionInvalid("Session was rolled back")
+    active.end(commit=True)
+
+
+class Session:
+    # constructor, checks out the connection the session's DBConnectors share
+    def __init__(self, pool: ConnectionPool, savepoints=False):
+        self.__pool = pool
+        self.__entry = pool.checkout()
+        self.__savepoints = itertools.count() if savepoints else None
+        self.__callbacks = []
+        self.savepoints = savepoints
+        self.failed = False
+        self.discarded = False
+        self.connection = self.__entry.connection
+        self.prepared = self.__entry.prepared
+
+    # open a new savepoint and return its name, None if the session runs without savepoints or failed
+    def savepoint(self) -> str:
+        if self.failed or self.__savepoints is None:
+            return None
+        name = "session_" + str(next(self.__savepoints))
+        with self.connection.cursor() as cursor:
+            cursor.execute("SAVEPOINT " + name)
+        return name
+
+    # undo everything the session did so far, only used without savepoints
+    def fail(self):
+        self.failed = True
+        self.connection.rollback()
+
+    # roll the whole session back when its with block exits, instead of committing it
+    def discard(self):
+        self.discarded = True
+
+    # run callback once the session's transaction is committed or rolled back
+    def onEnd(self, callback):
+        self.__callbacks.append(callback)
+
+    def end(self, commit: bool):
+        try:
+            if commit:
+                self.connection.commit()
+            else:
+                self.connection.rollback()
+        except Exception:
+            raise DatabaseException.ConnectionInvalid("Could not " + ("commit" if commit else "rollback") +
+                                                      " changes")
+        finally:
+            self.__pool.checkin(self.__entry)
+            self.__entry = None
+            self.connection = None
+            callbacks, self.__callbacks = self.__callbacks, []
+            for callback in callbacks:
+                callback()
+
+
+class DBConnector:
+    def __new__(cls, pooled=False):
+        if _engine is not None:
+            return _engine(pooled)
+        return super().__new__(cls)
+
+    # constructor, pass pooled=True to borrow a warm connection from the shared pool.
+    # inside session() the connection of the session is used instead, see Session
+    def __init__(self, pooled=False):
+        self.__pool = getPool() if pooled else None
+        self.__entry = None
+        self.__prepared = {}
+        self.__streams = []
+        self.__session = currentSession() if pooled else None
+        self.__savepoint = None
+        try:
+            if self.__session is not None:
+                self.connection = self.__session.connection
+                self.__prepared = self.__session.prepared
+            elif pooled:
+                self.__entry = self.__pool.checkout()
+                self.connection = self.__entry.connection
+                self.__prepared = self.__entry.prepared
+            else:
+                self.connection = DBConnector.connect()
             self.cursor = self.connection.cursor()
         except Exception as e:
+            if self.__entry is not None:
+                self.__pool.checkin(self.__entry, discard=True)
+                self.__entry = None
             self.connection = None
             self.cursor = None
             raise DatabaseException.ConnectionInvalid("Could not connect to database")
 
-    # close connection
+    # open a new psycopg2 connection
+    @staticmethod
+    def connect():
+        # Obtain the configuration parameters
+        params = loadConfig()
+        name = schema()
+        if name is not None:
+            params['options'] = (params.get('options', '') + " -c search_path=" + name).strip()
+        connection = psycopg2.connect(**params)
+        connection.autocommit = False
+        return connection
+
+    # close connection, a pooled connection is returned to the pool instead
     def close(self):
+        for stream in self.__streams:
+            stream.close()
+        self.__streams = []
         if self.cursor is not None:
             self.cursor.close()
-        if self.connection is not None:
+            self.cursor = None
+        if self.__savepoint is not None:
+            # whatever was not committed is undone, the session's transaction goes on
+            try:
+                with self.connection.cursor() as cursor:
+                    cursor.execute("ROLLBACK TO SAVEPOINT " + self.__savepoint + ";"
+                                   "RELEASE SAVEPOINT " + self.__savepoint)
+            except Exception:
+                pass
+            self.__savepoint = None
+        elif self.__entry is not None:
+            self.__pool.checkin(self.__entry)
+            self.__entry = None
+        elif self.connection is not None and self.__session is None:
             self.connection.close()
+        self.connection = None
 
-    # commit connection's changes
+    # commit connection's changes, inside a session they are kept in the session's transaction
     def commit(self):
         if self.connection is not None:
             try:
-                self.connection.commit()
+                if self.__savepoint is not None:
+                    self.cursor.execute("RELEASE SAVEPOINT " + self.__savepoint)
+                    self.__savepoint = None
+                elif self.__session is None:
+                    self.connection.commit()
             except Exception:
                 raise DatabaseException.ConnectionInvalid("Could not commit changes")
 
-    # rollback connection's changes
+    # rollback connection's changes, inside a session only the ones since the last commit(), or the whole
+    # session if it runs without savepoints
     def rollback(self):
         if self.connection is not None:
             try:
-                self.connection.rollback()
+                if self.__savepoint is not None:
+                    self.cursor.execute("ROLLBACK TO SAVEPOINT " + self.__savepoint + ";"
+                                        "RELEASE SAVEPOINT " + self.__savepoint)
+                    self.__savepoint = None
+                elif self.__session is not None:
+                    if not self.__session.savepoints:
+                        self.__session.fail()
+                else:
+                    self.connection.rollback()
             except Exception:
                 raise DatabaseException.ConnectionInvalid("Could not rollback changes")
 
     # executes the query, if it is SELECT you may ask to print the results with printSchema
     # returns the number of rows effected and a ResultSet (for SELECT)
     def execute(self, query: Union[str, sql.Composed], printSchema=False) -> (int, ResultSet):
+        return self.__run(query, None, printSchema)
+
+    # executes a statement registered with prepare(). the statement is PREPAREd the first time it is
+    # used on this connection (once per pooled connection) and then run with EXECUTE and bound params
+    def execute_prepared(self, name: str, params=(), printSchema=False) -> (int, ResultSet):
+        self.__check()
+        query = _statements.get(name)
+        if query is None:
+            raise DatabaseException.UNKNOWN_ERROR("Unknown prepared statement " + name)
+        if self.__prepared.get(name) != query:
+            if name in self.__prepared:
+                self.__run("DEALLOCATE " + name, None, False)
+                del self.__prepared[name]
+            self.__run("PREPARE " + name + " AS " + query, None, False)
+            self.__prepared[name] = query
+        if len(params) == 0:
+            return self.__run("EXECUTE " + name, None, printSchema)
+        return self.__run("EXECUTE " + name + "(" + ", ".join(["%s"] * len(params)) + ")", params, printSchema)
+
+    # executes an INSERT ... VALUES %s with a multi-row VALUES list per page_size rows
+    # (psycopg2.extras.execute_values). returns the number of rows sent, or with fetch=True
+    # the number of rows and a ResultSet of what the statement RETURNING
+    def execute_values(self, query: Union[str, sql.Composed], rows, page_size=1000,
+                       fetch=False) -> (int, ResultSet):
+        self.__check()
+        if len(rows) == 0:
+            return 0, ResultSet()
+        with _constraintErrors():
+            results = extras.execute_values(self.cursor, query, rows, page_size=page_size, fetch=fetch)
+        if fetch:
+            return len(results), ResultSet(self.cursor.description, results)
+        return len(rows), ResultSet()
+
+    # executes a SELECT through a server-side cursor and returns a StreamingResultSet that fetches
+    # fetch_size rows per round trip instead of materializing the whole result
+    def execute_stream(self, query: Union[str, sql.Composed], params=None,
+                       fetch_size=DEFAULT_FETCH_SIZE) -> StreamingResultSet:
+        self.__check()
+        stream = StreamingResultSet(self.connection, query, params, fetch_size)
+        self.__streams.append(stream)
+        return stream
+
+    # a session that failed without savepoints runs nothing more, its calls fail with ConnectionInvalid
+    # and so return ERROR
+    # inside a session with savepoints, the statements since the last commit()/rollback() run in a
+    # savepoint opened by the first of them
+    def __check(self):
         if self.connection is None:
             raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        if self.__session is not None:
+            if self.__session.failed:
+                raise DatabaseException.ConnectionInvalid("Session was rolled back")
+            if self.__savepoint is None:
+                self.__savepoint = self.__session.savepoint()
+
+    def __run(self, query, params, printSchema) -> (int, ResultSet):
+        self.__check()
 
         # try execute the query
-        try:
-            self.cursor.execute(query)
+        with _constraintErrors():
+            self.cursor.execute(query, params)
             row_effected = max(self.cursor.rowcount, 0)
-        except errors.lookup("23502"):
-            raise DatabaseException.NOT_NULL_VIOLATION("NOT_NULL_VIOLATION")
-        except errors.lookup("23503"):
-            raise DatabaseException.FOREIGN_KEY_VIOLATION("FOREIGN_KEY_VIOLATION")
-        except errors.lookup("23505"):
-            raise DatabaseException.UNIQUE_VIOLATION("UNIQUE_VIOLATION")
-        except errors.lookup("23514"):
-            raise DatabaseException.CHECK_VIOLATION("CHECK_VIOLATION")
 
         # get entries in case of SELECT
         if self.cursor.description is not None:
@@ -131,26 +874,3 @@ class DBConnector:
             print(entries)
 
         return row_effected, entries
-
-    # grant credentials
-    @staticmethod
-    def __config(filename=os.path.join(os.path.join(os.getcwd(), "Utility"), 'database.ini'),
-                 section='postgresql'):
-        # create a parser
-        parser = ConfigParser()
-        # read config file
-        parser.read(filename)
-
-        # get section
-        db = {}
-        if parser.has_section(section):
-            params = parser.items(section)
-            for param in params:
-                db[param[0]] = param[1]
-        else:
-            # file not found
-            db = DBConnector.__config(
-                filename=os.path.join(os.path.join(os.path.dirname(os.getcwd()), 'Utility'), 'database.ini'))
-            if db is None:
-                raise DatabaseException.database_ini_ERROR("Please modify database.ini file under Utility")
-        return db
@@ -0,0 +1,523 @@
+import bisect
+import functools
+import threading
+from typing import List, Dict, Tuple
+import Utility.Placement as Placement
+from Utility.ReturnValue import ReturnValue
+from Utility.Exceptions import DatabaseException
+from Business.Query import Query
+from Business.RAM import RAM
+from Business.Disk import Disk
+
+
+# column checks of the tables of createTables, every column is NOT NULL: an INTEGER column is checked
+# against its minimum value (the CHECK constraint, or the smallest INTEGER), a TEXT column is marked _TEXT
+_TEXT = None
+_INTEGER_MIN = -2 ** 31
+_QUERY_COLUMNS = (1, _TEXT, 0)
+_DISK_COLUMNS = (1, _TEXT, 1, 0, 1)
+_RAM_COLUMNS = (1, _TEXT, 1)
+_DISK_QUERY_COLUMNS = (_INTEGER_MIN, _INTEGER_MIN, _TEXT, _INTEGER_MIN)
+_DISK_RAM_COLUMNS = (_INTEGER_MIN, _INTEGER_MIN)
+
+
+# the value of an INTEGER column, None is NULL
+def _integer(value):
+    if value is not None and (type(value) is not int or not _INTEGER_MIN <= value < 2 ** 31):
+        raise DatabaseException.UNKNOWN_ERROR("invalid input for type integer: " + repr(value))
+    return value
+
+
+# the value of a BIGINT parameter, the type Solution.py looks IDs up with: None is NULL and matches nothing,
+# an ID outside the INTEGER range matches no row
+def _bigint(value):
+    if value is not None and (type(value) is not int or not -2 ** 63 <= value < 2 ** 63):
+        raise DatabaseException.UNKNOWN_ERROR("invalid input for type bigint: " + repr(value))
+    return value
+
+
+# the value of a TEXT parameter, None is NULL and matches nothing
+def _text(value):
+    if value is not None and type(value) is not str:
+        raise DatabaseException.UNKNOWN_ERROR("invalid input for type text: " + repr(value))
+    return value
+
+
+# a row checked the way postgres inserts it: column types first, then NOT NULL, then CHECK
+def _row(values: tuple, columns: tuple) -> tuple:
+    for value, minimum in zip(values, columns):
+        if minimum is _TEXT:
+            _text(value)
+        else:
+            _integer(value)
+    if any(value is None for value in values):
+        raise DatabaseException.NOT_NULL_VIOLATION("null value violates not-null constraint")
+    for value, minimum in zip(values, columns):
+        if minimum is not _TEXT and value < minimum:
+            raise DatabaseException.CHECK_VIOLATION("new row violates check constraint")
+    return values
+
+
+# free_space + change, checked like the UPDATEs of Solution.py against the INTEGER range and CHECK(free_space>=0)
+def _freeSpace(free_space: int, change) -> int:
+    if change is None:
+        raise DatabaseException.NOT_NULL_VIOLATION("null value in column \"free_space\"")
+    free_space = _integer(free_space + change)
+    if free_space < 0:
+        raise DatabaseException.CHECK_VIOLATION("new row for relation \"disk\" violates check constraint")
+    return free_space
+
+
+# sorted list of keys, maintained with bisect
+class _SortedIndex:
+    # constructor
+    def __init__(self):
+        self.keys = []
+
+    def add(self, key):
+        bisect.insort(self.keys, key)
+
+    def remove(self, key):
+        del self.keys[bisect.bisect_left(self.keys, key)]
+
+    # number of (value, id) keys with value <= bound
+    def countAtMost(self, bound: int) -> int:
+        return bisect.bisect_right(self.keys, (bound, float('inf')))
+
+
+# the tables of createTables with their constraints and cascades, and the aggregates the DiskStats and
+# PurposeCost triggers maintain. Every operation checks before it changes anything, so an operation that
+# raises leaves the tables as they were
+class _Tables:
+    # constructor
+    def __init__(self):
+        self.queries = {}  # queryID -> (queryID, purpose, size)
+        self.disks = {}  # diskID -> [diskID, company, speed, free_space, cost]
+        self.rams = {}  # ramID -> (ramID, company, size)
+        self.diskQueries = {}  # diskID -> {queryID: (queryPurpose, querySize)}, DiskandQuery
+        self.queryDisks = {}  # queryID -> {diskID}, DiskandQuery from the other side
+        self.diskRams = {}  # diskID -> {ramID}, DiskandRam
+        self.ramDisks = {}  # ramID -> {diskID}, DiskandRam from the other side
+        self.sizeSums = {}  # diskID -> query_size_sum of DiskStats
+        self.ramTotals = {}  # diskID -> ram_total of DiskStats
+        self.purposeCosts = {}  # purpose -> total of PurposeCost
+        self.queryIDs = _SortedIndex()
+        self.sizes = _SortedIndex()  # (size, queryID)
+        self.freeSpaces = _SortedIndex()  # (free_space, diskID)
+
+    def addQuery(self, row: tuple):
+        if row[0] in self.queries:
+            raise DatabaseException.UNIQUE_VIOLATION("duplicate key value violates unique constraint")
+        self.queries[row[0]] = row
+        self.queryIDs.add(row[0])
+        self.sizes.add((row[2], row[0]))
+
+    # deleteQuery: the disks holding the query get size back, then the query is deleted with its DiskandQuery rows
+    def deleteQuery(self, queryID: int, size: int):
+        diskIDs = self.queryDisks.get(queryID, set())
+        free_spaces = {diskID: _freeSpace(self.disks[diskID][3], size) for diskID in diskIDs}
+        for diskID, free_space in free_spaces.items():
+            self.setFreeSpace(diskID, free_space)
+        for diskID in list(diskIDs):
+            self.removeDiskQuery(diskID, queryID)
+        row = self.queries.pop(queryID, None)
+        if row is not None:
+            self.queryIDs.remove(queryID)
+            self.sizes.remove((row[2], queryID))
+
+    def addDisk(self, row: tuple):
+        if row[0] in self.disks:
+            raise DatabaseException.UNIQUE_VIOLATION("duplicate key value violates unique constraint")
+        self.disks[row[0]] = list(row)
+        self.freeSpaces.add((row[3], row[0]))
+        self.diskQueries[row[0]] = {}
+        self.diskRams[row[0]] = set()
+        self.sizeSums[row[0]] = 0
+        self.ramTotals[row[0]] = 0
+
+    # False if there is no such disk
+    def deleteDisk(self, diskID: int) -> bool:
+        if diskID not in self.disks:
+            return False
+        for queryID in list(self.diskQueries[diskID]):
+            self.removeDiskQuery(diskID, queryID)
+        for ramID in list(self.diskRams[diskID]):
+            self.removeDiskRam(diskID, ramID)
+        row = self.disks.pop(diskID)
+        self.freeSpaces.remove((row[3], diskID))
+        for aggregate in (self.diskQueries, self.diskRams, self.sizeSums, self.ramTotals):
+            del aggregate[diskID]
+        return True
+
+    def setFreeSpace(self, diskID: int, free_space: int):
+        row = self.disks[diskID]
+        self.freeSpaces.remove((row[3], diskID))
+        row[3] = free_space
+        self.freeSpaces.add((free_space, diskID))
+
+    def addRam(self, row: tuple):
+        if row[0] in self.rams:
+            raise DatabaseException.UNIQUE_VIOLATION("duplicate key value violates unique constraint")
+        self.rams[row[0]] = row
+        self.ramDisks[row[0]] = set()
+
+    # False if there is no such RAM
+    def deleteRam(self, ramID: int) -> bool:
+        if ramID not in self.rams:
+            return False
+        for diskID in list(self.ramDisks[ramID]):
+            self.removeDiskRam(diskID, ramID)
+        del self.rams[ramID]
+        del self.ramDisks[ramID]
+        return True
+
+    # the DiskandQuery row and the free space it takes, in the order postgres reports the errors: the primary
+    # key on insert, the foreign keys at the end of the INSERT, CHECK(free_space>=0) on the UPDATE after it
+    def addDiskQuery(self, diskID: int, queryID: int, purpose: str, size: int):
+        if queryID in self.diskQueries.get(diskID, ()):
+            raise DatabaseException.UNIQUE_VIOLATION("duplicate key value violates unique constraint")
+        if diskID not in self.disks or queryID not in self.queries:
+            raise DatabaseException.FOREIGN_KEY_VIOLATION("violates foreign key constraint")
+        self.setFreeSpace(diskID, _freeSpace(self.disks[diskID][3], -size))
+        self.diskQueries[diskID][queryID] = (purpose, size)
+        self.queryDisks.setdefault(queryID, set()).add(diskID)
+        self.sizeSums[diskID] += size
+        self.purposeCosts[purpose] = self.purposeCosts.get(purpose, 0) + self.disks[diskID][4] * size
+
+    # the DiskandQuery row only, the free space is the caller's. False if there is no such row
+    def removeDiskQuery(self, diskID: int, queryID: int) -> bool:
+        purpose, size = self.diskQueries.get(diskID, {}).pop(queryID, (None, None))
+        if purpose is None:
+            return False
+        self.queryDisks[queryID].discard(diskID)
+        if len(self.queryDisks[queryID]) == 0:
+            del self.queryDisks[queryID]
+        self.sizeSums[diskID] -= size
+        self.purposeCosts[purpose] -= self.disks[diskID][4] * size
+        return True
+
+    def addDiskRam(self, diskID: int, ramID: int):
+        if ramID in self.diskRams.get(diskID, ()):
+            raise DatabaseException.UNIQUE_VIOLATION("duplicate key value violates unique constraint")
+        if diskID not in self.disks or ramID not in self.rams:
+            raise DatabaseException.FOREIGN_KEY_VIOLATION("violates foreign key constraint")
+        self.diskRams[diskID].add(ramID)
+        self.ramDisks[ramID].add(diskID)
+        self.ramTotals[diskID] += self.rams[ramID][2]
+
+    # False if there is no such row
+    def removeDiskRam(self, diskID: int, ramID: int) -> bool:
+        if ramID not in self.diskRams.get(diskID, ()):
+            return False
+        self.diskRams[diskID].discard(ramID)
+        self.ramDisks[ramID].discard(diskID)
+        self.ramTotals[diskID] -= self.rams[ramID][2]
+        return True
+
+    # the first k queryIDs (all if k is None) of the queries with size <= bound, largest first if descending.
+    # Taken from the size index when few queries fit, otherwise by walking the queryID index the way the
+    # getQueriesCanBeAdded* statements walk Query_queryID_size
+    def fitting(self, bound: int, k: int, descending: bool) -> List[int]:
+        if bound is None:
+            return []
+        count = self.sizes.countAtMost(bound)
+        if k is None or count * count <= k * len(self.queries):
+            return sorted((queryID for _, queryID in self.sizes.keys[:count]), reverse=descending)[:k]
+        fitting = []
+        for queryID in (reversed(self.queryIDs.keys) if descending else self.queryIDs.keys):
+            if len(fitting) == k:
+                break
+            if self.queries[queryID][2] <= bound:
+                fitting.append(queryID)
+        return fitting
+
+    # getCloseQueries of one query
+    def closeQueries(self, queryID: int) -> List[int]:
+        if queryID is None:
+            return []
+        diskIDs = self.queryDisks.get(queryID, ())
+        if len(diskIDs) == 0:
+            return [other for other in self.queryIDs.keys[:11] if other != queryID][:10]
+        shared = {}
+        for diskID in diskIDs:
+            for other in self.diskQueries[diskID]:
+                if other != queryID:
+                    shared[other] = shared.get(other, 0) + 1
+        return sorted(other for other, count in shared.items() if 2 * count >= len(diskIDs))[:10]
+
+
+# runs a MemoryBackend method under the engine's lock and maps what it raises the way the Solution.py
+# function of the same name does: errors maps exception classes to results, anything else returns
+# otherwise, which is called with the method's arguments if it is a function
+def _returns(otherwise, errors=None):
+    def decorate(method):
+        @functools.wraps(method)
+        def mapped(self, *args, **kwargs):
+            try:
+                with self._lock:
+                    return method(self, *args, **kwargs)
+            except Exception as e:
+                for error, result in (errors or {}).items():
+                    if isinstance(e, error):
+                        return result
+                return otherwise(*args, **kwargs) if callable(otherwise) else otherwise
+        return mapped
+    return decorate
+
+
+_ADD_ERRORS = {DatabaseException.NOT_NULL_VIOLATION: ReturnValue.BAD_PARAMS,
+               DatabaseException.CHECK_VIOLATION: ReturnValue.BAD_PARAMS,
+               DatabaseException.UNIQUE_VIOLATION: ReturnValue.ALREADY_EXISTS}
+
+
+# pure Python engine with the functions of Solution.py as methods, for Solution.setBackend(MemoryBackend()).
+# Tables are dicts on diskID, ramID and queryID, with sorted indexes on the query sizes and disk free spaces.
+# Constraints, cascades and ReturnValues are those of the PostgreSQL tables; like a fresh database there are
+# no tables until createTables(), and every function fails the way it does without tables after dropTables().
+# averageSizeQueriesOnDisk returns a float where postgres returns a Decimal
+class MemoryBackend:
+    # constructor
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.__tables = None
+
+    # the tables, raises like postgres when they were not created
+    def __open(self) -> _Tables:
+        if self.__tables is None:
+            raise DatabaseException.UNKNOWN_ERROR("relation does not exist")
+        return self.__tables
+
+    @_returns(None)
+    def createTables(self):
+        if self.__tables is None:
+            self.__tables = _Tables()
+
+    @_returns(None)
+    def clearTables(self):
+        self.__open()
+        self.__tables = _Tables()
+
+    @_returns(None)
+    def dropTables(self):
+        self.__tables = None
+
+    @_returns(ReturnValue.ERROR, _ADD_ERRORS)
+    def addQuery(self, query: Query) -> ReturnValue:
+        self.__open().addQuery(_row((query.getQueryID(), query.getPurpose(), query.getSize()), _QUERY_COLUMNS))
+        return ReturnValue.OK
+
+    @_returns(lambda queries: [ReturnValue.ERROR] * len(queries))
+    def addQueries(self, queries: List[Query]) -> List[ReturnValue]:
+        self.__open()
+        return [self.addQuery(query) for query in queries]
+
+    @_returns(lambda queryID: Query.badQuery())
+    def getQueryProfile(self, queryID: int) -> Query:
+        row = self.__open().queries.get(_bigint(queryID))
+        return Query.badQuery() if row is None else Query(*row)
+
+    @_returns(lambda queryIDs: [Query.badQuery() for _ in queryIDs])
+    def getQueryProfiles(self, queryIDs: List[int]) -> List[Query]:
+        rows = [self.__open().queries.get(_bigint(queryID)) for queryID in queryIDs]
+        return [Query.badQuery() if row is None else Query(*row) for row in rows]
+
+    @_returns(ReturnValue.ERROR)
+    def deleteQuery(self, query: Query) -> ReturnValue:
+        self.__open().deleteQuery(_bigint(query.getQueryID()), _bigint(query.getSize()))
+        return ReturnValue.OK
+
+    @_returns(ReturnValue.ERROR, _ADD_ERRORS)
+    def addDisk(self, disk: Disk) -> ReturnValue:
+        self.__open().addDisk(_row((disk.getDiskID(), disk.getCompany(), disk.getSpeed(), disk.getFreeSpace(),
+                                    disk.getCost()), _DISK_COLUMNS))
+        return ReturnValue.OK
+
+    @_returns(lambda disks: [ReturnValue.ERROR] * len(disks))
+    def addDisks(self, disks: List[Disk]) -> List[ReturnValue]:
+        self.__open()
+        return [self.addDisk(disk) for disk in disks]
+
+    @_returns(lambda diskID: Disk.badDisk())
+    def getDiskProfile(self, diskID: int) -> Disk:
+        row = self.__open().disks.get(_bigint(diskID))
+        return Disk.badDisk() if row is None else Disk(*row)
+
+    @_returns(lambda diskIDs: [Disk.badDisk() for _ in diskIDs])
+    def getDiskProfiles(self, diskIDs: List[int]) -> List[Disk]:
+        rows = [self.__open().disks.get(_bigint(diskID)) for diskID in diskIDs]
+        return [Disk.badDisk() if row is None else Disk(*row) for row in rows]
+
+    @_returns(ReturnValue.ERROR)
+    def deleteDisk(self, diskID: int) -> ReturnValue:
+        return ReturnValue.OK if self.__open().deleteDisk(_bigint(diskID)) else ReturnValue.NOT_EXISTS
+
+    @_returns(ReturnValue.ERROR, _ADD_ERRORS)
+    def addRAM(self, ram: RAM) -> ReturnValue:
+        self.__open().addRam(_row((ram.getRamID(), ram.getCompany(), ram.getSize()), _RAM_COLUMNS))
+        return ReturnValue.OK
+
+    @_returns(lambda rams: [ReturnValue.ERROR] * len(rams))
+    def addRAMs(self, rams: List[RAM]) -> List[ReturnValue]:
+        self.__open()
+        return [self.addRAM(ram) for ram in rams]
+
+    @_returns(lambda ramID: RAM.badRAM())
+    def getRAMProfile(self, ramID: int) -> RAM:
+        row = self.__open().rams.get(_bigint(ramID))
+        return RAM.badRAM() if row is None else RAM(*row)
+
+    @_returns(lambda ramIDs: [RAM.badRAM() for _ in ramIDs])
+    def getRAMProfiles(self, ramIDs: List[int]) -> List[RAM]:
+        rows = [self.__open().rams.get(_bigint(ramID)) for ramID in ramIDs]
+        return [RAM.badRAM() if row is None else RAM(*row) for row in rows]
+
+    @_returns(ReturnValue.ERROR)
+    def deleteRAM(self, ramID: int) -> ReturnValue:
+        return ReturnValue.OK if self.__open().deleteRam(_bigint(ramID)) else ReturnValue.NOT_EXISTS
+
+    @_returns(ReturnValue.ERROR, {DatabaseException.UNIQUE_VIOLATION: ReturnValue.ALREADY_EXISTS})
+    def addDiskAndQuery(self, disk: Disk, query: Query) -> ReturnValue:
+        tables = self.__open()
+        row = _row((disk.getDiskID(), disk.getCompany(), disk.getSpeed(), disk.getFreeSpace(), disk.getCost()),
+                   _DISK_COLUMNS)
+        tables.addDisk(row)
+        try:
+            tables.addQuery(_row((query.getQueryID(), query.getPurpose(), query.getSize()), _QUERY_COLUMNS))
+        except Exception:
+            tables.deleteDisk(row[0])
+            raise
+        return ReturnValue.OK
+
+    @_returns(ReturnValue.ERROR, {DatabaseException.FOREIGN_KEY_VIOLATION: ReturnValue.NOT_EXISTS,
+                                  DatabaseException.UNIQUE_VIOLATION: ReturnValue.ALREADY_EXISTS,
+                                  DatabaseException.CHECK_VIOLATION: ReturnValue.BAD_PARAMS})
+    def addQueryToDisk(self, query: Query, diskID: int) -> ReturnValue:
+        self.__open().addDiskQuery(*_row((diskID, query.getQueryID(), query.getPurpose(), query.getSize()),
+                                         _DISK_QUERY_COLUMNS))
+        return ReturnValue.OK
+
+    @_returns(ReturnValue.ERROR)
+    def removeQueryFromDisk(self, query: Query, diskID: int) -> ReturnValue:
+        tables = self.__open()
+        diskID, queryID, size = _bigint(diskID), _bigint(query.getQueryID()), _bigint(query.getSize())
+        if queryID in tables.diskQueries.get(diskID, ()):
+            tables.setFreeSpace(diskID, _freeSpace(tables.disks[diskID][3], size))
+            tables.removeDiskQuery(diskID, queryID)
+        return ReturnValue.OK
+
+    @_returns(lambda queryIDs=None, minimizeCost=False: (ReturnValue.ERROR, {}))
+    def placeQueries(self, queryIDs: List[int] = None, minimizeCost=False) -> Tuple[ReturnValue, Dict[int, int]]:
+        if queryIDs is not None and len(queryIDs) == 0:
+            return ReturnValue.OK, {}
+        tables = self.__open()
+        wanted = None if queryIDs is None else set(_bigint(queryID) for queryID in queryIDs)
+        disks = sorted(tables.disks.values(), key=lambda row: (row[4], row[0]) if minimizeCost else row[0])
+        queries = [row for row in tables.queries.values()
+                   if (wanted is None or row[0] in wanted) and row[0] not in tables.queryDisks]
+        placement = Placement.assign([(queryID, size) for queryID, _, size in queries],
+                                     [(row[0], row[3], tables.ramTotals[row[0]]) for row in disks])
+        for queryID, purpose, size in queries:
+            if queryID in placement:
+                tables.addDiskQuery(placement[queryID], queryID, purpose, size)
+        return ReturnValue.OK, placement
+
+    @_returns(ReturnValue.ERROR, {DatabaseException.FOREIGN_KEY_VIOLATION: ReturnValue.NOT_EXISTS,
+                                  DatabaseException.UNIQUE_VIOLATION: ReturnValue.ALREADY_EXISTS})
+    def addRAMToDisk(self, ramID: int, diskID: int) -> ReturnValue:
+        self.__open().addDiskRam(*_row((diskID, ramID), _DISK_RAM_COLUMNS))
+        return ReturnValue.OK
+
+    @_returns(ReturnValue.ERROR)
+    def removeRAMFromDisk(self, ramID: int, diskID: int) -> ReturnValue:
+        removed = self.__open().removeDiskRam(_bigint(diskID), _bigint(ramID))
+        return ReturnValue.OK if removed else ReturnValue.NOT_EXISTS
+
+    @_returns(-1)
+    def averageSizeQueriesOnDisk(self, diskID: int) -> float:
+        tables = self.__open()
+        diskID = _bigint(diskID)
+        count = len(tables.diskQueries.get(diskID, ()))
+        return 0 if count == 0 else tables.sizeSums[diskID] / count
+
+    @_returns(-1)
+    def diskTotalRAM(self, diskID: int) -> int:
+        return self.__open().ramTotals.get(_bigint(diskID), 0)
+
+    @_returns(-1)
+    def getCostForPurpose(self, purpose: str) -> int:
+        return self.__open().purposeCosts.get(_text(purpose), 0)
+
+    @_returns(None)
+    def checkPurposeCosts(self, repair=False) -> dict:
+        tables = self.__open()
+        actual = {}
+        for diskID, queries in tables.diskQueries.items():
+            for purpose, size in queries.values():
+                actual[purpose] = actual.get(purpose, 0) + tables.disks[diskID][4] * size
+        drift = {purpose: (tables.purposeCosts.get(purpose, 0), actual.get(purpose, 0))
+                 for purpose in set(tables.purposeCosts) | set(actual)
+                 if tables.purposeCosts.get(purpose, 0) != actual.get(purpose, 0)}
+        if repair:
+            for purpose, (_, total) in drift.items():
+                tables.purposeCosts[purpose] = total
+        return drift
+
+    @_returns(lambda diskID: [])
+    def getQueriesCanBeAddedToDisk(self, diskID: int) -> List[int]:
+        tables = self.__open()
+        row = tables.disks.get(_bigint(diskID))
+        return [] if row is None else tables.fitting(row[3], 5, descending=True)
+
+    @_returns(lambda diskIDs, k=5: [[] for _ in diskIDs])
+    def getQueriesCanBeAddedToDisks(self, diskIDs: List[int], k=5) -> List[List[int]]:
+        tables = self.__open()
+        if _bigint(k) is not None and k < 0:
+            raise DatabaseException.UNKNOWN_ERROR("LIMIT must not be negative")
+        rows = [tables.disks.get(_bigint(diskID)) for diskID in diskIDs]
+        byFreeSpace = {}
+        for row in rows:
+            if row is not None and row[3] not in byFreeSpace:
+                byFreeSpace[row[3]] = tables.fitting(row[3], k, descending=True)
+        return [[] if row is None else list(byFreeSpace[row[3]]) for row in rows]
+
+    @_returns(lambda diskID: [])
+    def getQueriesCanBeAddedToDiskAndRAM(self, diskID: int) -> List[int]:
+        tables = self.__open()
+        diskID = _bigint(diskID)
+        if diskID not in tables.disks or tables.ramTotals[diskID] <= 0:
+            return []
+        return tables.fitting(min(tables.disks[diskID][3], tables.ramTotals[diskID]), 5, descending=False)
+
+    @_returns(False)
+    def isCompanyExclusive(self, diskID: int) -> bool:
+        tables = self.__open()
+        row = tables.disks.get(_bigint(diskID))
+        return row is not None and all(tables.rams[ramID][1] == row[1] for ramID in tables.diskRams[row[0]])
+
+    @_returns(lambda: [])
+    def getConflictingDisks(self) -> List[int]:
+        tables = self.__open()
+        return sorted(set(diskID for diskIDs in tables.queryDisks.values() if len(diskIDs) > 1 for diskID in diskIDs))
+
+    # disks are visited from the most free space down, the number of fitting queries only decreases on the
+    # way, so the walk stops once a disk fits fewer queries than the 5th disk seen
+    @_returns(lambda: [])
+    def mostAvailableDisks(self) -> List[int]:
+        tables = self.__open()
+        ranked = []
+        for free_space, diskID in reversed(tables.freeSpaces.keys):
+            fits = tables.sizes.countAtMost(free_space)
+            if len(ranked) >= 5 and fits < ranked[4][0]:
+                break
+            ranked.append((fits, tables.disks[diskID][2], diskID))
+        ranked.sort(key=lambda disk: (-disk[0], -disk[1], disk[2]))
+        return [diskID for _, _, diskID in ranked[:5]]
+
+    @_returns(lambda queryID: [])
+    def getCloseQueries(self, queryID: int) -> List[int]:
+        return self.__open().closeQueries(_bigint(queryID))
+
+    @_returns(lambda queryIDs: [[] for _ in queryIDs])
+    def getCloseQueriesBatch(self, queryIDs: List[int]) -> List[List[int]]:
+        tables = self.__open()
+        return [tables.closeQueries(queryID) for queryID in [_bigint(queryID) for queryID in queryIDs]]
@@ -0,0 +1,53 @@
+from typing import Dict, List, Tuple
+
+
+# max segment tree over the disks in preference order, a disk that cannot take queries yet holds -1
+class _MaxTree:
+    # constructor
+    def __init__(self, size: int):
+        self.size = 1
+        while self.size < max(size, 1):
+            self.size *= 2
+        self.__values = [-1] * (2 * self.size)
+
+    def update(self, position: int, value: int):
+        position += self.size
+        self.__values[position] = value
+        position //= 2
+        while position >= 1:
+            self.__values[position] = max(self.__values[2 * position], self.__values[2 * position + 1])
+            position //= 2
+
+    # first position holding at least value, -1 if there is none
+    def leftmost(self, value: int) -> int:
+        if self.__values[1] < value:
+            return -1
+        position = 1
+        while position < self.size:
+            position *= 2
+            if self.__values[position] < value:
+                position += 1
+        return position - self.size
+
+
+# first fit decreasing: queries (queryID, size) are placed from the largest down, each on the first disk
+# (diskID, free_space, ram_total) in the given order with enough free space left and at least size RAM,
+# as getQueriesCanBeAddedToDiskAndRAM requires. Since sizes only decrease, a disk becomes eligible once
+# and stays eligible, so every query is one tree lookup. Returns queryID -> diskID for the placed queries
+def assign(queries: List[Tuple[int, int]], disks: List[Tuple[int, int, int]]) -> Dict[int, int]:
+    tree = _MaxTree(len(disks))
+    free = [free_space for _, free_space, _ in disks]
+    byRam = sorted(range(len(disks)), key=lambda position: -disks[position][2])
+    eligible = 0
+    placement = {}
+    for queryID, size in sorted(queries, key=lambda query: (-query[1], query[0])):
+        while eligible < len(byRam) and disks[byRam[eligible]][2] >= size and disks[byRam[eligible]][2] > 0:
+            tree.update(byRam[eligible], free[byRam[eligible]])
+            eligible += 1
+        position = tree.leftmost(size)
+        if position < 0:
+            continue
+        free[position] -= size
+        tree.update(position, free[position])
+        placement[queryID] = disks[position][0]
+    return placement
@@ -0,0 +1,203 @@
+import functools
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+import Utility.DBConnector as Connector
+import Utility.SQLiteDialect as Dialect
+from Utility.DBConnector import ResultSet
+from Utility.Exceptions import DatabaseException
+
+
+# database file SQLiteConnector opens, see useSQLite
+_path = None
+
+# the warm connection of each thread per database file, used by SQLiteConnector(pooled=True)
+_connections = threading.local()
+
+# SQLite allows at most 32766 bound parameters per statement
+_MAX_PARAMETERS = 32766
+
+
+# run every DBConnector, and so all of Solution.py, on the SQLite database file path instead of PostgreSQL.
+# Without a path it is the database entry of the [sqlite] section of database.ini.
+# Connector.setEngine(None) goes back to PostgreSQL
+def useSQLite(path=None):
+    global _path
+    _path = path if path is not None else Connector.loadConfig(section='sqlite')['database']
+    Connector.setEngine(SQLiteConnector)
+
+
+# a column of sqlite3's cursor.description as ResultSet reads it, lowercased as postgres folds unquoted names
+class _Column:
+    # constructor
+    def __init__(self, name: str):
+        self.name = name.lower()
+        self.type_code = None
+
+
+# translate constraint violations raised by sqlite3 into DatabaseException
+@contextmanager
+def _constraintErrors():
+    try:
+        yield
+    except sqlite3.IntegrityError as e:
+        message = str(e)
+        if message.startswith("NOT NULL constraint failed"):
+            raise DatabaseException.NOT_NULL_VIOLATION("NOT_NULL_VIOLATION")
+        if message.startswith("FOREIGN KEY constraint failed"):
+            raise DatabaseException.FOREIGN_KEY_VIOLATION("FOREIGN_KEY_VIOLATION")
+        if message.startswith("UNIQUE constraint failed"):
+            raise DatabaseException.UNIQUE_VIOLATION("UNIQUE_VIOLATION")
+        if message.startswith("CHECK constraint failed"):
+            raise DatabaseException.CHECK_VIOLATION("CHECK_VIOLATION")
+        raise
+
+
+# a bound parameter: a list is sent as a JSON array (see SQLiteDialect). SQLite integers are 64 bit, as the
+# BIGINT parameters IDs are looked up with in postgres, so an int only has to fit INTEGER when it is inserted
+def _parameter(value, inserted=False):
+    if isinstance(value, (list, tuple)):
+        return json.dumps([_parameter(item) for item in value])
+    if inserted and type(value) is int and not -2 ** 31 <= value < 2 ** 31:
+        raise DatabaseException.UNKNOWN_ERROR("integer out of range")
+    return value
+
+
+# whether the parameters of query are the values of inserted rows
+def _inserts(query: str) -> bool:
+    return query.lstrip().upper().startswith("INSERT")
+
+
+@functools.lru_cache(maxsize=1024)
+def _script(query: str) -> tuple:
+    return tuple(Dialect.translateScript(query))
+
+
+@functools.lru_cache(maxsize=1024)
+def _prepared(name: str, query: str) -> str:
+    return Dialect.STATEMENTS.get(name) or Dialect.translate(query)
+
+
+# DBConnector over sqlite3, with the same methods and the same DatabaseException mapping. The database is
+# in WAL mode so readers do not block the writer, and every statement runs in a transaction opened on first
+# use until commit()/rollback(), as in psycopg2. Prepared statements are the SQLite versions of the
+# statements registered with Connector.prepare(), compiled once per connection by sqlite3's statement cache.
+# Sessions (Connector.session) are PostgreSQL only
+class SQLiteConnector:
+    # constructor, pass pooled=True to reuse the thread's open connection
+    def __init__(self, pooled=False):
+        if _path is None:
+            raise DatabaseException.ConnectionInvalid("Call useSQLite() first")
+        self.__pooled = pooled
+        try:
+            self.connection = self.__pooledConnection() if pooled else SQLiteConnector.connect()
+            self.cursor = self.connection.cursor()
+        except sqlite3.Error as e:
+            self.connection = None
+            self.cursor = None
+            raise DatabaseException.ConnectionInvalid("Could not connect to database")
+
+    # open a new sqlite3 connection to the configured file
+    @staticmethod
+    def connect():
+        connection = sqlite3.connect(_path, timeout=30.0, isolation_level=None, check_same_thread=False,
+                                     cached_statements=256)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA foreign_keys=ON")
+        return connection
+
+    @staticmethod
+    def __pooledConnection():
+        connections = getattr(_connections, 'byPath', None)
+        if connections is None:
+            connections = _connections.byPath = {}
+        if _path not in connections:
+            connections[_path] = SQLiteConnector.connect()
+        return connections[_path]
+
+    # close connection, a pooled connection stays open for the thread and only its transaction is rolled back
+    def close(self):
+        if self.cursor is not None:
+            self.cursor.close()
+            self.cursor = None
+        if self.connection is not None:
+            if self.__pooled:
+                if self.connection.in_transaction:
+                    self.connection.execute("ROLLBACK")
+            else:
+                self.connection.close()
+        self.connection = None
+
+    # commit connection's changes
+    def commit(self):
+        if self.connection is not None:
+            try:
+                if self.connection.in_transaction:
+                    self.connection.execute("COMMIT")
+            except Exception:
+                raise DatabaseException.ConnectionInvalid("Could not commit changes")
+
+    # rollback connection's changes
+    def rollback(self):
+        if self.connection is not None:
+            try:
+                if self.connection.in_transaction:
+                    self.connection.execute("ROLLBACK")
+            except Exception:
+                raise DatabaseException.ConnectionInvalid("Could not rollback changes")
+
+    # executes the query (one or more statements, in PostgreSQL syntax), returns the number of rows effected
+    # and a ResultSet of the last statement
+    def execute(self, query: str, printSchema=False) -> (int, ResultSet):
+        result = 0, ResultSet()
+        for statement in _script(query):
+            result = self.__run(statement, (), printSchema)
+        return result
+
+    # executes a statement registered with Connector.prepare()
+    def execute_prepared(self, name: str, params=(), printSchema=False) -> (int, ResultSet):
+        query = Connector.statement(name)
+        if query is None:
+            raise DatabaseException.UNKNOWN_ERROR("Unknown prepared statement " + name)
+        inserted = _inserts(query)
+        return self.__run(_prepared(name, query), [_parameter(param, inserted) for param in params], printSchema)
+
+    # executes an INSERT ... VALUES %s with a multi-row VALUES list per page_size rows, as
+    # DBConnector.execute_values
+    def execute_values(self, query: str, rows, page_size=1000, fetch=False) -> (int, ResultSet):
+        if len(rows) == 0:
+            return 0, ResultSet()
+        query = _script(query)[0]
+        inserted = _inserts(query)
+        width = len(rows[0])
+        page_size = max(1, min(page_size, _MAX_PARAMETERS // width))
+        returned = []
+        for start in range(0, len(rows), page_size):
+            page = rows[start:start + page_size]
+            values = ",".join(["(" + ",".join(["?"] * width) + ")"] * len(page))
+            _, result = self.__run(query.replace("%s", values, 1),
+                                   [_parameter(value, inserted) for row in page for value in row], False)
+            returned.extend(result.rows)
+        if fetch:
+            description = [_Column(column[0]) for column in self.cursor.description or ()]
+            return len(returned), ResultSet(description, returned)
+        return len(rows), ResultSet()
+
+    def __run(self, query: str, params, printSchema) -> (int, ResultSet):
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        if not self.connection.in_transaction:
+            self.cursor.execute("BEGIN")
+        with _constraintErrors():
+            self.cursor.execute(query, params)
+            if self.cursor.description is not None:
+                rows = self.cursor.fetchall()
+                entries = ResultSet([_Column(column[0]) for column in self.cursor.description], rows)
+                row_effected = len(rows)
+            else:
+                entries = ResultSet()
+                row_effected = max(self.cursor.rowcount, 0)
+        if printSchema:
+            print(entries)
+        return row_effected, entries
@@ -0,0 +1,152 @@
+import re
+import sqlite3
+
+# the PostgreSQL constructs of Solution.py that SQLite spells differently, see translate(). Statements
+# that cannot be rewritten piecewise have a SQLite version in STATEMENTS (prepared statements, by name)
+# or SCRIPTS (statements passed to DBConnector.execute, by how they start)
+
+# every column is STRICT so values of the wrong type are rejected like in postgres, BIGINT is INTEGER.
+# The triggers are per row, a parent row is already gone when its ON DELETE CASCADE deletes run, as in
+# postgres, so the BEFORE DELETE triggers subtract and the cascaded deletes match nothing. Foreign keys are
+# checked after the AFTER INSERT triggers ran, so those skip a row whose Disk or Ram does not exist
+SCHEMA = ("CREATE TABLE Query(queryID INTEGER NOT NULL, purpose TEXT NOT NULL, size INTEGER NOT NULL, "
+          "UNIQUE(queryID), CHECK(queryID>0), CHECK(size >= 0)) STRICT;"
+          "CREATE TABLE Disk(diskID INTEGER NOT NULL, company TEXT NOT NULL, speed INTEGER NOT NULL, "
+          "free_space INTEGER NOT NULL, cost INTEGER NOT NULL, UNIQUE(diskID), CHECK(diskID>0), CHECK(speed>0), "
+          "CHECK(cost>0), CHECK(free_space>=0)) STRICT;"
+          "CREATE TABLE Ram(ramID INTEGER NOT NULL, company TEXT NOT NULL, size INTEGER NOT NULL, "
+          "UNIQUE(ramID), CHECK(ramID>0), CHECK(size>0)) STRICT;"
+          "CREATE TABLE DiskandRam(diskID INTEGER NOT NULL, ramID INTEGER NOT NULL, "
+          "FOREIGN KEY(diskID) REFERENCES Disk(diskID) ON DELETE CASCADE, "
+          "FOREIGN KEY(ramID) REFERENCES Ram(ramID) ON DELETE CASCADE, PRIMARY KEY (diskID, ramID)) STRICT;"
+          "CREATE TABLE DiskandQuery(diskID INTEGER NOT NULL, queryID INTEGER NOT NULL, "
+          "queryPurpose TEXT NOT NULL, querySize INTEGER NOT NULL, "
+          "FOREIGN KEY(diskID) REFERENCES Disk(diskID) ON DELETE CASCADE, "
+          "FOREIGN KEY(queryID) REFERENCES Query(queryID) ON DELETE CASCADE, PRIMARY KEY (diskID, queryID)) STRICT;"
+          "CREATE INDEX DiskandQuery_queryID ON DiskandQuery(queryID);"
+          "CREATE INDEX DiskandQuery_queryPurpose ON DiskandQuery(queryPurpose);"
+          "CREATE INDEX DiskandRam_ramID ON DiskandRam(ramID);"
+          "CREATE INDEX Query_queryID_size ON Query(queryID, size);"
+          "CREATE TABLE DiskStats(diskID INTEGER PRIMARY KEY, query_count INTEGER NOT NULL DEFAULT 0, "
+          "query_size_sum INTEGER NOT NULL DEFAULT 0, ram_total INTEGER NOT NULL DEFAULT 0, "
+          "FOREIGN KEY(diskID) REFERENCES Disk(diskID) ON DELETE CASCADE) STRICT;"
+          "CREATE TRIGGER DiskStats_disk AFTER INSERT ON Disk BEGIN "
+          "INSERT INTO DiskStats(diskID) VALUES(NEW.diskID); END;"
+          "CREATE TRIGGER DiskStats_addQuery AFTER INSERT ON DiskandQuery BEGIN "
+          "UPDATE DiskStats SET query_count=query_count+1, query_size_sum=query_size_sum+NEW.querySize "
+          "WHERE diskID=NEW.diskID; END;"
+          "CREATE TRIGGER DiskStats_removeQuery AFTER DELETE ON DiskandQuery BEGIN "
+          "UPDATE DiskStats SET query_count=query_count-1, query_size_sum=query_size_sum-OLD.querySize "
+          "WHERE diskID=OLD.diskID; END;"
+          "CREATE TRIGGER DiskStats_addRam AFTER INSERT ON DiskandRam BEGIN "
+          "UPDATE DiskStats SET ram_total=ram_total+(SELECT size FROM Ram WHERE ramID=NEW.ramID) "
+          "WHERE diskID=NEW.diskID AND EXISTS(SELECT * FROM Ram WHERE ramID=NEW.ramID); END;"
+          "CREATE TRIGGER DiskStats_removeRam AFTER DELETE ON DiskandRam BEGIN "
+          "UPDATE DiskStats SET ram_total=ram_total-(SELECT size FROM Ram WHERE ramID=OLD.ramID) "
+          "WHERE diskID=OLD.diskID AND EXISTS(SELECT * FROM Ram WHERE ramID=OLD.ramID); END;"
+          "CREATE TRIGGER DiskStats_deleteRam BEFORE DELETE ON Ram BEGIN "
+          "UPDATE DiskStats SET ram_total=ram_total-OLD.size "
+          "WHERE diskID IN (SELECT diskID FROM DiskandRam WHERE ramID=OLD.ramID); END;"
+          "CREATE TABLE PurposeCost(purpose TEXT PRIMARY KEY, total INTEGER NOT NULL DEFAULT 0) STRICT;"
+          "CREATE TRIGGER PurposeCost_addQuery AFTER INSERT ON DiskandQuery BEGIN "
+          "INSERT INTO PurposeCost(purpose, total) "
+          "SELECT NEW.queryPurpose, cost * NEW.querySize FROM Disk WHERE diskID=NEW.diskID "
+          "ON CONFLICT (purpose) DO UPDATE SET total=total+excluded.total; END;"
+          "CREATE TRIGGER PurposeCost_removeQuery AFTER DELETE ON DiskandQuery BEGIN "
+          "UPDATE PurposeCost SET total=total-(SELECT cost FROM Disk WHERE diskID=OLD.diskID) * OLD.querySize "
+          "WHERE purpose=OLD.queryPurpose AND EXISTS(SELECT * FROM Disk WHERE diskID=OLD.diskID); END;"
+          "CREATE TRIGGER PurposeCost_deleteDisk BEFORE DELETE ON Disk BEGIN "
+          "UPDATE PurposeCost SET total=total-OLD.cost * (SELECT SUM(querySize) FROM DiskandQuery "
+          "WHERE diskID=OLD.diskID AND queryPurpose=PurposeCost.purpose) "
+          "WHERE purpose IN (SELECT queryPurpose FROM DiskandQuery WHERE diskID=OLD.diskID); END;")
+
+# a table cannot be dropped before the tables referencing it, a delete on them would fail on the missing
+# parent table
+DROP = ("DROP TABLE IF EXISTS DiskStats;"
+        "DROP TABLE IF EXISTS PurposeCost;"
+        "DROP TABLE IF EXISTS DiskandQuery;"
+        "DROP TABLE IF EXISTS DiskandRam;"
+        "DROP TABLE IF EXISTS Query;"
+        "DROP TABLE IF EXISTS Disk;"
+        "DROP TABLE IF EXISTS Ram;")
+
+# the first statement of a script -> its SQLite version
+SCRIPTS = {"CREATE TABLE Query(": SCHEMA, "DROP TABLE IF EXISTS Query CASCADE;": DROP}
+
+# a list parameter is sent as a JSON array, unnest WITH ORDINALITY is json_each and the top k per row of
+# a LATERAL join is ROW_NUMBER() over a partition
+_ORDINALS = "SELECT value AS id, key + 1 AS ord FROM json_each(?1)"
+STATEMENTS = {
+    "isCompanyExclusive":
+        "SELECT company FROM Disk WHERE diskID=?1 AND NOT EXISTS(SELECT * FROM Ram WHERE company<>Disk.company "
+        "AND ramID IN (SELECT ramID FROM DiskandRam WHERE diskID=?1))",
+    "getQueriesCanBeAddedToDisks":
+        "WITH B AS (" + _ORDINALS + "), "
+        "F AS (SELECT DISTINCT free_space FROM Disk WHERE diskID IN (SELECT id FROM B)), "
+        "T AS (SELECT F.free_space, Query.queryID, "
+        "ROW_NUMBER() OVER (PARTITION BY F.free_space ORDER BY Query.queryID DESC) AS r "
+        "FROM F INNER JOIN Query ON(Query.size <= F.free_space)) "
+        "SELECT B.ord, T.queryID FROM B INNER JOIN Disk ON(Disk.diskID = B.id) "
+        "INNER JOIN T ON(T.free_space = Disk.free_space) WHERE T.r <= ?2 "
+        "ORDER BY B.ord, T.queryID DESC",
+    "getCloseQueriesBatch":
+        "WITH B AS (" + _ORDINALS + "), "
+        "T AS (SELECT B.ord, B.id, D.diskID FROM B INNER JOIN DiskandQuery AS D ON(D.queryID = B.id)), "
+        "N AS (SELECT ord, COUNT(*) AS disks FROM T GROUP BY ord), "
+        "S AS (SELECT T.ord, D.queryID, COUNT(*) AS shared FROM T "
+        "INNER JOIN DiskandQuery AS D ON(D.diskID = T.diskID) WHERE D.queryID<>T.id GROUP BY T.ord, D.queryID), "
+        "C AS (SELECT S.ord, S.queryID FROM S INNER JOIN N ON(N.ord = S.ord) WHERE 2 * S.shared >= N.disks "
+        "UNION SELECT B.ord, Query.queryID FROM B INNER JOIN Query ON(Query.queryID<>B.id) "
+        "WHERE NOT EXISTS(SELECT * FROM DiskandQuery WHERE queryID=B.id)), "
+        "R AS (SELECT ord, queryID, ROW_NUMBER() OVER (PARTITION BY ord ORDER BY queryID) AS r FROM C) "
+        "SELECT ord, queryID FROM R WHERE r <= 10 ORDER BY ord, queryID",
+}
+
+_REWRITES = [
+    # NUMERIC division
+    (re.compile(r"([\w.]+)::NUMERIC", re.IGNORECASE), r"CAST(\1 AS REAL)"),
+    # every other cast, SQLite integers are 64 bit
+    (re.compile(r"::\w+(\[\])?"), ""),
+    # x = ANY($1) over an array
+    (re.compile(r"=\s*ANY\(\$(\d+)\)"), r"IN (SELECT value FROM json_each(?\1))"),
+    (re.compile(r"\bLEAST\(", re.IGNORECASE), "MIN("),
+    (re.compile(r"\bGREATEST\(", re.IGNORECASE), "MAX("),
+    # SQLite locks the whole database for the writing transaction
+    (re.compile(r"\s+FOR (UPDATE|SHARE) OF \w+", re.IGNORECASE), ""),
+    (re.compile(r"\s+CASCADE\b", re.IGNORECASE), ""),
+    # (VALUES %s) AS V(a, b): VALUES columns are column1, column2, ... in SQLite
+    (re.compile(r"\(VALUES %s\) AS (\w+)\(([^)]*)\)"),
+     lambda match: "(SELECT " + ", ".join("column%d AS %s" % (index + 1, column.strip()) for index, column
+                                          in enumerate(match.group(2).split(","))) +
+                   " FROM (VALUES %s)) AS " + match.group(1)),
+    (re.compile(r"\$(\d+)"), r"?\1"),
+]
+
+
+# SQLite version of one postgres statement
+def translate(query: str) -> str:
+    for pattern, replacement in _REWRITES:
+        query = pattern.sub(replacement, query)
+    return query
+
+
+# the statements of a script, translated: a script with a SQLite version in SCRIPTS is replaced, DROP FUNCTION
+# has nothing to drop (SQLite triggers go with their tables) and a database file has no schemas to create
+def translateScript(script: str) -> list:
+    for start, replacement in SCRIPTS.items():
+        if script.startswith(start):
+            script = replacement
+            break
+    else:
+        script = translate(script)
+    statements = []
+    pending = ""
+    for part in script.split(";"):
+        pending += part + ";"
+        if sqlite3.complete_statement(pending):
+            if pending.strip() != ";" and not pending.strip().upper().startswith(("DROP FUNCTION", "CREATE SCHEMA")):
+                statements.append(pending.strip())
+            pending = ""
+    if pending.strip(" ;\n") != "":
+        statements.append(pending.strip())
+    return statements